@@ -1,7 +1,23 @@
 import json
-import urllib.request
+import os
+import threading
+import time
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from src.catalog_cache import (
+    Catalog,
+    encode_catalog,
+    merge_catalog,
+    open_catalog,
+    write_catalog,
+)
+from src.catalog_db import CatalogDB
+from src.config import Config
+from src.http_pool import ConnectionPool
+from src.json_stream import PostStream
+from src.ranking import Ranking
+from src.search_index import SearchIndex
 
 
 class RepoAPI:
@@ -9,52 +25,382 @@ class RepoAPI:
     API_URL = f"{BASE_URL}/api"
     CACHE_DIR = Path.home() / ".cache" / "steam-deck-repo-manager"
     CACHE_FILE = CACHE_DIR / "posts.json"
+    CACHE_META_FILE = CACHE_DIR / "posts.meta.json"
+    CATALOG_FILE = CACHE_DIR / "posts.cat"  # Binary index of CACHE_FILE
+    CATALOG_DB_FILE = CACHE_DIR / "catalog.db"  # SQLite/FTS5 search store
+    CACHE_TTL = 15 * 60  # Seconds before a cached catalog is considered stale
+    SYNC_PAGE_LIMIT = 20  # Listing pages to walk before falling back to a full sync
+    FULL_SYNC_INTERVAL = 24 * 60 * 60  # Incremental sync can't see deletions
+    DOWNLOAD_URL_CACHE_FILE = CACHE_DIR / "download_urls.json"
+    THUMBNAIL_DIR = CACHE_DIR / "thumbnails"
+    DOWNLOAD_URL_TTL = 6 * 60 * 60  # CDN links can rotate; re-resolve after this
+    RESOLVE_WORKERS = 4
     HEADERS = {"User-Agent": "SteamDeckRepoManager/1.0 (Linux; SteamOS) python-urllib"}
 
     def __init__(self):
         self._ensure_cache_dir()
+        # Keep-alive connections reused by every request below
+        self.http = ConnectionPool(headers=self.HEADERS)
+
+        # post_id -> {"url", "resolved_at"}, loaded on first use
+        self._url_cache = None
+        self._url_cache_lock = threading.Lock()
+        self.catalog_db = None
+        if Config.get("search_backend") == "sqlite":
+            try:
+                self.catalog_db = CatalogDB(self.CATALOG_DB_FILE)
+            except Exception as e:
+                # e.g. Python built without FTS5; search falls back to memory
+                print(f"Search database unavailable: {e}")
 
     def _ensure_cache_dir(self):
         if not self.CACHE_DIR.exists():
             self.CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-    def _make_request(self, url):
-        req = urllib.request.Request(url, headers=self.HEADERS)
-        with urllib.request.urlopen(req, timeout=30) as response:
-            return response.read()
+    def _make_request(self, url, headers=None):
+        """
+        Performs a GET request. Returns (body, response_headers).
+        Non-2xx statuses (including 304 Not Modified) raise
+        urllib.error.HTTPError.
+        """
+        response = self.http.request("GET", url, headers)
+        if response.status >= 300:
+            raise urllib.error.HTTPError(
+                response.url, response.status, response.reason, response.headers, None
+            )
+        return response.body, response.headers
+
+    def _load_cache_meta(self):
+        """Returns the stored validators ({etag, last_modified, fetched_at})."""
+        try:
+            with open(self.CACHE_META_FILE, "r") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save_cache_meta(self, meta):
+        try:
+            with open(self.CACHE_META_FILE, "w") as f:
+                json.dump(meta, f)
+        except Exception as e:
+            print(f"Cache meta save failed: {e}")
+
+    def is_cache_fresh(self, ttl=None):
+        """True if the cached catalog was fetched or revalidated within the TTL."""
+        if not self.CACHE_FILE.exists():
+            return False
+        ttl = self.CACHE_TTL if ttl is None else ttl
+        fetched_at = self._load_cache_meta().get("fetched_at", 0)
+        return (time.time() - fetched_at) < ttl
+
+    def _fetch_posts(self, on_posts=None, conditional=True):
+        """
+        GET of the full catalog, conditional only if the cache it would
+        validate could be loaded (conditional).
+        Returns the parsed response, or None if the server answered 304.
+
+        The body is parsed as it streams in: on_posts(batch) is called with
+        each run of newly completed posts, and the same bytes are written
+        to the cache file, so the full body is never held in memory twice.
+        """
+        meta = self._load_cache_meta()
+        headers = {}
+        if conditional and self.CACHE_FILE.exists():
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        tmp_path = self.CACHE_FILE.with_name(self.CACHE_FILE.name + ".tmp")
+        with self.http.stream("GET", f"{self.API_URL}/posts/all", headers) as response:
+            if response.status == 304:
+                # Unchanged: just extend the freshness window
+                response.read()
+                meta["fetched_at"] = time.time()
+                self._save_cache_meta(meta)
+                return None
+            if response.status >= 300:
+                response.read()
+                raise urllib.error.HTTPError(
+                    response.url,
+                    response.status,
+                    response.reason,
+                    response.headers,
+                    None,
+                )
+
+            parser = PostStream()
+            try:
+                with open(tmp_path, "wb") as f:
+                    for chunk in response.iter_chunks():
+                        f.write(chunk)
+                        batch = parser.feed(chunk)
+                        if batch and on_posts is not None:
+                            on_posts(batch)
+                data = parser.finish()
+            except Exception:
+                # Never leave a truncated download where the cache is read
+                if tmp_path.exists():
+                    tmp_path.unlink()
+                raise
+            response_headers = response.headers
+
+        # Save to cache
+        os.replace(tmp_path, self.CACHE_FILE)
+
+        meta.update(
+            {
+                "etag": response_headers.get("ETag"),
+                "last_modified": response_headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            }
+        )
+        self._save_cache_meta(meta)
+        return data
+
+    def _load_cache(self):
+        try:
+            # Binary: the file holds the server's UTF-8 bytes verbatim
+            with open(self.CACHE_FILE, "rb") as f:
+                return json.load(f)
+        except Exception:
+            # If cache is corrupt, ignore it
+            return None
+
+    def _store_catalog(self, data):
+        """Writes an encoded catalog used for fast cold starts and opens it."""
+        try:
+            write_catalog(self.CATALOG_FILE, data)
+            return open_catalog(self.CATALOG_FILE)
+        except Exception as e:
+            # e.g. Windows refuses to replace a file that is still mapped
+            print(f"Catalog write failed: {e}")
+            return Catalog(data)
+
+    def _load_catalog(self):
+        """
+        Opens the binary catalog. Migrates from posts.json if the catalog
+        is missing, unreadable or older than the JSON cache.
+        """
+        try:
+            if (
+                self.CATALOG_FILE.exists()
+                and self.CATALOG_FILE.stat().st_mtime >= self.CACHE_FILE.stat().st_mtime
+            ):
+                return open_catalog(self.CATALOG_FILE)
+        except Exception as e:
+            print(f"Catalog load failed, rebuilding: {e}")
+
+        data = self._load_cache()
+        if data is None:
+            return None
+        return self._store_catalog(encode_catalog(data.get("posts", [])))
+
+    def _index_catalog(self, catalog, generation, delta=None):
+        """
+        Gives catalog its sort orders and search backend: a snapshot of the
+        search DB, else an in-memory index. The catalog on screen keeps its
+        own meanwhile.
+
+        A DB one generation behind takes delta, the (new_posts, patches) of
+        an incremental sync, in place; otherwise it is repopulated.
+        """
+        catalog.ranking = Ranking(catalog)
+
+        if self.catalog_db is not None:
+            try:
+                db_generation = self.catalog_db.generation()
+                if db_generation == generation:
+                    pass  # Already indexed, e.g. by the previous run
+                elif delta is not None and db_generation == generation - 1:
+                    self.catalog_db.apply(*delta, generation)
+                else:
+                    self.catalog_db.populate(catalog, generation)
+                catalog.search_db = self.catalog_db.snapshot()
+                return
+            except Exception as e:
+                print(f"Search database update failed: {e}")
+                self.catalog_db = None
+
+        catalog.search_index = SearchIndex(catalog)
+
+    def _fetch_page(self, page):
+        """Fetches one page of the newest-first post listing."""
+        json_bytes, _ = self._make_request(f"{self.API_URL}/posts?page={page}")
+        data = json.loads(json_bytes)
+        posts = data.get("posts", data) if isinstance(data, dict) else data
+        if isinstance(posts, dict):
+            # Paginator envelope: {"data": [...], "current_page": ...}
+            posts = posts.get("data", [])
+        return posts if isinstance(posts, list) else []
+
+    def _incremental_sync(self, catalog):
+        """
+        Walks the listing until it reaches a post the catalog already has
+        unchanged. Returns (new_posts, patches): the posts to put in front,
+        in listing order, and {catalog index: post} for the edited ones.
+        Returns None if the walk never got there.
+        """
+        fresh = []  # New or changed posts, in listing order
+
+        for page in range(1, self.SYNC_PAGE_LIMIT + 1):
+            page_posts = self._fetch_page(page)
+            delta = [p for p in page_posts if not self._is_known(catalog, p)]
+            fresh.extend(delta)
+            if not page_posts or len(delta) < len(page_posts):
+                break
+        else:
+            return None
 
-    def get_all_posts(self, force_refresh=False):
+        new_posts, patches, seen = [], {}, set()
+        for p in fresh:
+            pid = str(p.get("id"))
+            if pid in seen:
+                continue  # Moved to a later page during the walk
+            seen.add(pid)
+            index = catalog.index_of(pid)
+            if index is None:
+                new_posts.append(p)
+            else:
+                patches[index] = p
+        return new_posts, patches
+
+    @staticmethod
+    def _is_known(catalog, post):
+        index = catalog.index_of(post.get("id"))
+        return index is not None and catalog[index] == post
+
+    @staticmethod
+    def _diff_posts(catalog, new_posts):
+        """Returns (added, changed, removed) id lists from catalog to new_posts."""
+        if catalog is None:
+            return [p.get("id") for p in new_posts], [], []
+        kept = bytearray(len(catalog))
+        added, changed = [], []
+        for p in new_posts:
+            pid = p.get("id")
+            index = catalog.index_of(pid)
+            if index is None:
+                added.append(pid)
+                continue
+            kept[index] = 1
+            if catalog[index] != p:
+                changed.append(pid)
+        removed = [catalog[i].get("id") for i, k in enumerate(kept) if not k]
+        return added, changed, removed
+
+    def sync_posts(self, full=False, on_posts=None):
         """
-        Fetch all posts from the API or local cache.
+        Brings the local catalog up to date.
+        Normally fetches only posts newer than what we have and merges them
+        into the binary catalog by id, re-encoding just those posts; a full
+        (conditional) download happens when there is no cache, the listing
+        can't be walked, or FULL_SYNC_INTERVAL has passed.
+
+        Returns a dict: {"posts", "generation", "added", "changed", "removed"}
+        where "posts" is a Catalog and the last three are lists of post ids.
+        on_posts is passed to _fetch_posts for a full download.
         """
-        data = None
+        old = self._load_catalog() if self.CACHE_FILE.exists() else None
+
+        meta = self._load_cache_meta()
+        no_incremental = meta.get("no_incremental", False)
+        full = (
+            full
+            or not old
+            or no_incremental
+            or time.time() - meta.get("last_full_sync", 0) > self.FULL_SYNC_INTERVAL
+        )
+
+        delta = None
+        if not full:
+            try:
+                delta = self._incremental_sync(old)
+            except urllib.error.HTTPError as e:
+                if e.code == 404:
+                    # Server has no paginated listing; stop trying
+                    no_incremental = True
+                print(f"Incremental sync failed: {e}")
+            except Exception as e:
+                print(f"Incremental sync failed: {e}")
+
+        posts = None
+        if delta is None:
+            # A 304 is only of use if there is a catalog to keep
+            data = self._fetch_posts(on_posts, conditional=old is not None)
+            full = True
+            if data is None:
+                added, changed, removed = [], [], []
+            else:
+                posts = data.get("posts", [])
+                added, changed, removed = self._diff_posts(old, posts)
+        else:
+            new_posts, patches = delta
+            added = [p.get("id") for p in new_posts]
+            changed = [p.get("id") for p in patches.values()]
+            removed = []
+
+        # Reload: _fetch_posts may have updated the validators meanwhile
+        meta = self._load_cache_meta()
+        meta["no_incremental"] = no_incremental
+        if full:
+            meta["last_full_sync"] = time.time()
+        if added or changed or removed:
+            meta["generation"] = meta.get("generation", 0) + 1
+        meta["fetched_at"] = time.time()
+        self._save_cache_meta(meta)
+
+        if posts is not None and (added or changed or removed):
+            catalog = self._store_catalog(encode_catalog(posts))
+        elif added or changed:
+            # posts.json keeps the last full body; the catalog has the rest
+            catalog = self._store_catalog(merge_catalog(old, *delta))
+        elif old is not None:
+            catalog = old
+            if posts is not None:
+                # posts.json was rewritten with the same posts; the catalog
+                # must still count as up to date with it
+                os.utime(self.CATALOG_FILE)
+        elif posts is not None:
+            catalog = self._store_catalog(encode_catalog(posts))
+        else:
+            raise RuntimeError("Server answered 304 without a cached catalog")
+        self._index_catalog(catalog, meta.get("generation", 0), delta)
+
+        return {
+            "posts": catalog,
+            "generation": meta.get("generation", 0),
+            "added": added,
+            "changed": changed,
+            "removed": removed,
+        }
+
+    def get_all_posts(self, force_refresh=False, on_posts=None):
+        """
+        Fetch all posts from the API or local cache, as a lazily decoded Catalog.
+        A forced refresh is an incremental sync, so an unchanged catalog
+        costs a page or a 304 instead of a full download. During a full
+        download, on_posts(batch) receives posts as they are parsed.
+        """
+        posts = None
         network_error = None
 
         # 1. Try Network (if forced or cache missing)
         if force_refresh or not self.CACHE_FILE.exists():
             try:
-                json_bytes = self._make_request(f"{self.API_URL}/posts/all")
-                data = json.loads(json_bytes)
-
-                # Save to cache
-                with open(self.CACHE_FILE, "w") as f:
-                    json.dump(data, f)
-
+                posts = self.sync_posts(on_posts=on_posts)["posts"]
             except Exception as e:
                 network_error = e
 
         # 2. Try Cache (if we don't have data yet)
-        if data is None and self.CACHE_FILE.exists():
-            try:
-                with open(self.CACHE_FILE, "r") as f:
-                    data = json.load(f)
-            except Exception:
-                # If cache is corrupt, ignore it
-                pass
+        if posts is None and self.CACHE_FILE.exists():
+            posts = self._load_catalog()
+            if posts is not None:
+                self._index_catalog(posts, self._load_cache_meta().get("generation", 0))
 
         # 3. Final decision
-        if data is not None:
-            return data.get("posts", [])
+        if posts is not None:
+            return posts
 
         # If we are here: No data from network, no data from cache.
         if network_error:
@@ -62,20 +408,106 @@ class RepoAPI:
 
         return []
 
-    def get_download_url(self, post_id):
+    def revalidate(self):
         """
-        Returns the direct download URL by following the redirect.
+        Stale-while-revalidate helper: checks the server for a newer catalog.
+        Returns the sync result, or None if the cached copy is still current.
         """
-        url = f"{self.BASE_URL}/post/download/{post_id}"
+        result = self.sync_posts()
+        if not (result["added"] or result["changed"] or result["removed"]):
+            return None
+        return result
+
+    def _download_url_cache(self):
+        """Returns the in-memory redirect cache; call with the lock held."""
+        if self._url_cache is None:
+            try:
+                with open(self.DOWNLOAD_URL_CACHE_FILE, "r") as f:
+                    self._url_cache = json.load(f)
+            except Exception:
+                self._url_cache = {}
+        return self._url_cache
+
+    def _save_download_url_cache(self):
+        with self._url_cache_lock:
+            now = time.time()
+            cache = {
+                pid: entry
+                for pid, entry in self._download_url_cache().items()
+                if now - entry["resolved_at"] < self.DOWNLOAD_URL_TTL
+            }
+            self._url_cache = cache
         try:
-            req = urllib.request.Request(url, headers=self.HEADERS, method="HEAD")
-            with urllib.request.urlopen(req, timeout=30) as response:
-                return response.geturl()
-        except Exception:
-            # Fallback to GET if HEAD fails
+            with open(self.DOWNLOAD_URL_CACHE_FILE, "w") as f:
+                json.dump(cache, f)
+        except Exception as e:
+            print(f"Download URL cache save failed: {e}")
+
+    def cached_download_url(self, post_id):
+        """Returns the cached CDN URL for post_id if still fresh, else None."""
+        with self._url_cache_lock:
+            entry = self._download_url_cache().get(str(post_id))
+        if entry and time.time() - entry["resolved_at"] < self.DOWNLOAD_URL_TTL:
+            return entry["url"]
+        return None
+
+    def remember_download_url(self, post_id, url, save=True):
+        """Records a resolved CDN URL (e.g. one the GUI saw while downloading)."""
+        with self._url_cache_lock:
+            self._download_url_cache()[str(post_id)] = {
+                "url": url,
+                "resolved_at": time.time(),
+            }
+        if save:
+            self._save_download_url_cache()
+
+    def forget_download_url(self, post_id):
+        """Drops a cached URL that turned out to be dead."""
+        with self._url_cache_lock:
+            self._download_url_cache().pop(str(post_id), None)
+        self._save_download_url_cache()
+
+    def _resolve_download_url(self, post_id):
+        url = f"{self.BASE_URL}/post/download/{post_id}"
+        # Fallback to GET if HEAD fails; the body is never read
+        for method in ("HEAD", "GET"):
             try:
-                req = urllib.request.Request(url, headers=self.HEADERS)
-                with urllib.request.urlopen(req, timeout=30) as response:
-                    return response.geturl()
+                response = self.http.request(method, url, read_body=False)
+                if response.status < 400:
+                    return response.url
             except Exception:
-                return None
+                pass
+        return None
+
+    def get_download_url(self, post_id):
+        """
+        Returns the direct download URL by following the redirect.
+        """
+        return self.resolve_download_urls([post_id]).get(post_id)
+
+    def resolve_download_urls(self, post_ids):
+        """
+        Resolves the download redirects of many posts concurrently, using
+        the persistent cache where possible.
+        Returns {post_id: url or None}.
+        """
+        results = {}
+        missing = []
+        for post_id in post_ids:
+            url = self.cached_download_url(post_id)
+            if url:
+                results[post_id] = url
+            else:
+                missing.append(post_id)
+
+        if missing:
+            workers = min(self.RESOLVE_WORKERS, len(missing))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                resolved = executor.map(self._resolve_download_url, missing)
+                for post_id, url in zip(missing, resolved):
+                    results[post_id] = url
+                    if url:
+                        self.remember_download_url(post_id, url, save=False)
+            self._save_download_url_cache()
+
+        return results
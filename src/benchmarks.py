@@ -0,0 +1,503 @@
+"""
+Micro-benchmarks for the data paths that matter on the Deck.
+
+Run all of them:      uv run python -m src.benchmarks
+Run a single one:     uv run python -m src.benchmarks catalog_load
+"""
+
+import gzip
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.config import Config
+from src.downloads import DownloadManager
+from src.http_pool import ConnectionPool
+from src.json_stream import PostStream
+from src.catalog_cache import Catalog, encode_catalog, open_catalog, write_catalog
+from src.search_index import SearchIndex
+
+WORDS = [
+    "zelda", "portal", "mario", "halo", "doom", "steam", "deck", "retro",
+    "neon", "pixel", "dark", "souls", "cyber", "space", "ocean", "forest",
+    "elden", "ring", "kirby", "metroid", "sonic", "persona", "hollow", "knight",
+]  # fmt: skip
+
+
+def make_posts(count, seed=0):
+    """Synthetic posts shaped like /api/posts/all entries."""
+    rng = random.Random(seed)
+    posts = []
+    for i in range(count):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5)))
+        posts.append(
+            {
+                "id": f"p{i:06d}",
+                "slug": title.replace(" ", "-") + f"-{i}",
+                "title": title.title(),
+                "type": "boot_video" if rng.random() < 0.7 else "suspend_video",
+                "downloads": rng.randint(0, 50000),
+                "likes": rng.randint(0, 2000),
+                "thumbnail": f"https://example.invalid/thumbs/{i}.jpg",
+                "video": f"https://example.invalid/videos/{i}.webm",
+                "content": " ".join(rng.choice(WORDS) for _ in range(30)),
+                "user": {"steam_name": rng.choice(WORDS).title() + str(i % 97)},
+            }
+        )
+    return posts
+
+
+def best_of(fn, repeat=5):
+    """Returns the fastest wall time of fn() in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def bench_catalog_load(sizes=(1_000, 10_000, 100_000)):
+    """Cold load of posts.json vs the binary catalog, up to the first page."""
+    print("--- Catalog cold load (ms, best of 5) ---")
+    print(f"{'posts':>8} {'json.load':>10} {'catalog':>10} {'+page 1':>10}")
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        for size in sizes:
+            posts = make_posts(size)
+            json_path = tmp / "posts.json"
+            cat_path = tmp / "posts.cat"
+            with open(json_path, "w") as f:
+                json.dump({"posts": posts}, f)
+            write_catalog(cat_path, encode_catalog(posts))
+
+            def load_json():
+                with open(json_path) as f:
+                    json.load(f)["posts"][:12]
+
+            def load_catalog():
+                open_catalog(cat_path)
+
+            def load_first_page():
+                open_catalog(cat_path)[:12]
+
+            print(
+                f"{size:>8} {best_of(load_json):>10.2f} "
+                f"{best_of(load_catalog):>10.2f} {best_of(load_first_page):>10.2f}"
+            )
+    finally:
+        shutil.rmtree(tmp)
+
+
+def bench_search(sizes=(1_000, 10_000, 100_000), typed="zelda"):
+    """
+    Per-keystroke filter cost while typing, as in MainWindow.filter_posts:
+    the original two list comprehensions vs the trigram SearchIndex.
+    """
+    print(f"--- Search while typing {typed!r} (ms per keystroke, best of 5) ---")
+    print(f"{'posts':>8} {'build':>8} {'listcomp':>10} {'index':>8} {'speedup':>8}")
+    for size in sizes:
+        posts = make_posts(size)
+        catalog = Catalog(encode_catalog(posts))
+        prefixes = [typed[: i + 1] for i in range(len(typed))]
+
+        def list_comprehensions():
+            for text in prefixes:
+                [
+                    p
+                    for p in posts
+                    if p.get("type") == "boot_video"
+                    and text in p.get("title", "").lower()
+                ]
+                [
+                    p
+                    for p in posts
+                    if p.get("type") != "boot_video"
+                    and text in p.get("title", "").lower()
+                ]
+
+        start = time.perf_counter()
+        index = SearchIndex(catalog)
+        build = (time.perf_counter() - start) * 1000
+
+        def indexed():
+            index.search("")
+            for text in prefixes:
+                boot, suspend = [], []
+                for i in index.search(text):
+                    (boot if catalog.is_boot(i) else suspend).append(i)
+
+        old = best_of(list_comprehensions) / len(prefixes)
+        new = best_of(indexed) / len(prefixes)
+        print(f"{size:>8} {build:>8.1f} {old:>10.3f} {new:>8.3f} {old / new:>7.1f}x")
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """
+    Keep-alive test server: /big is a large JSON body (gzip on request),
+    anything else a tiny one. Counts connections and body bytes sent.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+    big_body = b""
+    big_body_gzip = b""
+    connections = 0
+    bytes_sent = 0
+
+    def setup(self):
+        CountingHandler.connections += 1
+        super().setup()
+
+    def do_GET(self):
+        big = self.path == "/big"
+        body = self.big_body if big else b'{"ok": true}'
+        self.send_response(200)
+        if big and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = self.big_body_gzip
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        CountingHandler.bytes_sent += len(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def bench_http(requests=50, catalog_size=10_000):
+    """urllib.urlopen per request vs the keep-alive ConnectionPool."""
+    CountingHandler.big_body = json.dumps({"posts": make_posts(catalog_size)}).encode()
+    CountingHandler.big_body_gzip = gzip.compress(CountingHandler.big_body)
+    server, base = start_server(CountingHandler)
+
+    def urllib_get(path):
+        with urllib.request.urlopen(base + path, timeout=30) as response:
+            return response.read()
+
+    pool = ConnectionPool()
+
+    def pool_get(path):
+        return pool.request("GET", base + path).body
+
+    print(f"--- HTTP: {requests} small requests + /posts/all sized body ---")
+    print(f"{'client':>8} {'ms/req':>8} {'conns':>6} {'big ms':>8} {'big KB':>8}")
+    try:
+        for name, get in (("urllib", urllib_get), ("pool", pool_get)):
+            CountingHandler.connections = 0
+            start = time.perf_counter()
+            for _ in range(requests):
+                get("/small")
+            per_request = (time.perf_counter() - start) * 1000 / requests
+            connections = CountingHandler.connections
+
+            CountingHandler.bytes_sent = 0
+            start = time.perf_counter()
+            assert len(get("/big")) == len(CountingHandler.big_body)
+            big_ms = (time.perf_counter() - start) * 1000
+            print(
+                f"{name:>8} {per_request:>8.2f} {connections:>6} "
+                f"{big_ms:>8.1f} {CountingHandler.bytes_sent / 1024:>8.0f}"
+            )
+    finally:
+        pool.clear()
+        server.shutdown()
+
+
+class ThrottledHandler(BaseHTTPRequestHandler):
+    """Serves body in chunks at roughly rate bytes/s, like a slow link."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = b""
+    rate = 4 * 1024 * 1024
+    chunk = 64 * 1024
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        for start in range(0, len(self.body), self.chunk):
+            self.wfile.write(self.body[start : start + self.chunk])
+            time.sleep(self.chunk / self.rate)
+
+    def log_message(self, *args):
+        pass
+
+
+def bench_stream(catalog_size=20_000, first_page=12):
+    """
+    Cold /posts/all download: read + json.loads + json.dump (the original
+    _fetch_posts) vs PostStream parsing and caching the bytes as they arrive.
+    Reports time to the first page of posts, total time and peak memory.
+    """
+    ThrottledHandler.body = json.dumps({"posts": make_posts(catalog_size)}).encode()
+    server, base = start_server(ThrottledHandler)
+    pool = ConnectionPool()
+    tmp = Path(tempfile.mkdtemp())
+    size_mb = len(ThrottledHandler.body) / 1024 / 1024
+    rate_mb = ThrottledHandler.rate / 1024 / 1024
+
+    def buffered():
+        body = pool.request("GET", base + "/posts/all").body
+        data = json.loads(body)
+        first = time.perf_counter()
+        with open(tmp / "posts.json", "w") as f:
+            json.dump(data, f)
+        return first
+
+    def streamed():
+        first = None
+        parser = PostStream()
+        with pool.stream("GET", base + "/posts/all") as response:
+            with open(tmp / "posts.json", "wb") as f:
+                for chunk in response.iter_chunks():
+                    f.write(chunk)
+                    parser.feed(chunk)
+                    if first is None and len(parser.items) >= first_page:
+                        first = time.perf_counter()
+        parser.finish()
+        return first
+
+    print(f"--- Cold catalog download, {size_mb:.1f} MB at {rate_mb:.0f} MB/s ---")
+    print(f"{'mode':>9} {'1st page':>9} {'total':>8} {'peak MB':>8}")
+    try:
+        for name, fetch in (("buffered", buffered), ("streamed", streamed)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            first = fetch()
+            total = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+            print(
+                f"{name:>9} {(first - start) * 1000:>7.0f}ms "
+                f"{total * 1000:>6.0f}ms {peak:>8.1f}"
+            )
+    finally:
+        pool.clear()
+        server.shutdown()
+        shutil.rmtree(tmp)
+
+
+class RangeThrottledHandler(BaseHTTPRequestHandler):
+    """
+    Range-capable file server shaped to rate bytes/s per connection, like
+    a CDN that caps each TCP stream.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = b""
+    rate = 4 * 1024 * 1024
+    chunk = 64 * 1024
+
+    def do_GET(self):
+        start, end = 0, len(self.body) - 1
+        requested = self.headers.get("Range")
+        if requested:
+            first, _, last = requested.split("=")[1].partition("-")
+            start, end = int(first), int(last) if last else end
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(self.body)}")
+        else:
+            self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", '"bench"')
+        self.send_header("Content-Length", str(end + 1 - start))
+        self.end_headers()
+        try:
+            for pos in range(start, end + 1, self.chunk):
+                self.wfile.write(self.body[pos : min(pos + self.chunk, end + 1)])
+                time.sleep(self.chunk / self.rate)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client stopped reading once its range shrank
+
+    def log_message(self, *args):
+        pass
+
+
+class _LocalRepo:
+    """The parts of RepoAPI a DownloadManager uses, pointed at a local server."""
+
+    HEADERS = {"User-Agent": "benchmark"}
+
+    def __init__(self, base, cache_dir):
+        self.BASE_URL = base
+        self.CACHE_DIR = cache_dir
+
+    def cached_download_url(self, post_id):
+        return f"{self.BASE_URL}/video.webm"
+
+    def remember_download_url(self, post_id, url, save=True):
+        pass
+
+    def forget_download_url(self, post_id):
+        pass
+
+
+def bench_segmented(size_mb=32, rate_mb=4):
+    """
+    Video download through DownloadManager from a server that caps every
+    connection at rate_mb MB/s: one stream vs adaptive segments.
+    """
+    # A WebM header, or the download is rejected after its first chunk
+    RangeThrottledHandler.body = b"\x1a\x45\xdf\xa3" + os.urandom(size_mb * 1024 * 1024)
+    RangeThrottledHandler.rate = rate_mb * 1024 * 1024
+    server, base = start_server(RangeThrottledHandler)
+    tmp = Path(tempfile.mkdtemp())
+    # Downloads are staged in the install folder; keep them out of the real one
+    original_get_path = Config.get_install_path
+    Config.get_install_path = lambda: tmp / "movies"
+
+    print(f"--- Video download, {size_mb} MB at {rate_mb} MB/s per connection ---")
+    print(f"{'mode':>10} {'time':>7} {'MB/s':>6} {'streams':>8}")
+    try:
+        for name, segments in (("single", 1), ("segmented", 4)):
+            done = threading.Event()
+            manager = DownloadManager(
+                _LocalRepo(base, tmp),
+                lambda event, job: event in ("downloaded", "failed") and done.set(),
+            )
+            manager.max_segments = segments
+            start = time.perf_counter()
+            job = manager.enqueue({"id": name})
+            done.wait()
+            elapsed = time.perf_counter() - start
+            assert job.state == "downloaded", job.error
+            with open(job.path, "rb") as f:
+                assert f.read() == RangeThrottledHandler.body
+            streams = manager.http.stats["requests"]
+            print(f"{name:>10} {elapsed:>6.1f}s {size_mb / elapsed:>6.1f} {streams:>8}")
+            manager.complete(name)
+            manager.http.clear()
+    finally:
+        server.shutdown()
+        Config.get_install_path = original_get_path
+        shutil.rmtree(tmp)
+
+
+def bench_thumb_decode(cards=20, frame_ms=16):
+    """
+    GUI-thread frame times while a page of cards gets its thumbnails:
+    decoding on the GUI thread as each reply lands (the original VideoCard)
+    vs ThumbnailLoader.load_pixmap decoding on its worker pool.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QBuffer, QByteArray, QEventLoop, QObject, Qt, QTimer
+    from PySide6.QtGui import QImage, QPixmap
+    from PySide6.QtWidgets import QApplication
+    from src.api import RepoAPI
+    from src.gui.thumbnails import ThumbnailLoader
+    from src.gui.widgets import VideoCard
+
+    app = QApplication.instance() or QApplication([])
+
+    # Blurred noise compresses roughly like a real screenshot
+    images = []
+    for _ in range(cards):
+        noise = QImage(
+            os.urandom(160 * 90 * 3), 160, 90, 160 * 3, QImage.Format.Format_RGB888
+        )
+        image = noise.scaled(
+            1280,
+            720,
+            Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QBuffer.OpenModeFlag.WriteOnly)
+        image.save(buffer, "JPG")
+        images.append(bytes(data.data()))
+
+    def measure(start_loading):
+        """Returns (ms until all images are ready, worst frame gap in ms, frames > 2x)."""
+        ticks = []
+        ticker = QTimer()
+        ticker.setInterval(frame_ms)
+        ticker.timeout.connect(lambda: ticks.append(time.perf_counter()))
+        loop = QEventLoop()
+        remaining = [cards]
+
+        def done(*_):
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                loop.quit()
+
+        ticker.start()
+        QTimer.singleShot(5 * frame_ms, lambda: start_loading(done))
+        start = time.perf_counter()
+        loop.exec()
+        total = (time.perf_counter() - start) * 1000 - 5 * frame_ms
+        ticks.append(time.perf_counter())
+        ticker.stop()
+        gaps = [(b - a) * 1000 for a, b in zip(ticks, ticks[1:])]
+        return total, max(gaps), sum(1 for g in gaps if g > 2 * frame_ms)
+
+    def gui_thread(done):
+        # Replies landing together, each decoded where it arrives
+        for data in images:
+
+            def on_reply(data=data):
+                pixmap = QPixmap()
+                pixmap.loadFromData(data)
+                pixmap.scaled(VideoCard.THUMB_SIZE)  # setScaledContents at paint
+                done()
+
+            QTimer.singleShot(0, on_reply)
+
+    tmp = Path(tempfile.mkdtemp())
+    original_dir = RepoAPI.THUMBNAIL_DIR
+    RepoAPI.THUMBNAIL_DIR = tmp
+    try:
+        loader = ThumbnailLoader()
+        owner = QObject()
+        for i, data in enumerate(images):
+            loader.cache.put(f"http://thumbs.invalid/{i}.jpg", data)
+
+        def worker_pool(done):
+            for i in range(cards):
+                loader.load_pixmap(
+                    f"http://thumbs.invalid/{i}.jpg", VideoCard.THUMB_SIZE, owner, done
+                )
+
+        print(f"--- {cards} thumbnails (1280x720 JPEG) arriving at once ---")
+        print(f"{'decode on':>10} {'ready ms':>9} {'worst frame':>12} {'dropped':>8}")
+        for name, start_loading in (("GUI", gui_thread), ("pool", worker_pool)):
+            total, worst, dropped = measure(start_loading)
+            print(f"{name:>10} {total:>9.0f} {worst:>10.0f}ms {dropped:>8}")
+    finally:
+        RepoAPI.THUMBNAIL_DIR = original_dir
+        shutil.rmtree(tmp)
+
+
+BENCHMARKS = {
+    "catalog_load": bench_catalog_load,
+    "search": bench_search,
+    "http": bench_http,
+    "stream": bench_stream,
+    "thumb_decode": bench_thumb_decode,
+    "segmented": bench_segmented,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
@@ -0,0 +1,291 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from datetime import datetime
+
+# On-disk layout (little-endian, all offsets relative to the blob they index):
+#
+#   header      magic, version, post count
+#   downloads   u32[n]
+#   likes       u32[n]
+#   created     u32[n], unix time of created_at (0 if unknown)
+#   is_boot     u8[n], padded to 4 bytes
+#   offsets     u32[n + 1] for each string column, then for the records
+#   blobs       UTF-8 strings for each column, then one compact JSON per post
+#
+# The fixed-width columns and string columns can be read straight out of
+# the memory map; a full post dict is only decoded when it is accessed.
+
+MAGIC = b"SDRMCAT1"
+VERSION = 2
+HEADER = struct.Struct("<8sII")
+STRING_COLUMNS = ("id", "title", "author")
+
+
+def _string_fields(post):
+    user = post.get("user") or {}
+    return (
+        str(post.get("id", "")),
+        post.get("title") or "",
+        user.get("steam_name") or "",
+    )
+
+
+def _u32(value):
+    try:
+        return min(max(int(value or 0), 0), 0xFFFFFFFF)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _timestamp(value):
+    try:
+        return _u32(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+def _pad4(size):
+    return (size + 3) & ~3
+
+
+def _pack_blob(chunks):
+    offsets = array("I", [0])
+    total = 0
+    for chunk in chunks:
+        total += len(chunk)
+        offsets.append(total)
+    return offsets, b"".join(chunks)
+
+
+def _encode_strings(post):
+    """The string column values and the record of post, encoded."""
+    fields = [value.encode() for value in _string_fields(post)]
+    return fields + [json.dumps(post, separators=(",", ":")).encode()]
+
+
+def _layout(downloads, likes, created, is_boot, packed):
+    """Assembles the file from its columns (see the layout above)."""
+    n = len(downloads)
+    if sys.byteorder == "big":
+        for arr in [downloads, likes, created] + [offsets for offsets, _ in packed]:
+            arr.byteswap()
+
+    parts = [
+        HEADER.pack(MAGIC, VERSION, n),
+        downloads.tobytes(),
+        likes.tobytes(),
+        created.tobytes(),
+        bytes(is_boot) + b"\0" * (_pad4(n) - n),
+    ]
+    parts += [offsets.tobytes() for offsets, _ in packed]
+    parts += [blob for _, blob in packed]
+    return b"".join(parts)
+
+
+def encode_catalog(posts):
+    """Serializes a list of post dicts into the binary catalog format."""
+    downloads = array("I", (_u32(p.get("downloads")) for p in posts))
+    likes = array("I", (_u32(p.get("likes")) for p in posts))
+    created = array("I", (_timestamp(p.get("created_at")) for p in posts))
+    is_boot = bytes(1 if p.get("type") == "boot_video" else 0 for p in posts)
+
+    columns = [[] for _ in range(len(STRING_COLUMNS) + 1)]
+    for post in posts:
+        for column, value in zip(columns, _encode_strings(post)):
+            column.append(value)
+
+    packed = [_pack_blob(chunks) for chunks in columns]
+    return _layout(downloads, likes, created, is_boot, packed)
+
+
+def merge_catalog(catalog, added, patches):
+    """
+    Encodes the posts in added followed by catalog's, with the post at each
+    index in patches ({index: post}) replaced. Only those posts are encoded;
+    every other one is copied over byte for byte, never decoded.
+    """
+    head = len(added)
+    patched = sorted(patches)
+
+    def fixed(column, value):
+        arr = array("I", (value(p) for p in added))
+        arr.frombytes(column.tobytes())
+        for i in patched:
+            arr[head + i] = value(patches[i])
+        return arr
+
+    downloads = fixed(catalog.downloads, lambda p: _u32(p.get("downloads")))
+    likes = fixed(catalog.likes, lambda p: _u32(p.get("likes")))
+    created = fixed(catalog.created, lambda p: _timestamp(p.get("created_at")))
+    is_boot = bytearray(1 if p.get("type") == "boot_video" else 0 for p in added)
+    is_boot += catalog._is_boot
+    for i in patched:
+        is_boot[head + i] = 1 if patches[i].get("type") == "boot_video" else 0
+
+    encoded = {i: _encode_strings(patches[i]) for i in patched}
+    added_strings = [_encode_strings(p) for p in added]
+    packed = []
+    for column in range(len(STRING_COLUMNS) + 1):
+        old_offsets = catalog._offsets[column]
+        old_blob = catalog._blobs[column]
+        offsets, blob = _pack_blob([strings[column] for strings in added_strings])
+        chunks = [blob]
+        total = offsets[-1]
+        copied = 0  # Old posts before this index are done
+        for i in patched + [len(catalog)]:
+            if copied < i:
+                # A run of unchanged posts: one slice, offsets shifted
+                start, end = old_offsets[copied], old_offsets[i]
+                chunks.append(old_blob[start:end])
+                shift = total - start
+                offsets.extend(o + shift for o in old_offsets[copied + 1 : i + 1])
+                total += end - start
+            if i < len(catalog):
+                value = encoded[i][column]
+                chunks.append(value)
+                total += len(value)
+                offsets.append(total)
+                copied = i + 1
+        packed.append((offsets, b"".join(chunks)))
+
+    return _layout(downloads, likes, created, is_boot, packed)
+
+
+def write_catalog(path, data):
+    """Atomically writes an encoded catalog to path."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def open_catalog(path):
+    """Memory-maps a catalog file. Raises ValueError if it is not usable."""
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return Catalog(buf)
+
+
+class Catalog(Sequence):
+    """
+    Read-only, lazily decoded list of posts backed by the binary format.
+    Indexing returns the post dict; columns are available without decoding.
+    """
+
+    def __init__(self, buf):
+        if sys.byteorder != "little":
+            raise ValueError("Catalog columns are little-endian")
+
+        magic, version, n = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a catalog file (or an old version)")
+
+        self._buf = buf
+        self._count = n
+        view = memoryview(buf)
+        pos = HEADER.size
+
+        self.downloads = view[pos : pos + 4 * n].cast("I")
+        pos += 4 * n
+        self.likes = view[pos : pos + 4 * n].cast("I")
+        pos += 4 * n
+        self.created = view[pos : pos + 4 * n].cast("I")
+        pos += 4 * n
+        self._is_boot = view[pos : pos + n]
+        pos += _pad4(n)
+
+        offsets = []
+        for _ in range(len(STRING_COLUMNS) + 1):
+            offsets.append(view[pos : pos + 4 * (n + 1)].cast("I"))
+            pos += 4 * (n + 1)
+
+        blobs = []
+        for column_offsets in offsets:
+            size = column_offsets[n]
+            blobs.append(view[pos : pos + size])
+            pos += size
+
+        self._offsets = offsets
+        self._blobs = blobs
+        self._posts = {}  # index -> decoded post
+        self._ids = None  # post id -> index, built on first lookup
+
+        # Set by RepoAPI when it indexes the catalog. They belong to this
+        # catalog, so a newer one can be indexed while this one is in use
+        self.ranking = None
+        self.search_db = None  # CatalogSnapshot, with the SQLite backend
+        self.search_index = None  # SearchIndex otherwise
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("catalog index out of range")
+
+        post = self._posts.get(index)
+        if post is None:
+            post = json.loads(self._string(len(STRING_COLUMNS), index))
+            self._posts[index] = post
+        return post
+
+    def _slice(self, column, index):
+        offsets = self._offsets[column]
+        return self._blobs[column][offsets[index] : offsets[index + 1]]
+
+    def _string(self, column, index):
+        return str(self._slice(column, index), "utf-8")
+
+    def post_id(self, index):
+        return self._string(0, index)
+
+    def index_of(self, post_id):
+        """Index of the post with post_id, or None. Reads only the id column."""
+        if self._ids is None:
+            offsets = self._offsets[0]
+            ids = str(self._blobs[0], "utf-8")
+            if len(ids) == len(self._blobs[0]):
+                # ASCII, so byte offsets are character offsets
+                self._ids = {
+                    ids[offsets[i] : offsets[i + 1]]: i for i in range(self._count)
+                }
+            else:
+                self._ids = {self.post_id(i): i for i in range(self._count)}
+        return self._ids.get(str(post_id))
+
+    def title(self, index):
+        return self._string(1, index)
+
+    def author(self, index):
+        return self._string(2, index)
+
+    def is_boot(self, index):
+        return self._is_boot[index] == 1
+
+    def view(self, indices):
+        return CatalogView(self, indices)
+
+
+class CatalogView(Sequence):
+    """A filtered subset of a Catalog; posts are still decoded on access."""
+
+    def __init__(self, catalog, indices):
+        self.catalog = catalog
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.catalog[i] for i in self.indices[index]]
+        return self.catalog[self.indices[index]]
@@ -0,0 +1,310 @@
+import json
+import re
+import sqlite3
+import threading
+from collections.abc import Sequence
+from src.search_index import SearchCancelled
+
+
+class CatalogDB:
+    """
+    SQLite copy of the catalog with an FTS5 index over title and author,
+    the fields SearchIndex matches too. Search, the boot/suspend split and
+    pagination all run as queries, so nothing scales with the catalog size
+    per keystroke.
+
+    Each catalog generation is written to its own numbered pair of tables
+    while the previous pair keeps serving the catalog still on screen;
+    readers hold a CatalogSnapshot naming the pair that matches them.
+    """
+
+    SCHEMA = "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)"
+    VERSION = 2  # Bumped when the tables' layout changes
+    TABLE_NAME = re.compile(r"posts(?:_fts)?(?:_(\d+))?")
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()  # sqlite connections are per-thread
+
+        conn = self._conn()
+        conn.execute(self.SCHEMA)
+        try:
+            # Trigram tokens give the same substring semantics as "in"
+            conn.execute(
+                "CREATE VIRTUAL TABLE temp.probe USING fts5(x, tokenize='trigram')"
+            )
+            conn.execute("DROP TABLE temp.probe")
+            self.trigram = True
+        except sqlite3.OperationalError:
+            # SQLite < 3.34: fall back to word-prefix matching
+            self.trigram = False
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _meta(self, key):
+        row = (
+            self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,))
+        ).fetchone()
+        return row[0] if row else None
+
+    def generation(self):
+        """Catalog generation the DB was last populated from (None if never)."""
+        if self._meta("tables") is None or self._meta("version") != self.VERSION:
+            return None  # Written by an older version
+        return self._meta("generation")
+
+    def snapshot(self):
+        """Reader for the tables of the current generation."""
+        return CatalogSnapshot(self, self._meta("tables"), self._meta("base") or 0)
+
+    def populate(self, posts, generation):
+        """
+        Writes posts as a new generation beside the current one, which
+        stays readable until the generation after this one is written.
+        """
+        conn = self._conn()
+        live = self._meta("tables")
+        number = (live or 0) + 1
+        table, fts = f"posts_{number}", f"posts_fts_{number}"
+        tokenize = ", tokenize='trigram'" if self.trigram else ""
+        with conn:
+            self._drop_tables(conn, keep=live)
+            conn.execute(f"""
+                CREATE TABLE {table} (
+                    idx INTEGER PRIMARY KEY,  -- position in the API listing
+                    id TEXT,
+                    is_boot INTEGER,
+                    title TEXT,
+                    author TEXT,
+                    data TEXT                 -- full post JSON, kept last
+                )""")
+            conn.execute(f"CREATE INDEX {table}_by_type ON {table}(is_boot, idx)")
+            conn.execute(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5(title, author{tokenize})"
+            )
+            for idx, post in enumerate(posts):
+                self._insert(conn, number, idx, post)
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("generation", generation),
+                    ("tables", number),
+                    ("base", 0),
+                    ("version", self.VERSION),
+                ],
+            )
+
+    def apply(self, added, patches, generation):
+        """
+        Updates the current generation in place after an incremental sync:
+        added go in front of the listing, and patches ({catalog index: post})
+        replace posts. New rows only go below the first one, so a snapshot
+        taken before keeps its own catalog's rows and order; patched rows are
+        rewritten in place, though, and it sees their new contents.
+        """
+        conn = self._conn()
+        number = self._meta("tables")
+        base = self._meta("base") or 0
+        first = base - len(added)
+        rows = [(first + i, post) for i, post in enumerate(added)]
+        rows += [(base + i, post) for i, post in patches.items()]
+        with conn:
+            for idx, post in rows:
+                conn.execute(f"DELETE FROM posts_fts_{number} WHERE rowid = ?", (idx,))
+                self._insert(conn, number, idx, post)
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("generation", generation), ("base", first)],
+            )
+
+    @staticmethod
+    def _insert(conn, number, idx, post):
+        """Writes post as row idx of generation number, replacing any row there."""
+        title = post.get("title") or ""
+        author = (post.get("user") or {}).get("steam_name") or ""
+        conn.execute(
+            f"INSERT OR REPLACE INTO posts_{number} "
+            "(idx, id, is_boot, title, author, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                idx,
+                str(post.get("id", "")),
+                1 if post.get("type") == "boot_video" else 0,
+                title,
+                author,
+                json.dumps(post),
+            ),
+        )
+        conn.execute(
+            f"INSERT INTO posts_fts_{number} (rowid, title, author) VALUES (?, ?, ?)",
+            (idx, title, author),
+        )
+
+    def _drop_tables(self, conn, keep):
+        """Drops every generation's tables but keep's; FTS shadows go with theirs."""
+        names = [
+            name
+            for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        ]
+        for name in sorted(names, key=lambda n: "_fts" not in n):
+            match = self.TABLE_NAME.fullmatch(name)
+            if match and (match[1] is None or int(match[1]) != keep):
+                conn.execute(f"DROP TABLE IF EXISTS {name}")
+
+    def _execute(self, sql, params, cancelled=None):
+        """
+        Runs a read query and returns all rows. If cancelled() turns true
+        mid-query, SQLite aborts it and SearchCancelled is raised.
+        """
+        conn = self._conn()
+        if cancelled is not None:
+            conn.set_progress_handler(lambda: 1 if cancelled() else 0, 10000)
+        try:
+            return conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            if cancelled is not None and cancelled():
+                raise SearchCancelled()
+            raise
+        finally:
+            if cancelled is not None:
+                conn.set_progress_handler(None, 0)
+
+
+class CatalogSnapshot:
+    """
+    Queries against one generation of a CatalogDB as a particular Catalog
+    was indexed into it. Incremental syncs add rows below base; they are
+    left out, and row idx is catalog index idx - base. Posts those syncs
+    patch are replaced in place, so their new contents show here too.
+    """
+
+    def __init__(self, db, number, base=0):
+        self.db = db
+        self.table = f"posts_{number}"
+        self.fts = f"posts_fts_{number}"
+        self.base = base
+
+    def _query_clause(self, text, is_boot):
+        """
+        Builds the FROM/WHERE/ORDER BY clause and parameters for a search.
+        CROSS JOIN pins the FTS table as the outer loop, so the cost follows
+        the number of matches; FTS5 yields rowids (listing order) sorted.
+        """
+        table, fts = self.table, self.fts
+        if not text:
+            return (
+                f"FROM {table} p WHERE p.is_boot = ? AND p.idx >= ? ORDER BY p.idx",
+                [int(is_boot), self.base],
+            )
+
+        if self.db.trigram and len(text) < 3:
+            # Too short for a trigram match: scan the same two fields
+            pattern = "%" + text.replace("%", r"\%").replace("_", r"\_") + "%"
+            return (
+                f"FROM {table} p WHERE p.is_boot = ? AND p.idx >= ? AND "
+                "(p.title LIKE ? ESCAPE '\\' OR p.author LIKE ? ESCAPE '\\') "
+                "ORDER BY p.idx",
+                [int(is_boot), self.base, pattern, pattern],
+            )
+
+        match = '"' + text.replace('"', '""') + '"'
+        if not self.db.trigram:
+            match += "*"
+        return (
+            f"FROM {fts} f CROSS JOIN {table} p ON p.idx = f.rowid "
+            f"WHERE {fts} MATCH ? AND f.rowid >= ? AND p.is_boot = ? "
+            "ORDER BY f.rowid",
+            [match, self.base, int(is_boot)],
+        )
+
+    def count(self, text, is_boot, cancelled=None):
+        clause, params = self._query_clause(text, is_boot)
+        return self.db._execute(f"SELECT COUNT(*) {clause}", params, cancelled)[0][0]
+
+    def match_ids(self, text, is_boot, cancelled=None):
+        """Catalog indices of all matches, in listing order."""
+        clause, params = self._query_clause(text, is_boot)
+        rows = self.db._execute(f"SELECT p.idx {clause}", params, cancelled)
+        return [idx - self.base for (idx,) in rows]
+
+    def fetch_ids(self, ids):
+        """Returns the posts at the given catalog indices, in that order."""
+        if not ids:
+            return []
+        marks = ", ".join("?" * len(ids))
+        rows = self.db._execute(
+            f"SELECT idx, data FROM {self.table} WHERE idx IN ({marks})",
+            [self.base + i for i in ids],
+        )
+        by_idx = {idx - self.base: data for idx, data in rows}
+        return [json.loads(by_idx[idx]) for idx in ids if idx in by_idx]
+
+    def fetch(self, text, is_boot, limit, offset=0):
+        """Returns one page of matching posts, in listing order."""
+        clause, params = self._query_clause(text, is_boot)
+        rows = self.db._execute(
+            f"SELECT p.data {clause} LIMIT ? OFFSET ?", params + [limit, offset]
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def query(self, text, is_boot, ranking=None, sort_key="default"):
+        return QueryResult(self, text, is_boot, ranking, sort_key)
+
+
+class QueryResult(Sequence):
+    """
+    Search result that behaves like a list for render_page: len() is a
+    COUNT and slicing is a LIMIT/OFFSET query.
+
+    With a sort key, the matching indices are fetched and ordered once
+    through the catalog's Ranking; pages are then looked up by index.
+    """
+
+    def __init__(self, db, text, is_boot, ranking=None, sort_key="default"):
+        self.db = db
+        self.text = text
+        self.is_boot = is_boot
+        self.ranking = ranking
+        self.sort_key = sort_key
+        self._count = None
+        self._ids = None  # Sorted match indices, when not in listing order
+
+    def __len__(self):
+        return self.load_count()
+
+    def load_count(self, cancelled=None):
+        """Runs (and caches) the query; call it off the GUI thread."""
+        if self._count is None:
+            if self.ranking is not None and self.sort_key in self.ranking:
+                ids = self.db.match_ids(self.text, self.is_boot, cancelled)
+                self._ids = self.ranking.sort(ids, self.sort_key)
+                self._count = len(self._ids)
+            else:
+                self._count = self.db.count(self.text, self.is_boot, cancelled)
+        return self._count
+
+    def _fetch(self, start, stop):
+        if self._ids is not None:
+            return self.db.fetch_ids(self._ids[start:stop])
+        return self.db.fetch(self.text, self.is_boot, stop - start, start)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, _ = index.indices(len(self))
+            if stop <= start:
+                return []
+            return self._fetch(start, stop)
+        if index < 0:
+            index += len(self)
+        posts = self._fetch(index, index + 1)
+        if not posts:
+            raise IndexError("query result index out of range")
+        return posts[0]
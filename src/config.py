@@ -8,7 +8,16 @@ class Config:
     CONFIG_DIR = Path.home() / ".config" / "steam-deck-repo-manager"
     CONFIG_FILE = CONFIG_DIR / "config.json"
 
-    DEFAULT_CONFIG = {"install_path": ""}
+    DEFAULT_CONFIG = {
+        "install_path": "",
+        "search_backend": "sqlite",  # "sqlite" (FTS5) or "memory" (trigram index)
+        "search_debounce_ms": 150,
+        "thumbnail_cache_mb": 200,  # Disk budget for cached thumbnails
+        "pixmap_cache_mb": 64,  # Memory budget for decoded, scaled thumbnails
+        "max_concurrent_downloads": 2,  # Installs downloading at once; others queue
+        "download_segments": 4,  # Max parallel connections per video; 1 disables
+        "browse_view": "pages",  # "pages" (paginated grid) or "scroll" (virtualized)
+    }
 
     @staticmethod
     def _get_default_install_path():
@@ -63,6 +72,11 @@ class Config:
             json.dump(config, f, indent=4)
         return config
 
+    @classmethod
+    def get(cls, key):
+        """Returns a single setting, falling back to its default."""
+        return cls.load().get(key, cls.DEFAULT_CONFIG.get(key))
+
     @classmethod
     def get_install_path(cls):
         config = cls.load()
@@ -0,0 +1,760 @@
+import hashlib
+import heapq
+import http.client
+import itertools
+import json
+import os
+import threading
+import time
+from src.config import Config
+from src.file_manager import FileManager
+from src.http_pool import ConnectionPool
+
+
+class DownloadError(Exception):
+    pass
+
+
+class _Interrupted(Exception):
+    """Raised inside a worker when its job was paused or cancelled."""
+
+
+class _StreamHash:
+    """
+    SHA-256 of a video as it is written, which also checks that it starts
+    like a WebM file. Bytes reach it in file order: chunks at the current
+    position are hashed straight from memory, and anything already on disk
+    past it (an earlier run's part, another segment's range) is read back.
+    """
+
+    EBML_MAGIC = b"\x1a\x45\xdf\xa3"  # Every WebM file starts with an EBML header
+
+    def __init__(self):
+        self.sha = hashlib.sha256()
+        self.pos = 0
+
+    def update(self, chunk):
+        if self.pos < len(self.EBML_MAGIC):
+            head = chunk[: len(self.EBML_MAGIC) - self.pos]
+            if head != self.EBML_MAGIC[self.pos : self.pos + len(head)]:
+                raise DownloadError("Not a WebM video (got an error page?)")
+        self.sha.update(chunk)
+        self.pos += len(chunk)
+
+    def catch_up(self, path, end, chunk_size):
+        """Hashes the bytes from pos up to end from the file at path."""
+        if self.pos >= end:
+            return
+        with open(path, "rb") as f:
+            f.seek(self.pos)
+            while self.pos < end:
+                chunk = f.read(min(chunk_size, end - self.pos))
+                if not chunk:
+                    raise ConnectionError("Downloaded file is shorter than expected")
+                self.update(chunk)
+
+    def hexdigest(self):
+        return self.sha.hexdigest()
+
+
+class _Segment:
+    """A byte range [pos, end) still to fetch; end shrinks when it is split."""
+
+    __slots__ = ("pos", "end")
+
+    def __init__(self, pos, end):
+        self.pos = pos
+        self.end = end
+
+    def remaining(self):
+        return self.end - self.pos
+
+
+class _SegmentedFetch:
+    """State shared by the threads of one segmented download."""
+
+    def __init__(self, job, url, fd, segments):
+        self.job = job
+        self.url = url
+        self.fd = fd
+        self.segments = segments
+        self.lock = threading.Lock()
+        self.threads = []
+        self.error = None
+        self.abort = threading.Event()
+        self.hash_lock = threading.Lock()  # Held while advancing job.hasher
+
+
+class DownloadJob:
+    """One video download; the unit the journal persists."""
+
+    # States
+    QUEUED = "queued"
+    RUNNING = "running"
+    PAUSED = "paused"
+    DOWNLOADED = "downloaded"  # File complete, waiting to be installed
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, post_data, path, priority=0, state=QUEUED):
+        self.post_data = post_data
+        self.post_id = post_data["id"]
+        self.path = path  # Where the video is written
+        self.priority = priority
+        self.state = state
+        self.received = 0
+        self.total = 0  # 0 while unknown
+        self.error = None
+        # ETag / Last-Modified of the file being fetched; a partial file is
+        # only resumed while these still match the server's
+        self.validator = None
+        # Remaining [pos, end) ranges of a segmented download, else None
+        self.segments = None
+        # Hex SHA-256 of the finished file; hasher builds it while writing
+        self.sha256 = None
+        self.hasher = None
+        self.seq = 0
+        self.stop = threading.Event()  # Set to pause or cancel a running job
+
+    def to_dict(self):
+        return {
+            "post_data": self.post_data,
+            "path": self.path,
+            "priority": self.priority,
+            "state": self.state,
+            "total": self.total,
+            "validator": self.validator,
+            "segments": self.segments,
+            "sha256": self.sha256,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        job = cls(data["post_data"], data["path"], data["priority"], data["state"])
+        job.total = data.get("total", 0)
+        job.validator = data.get("validator")
+        job.segments = data.get("segments")
+        job.sha256 = data.get("sha256")
+        return job
+
+
+class DownloadManager:
+    """
+    Queue of video downloads. Jobs start in priority order (lower first,
+    FIFO within a priority), at most max_concurrent at a time, each on its
+    own thread. Jobs can be paused, resumed and cancelled.
+
+    Every state change is written to a journal, so after a restart
+    restore() puts unfinished jobs back in the queue and re-announces
+    downloads that finished but were never installed.
+
+    Videos are written to hidden files in the install directory
+    (FileManager.staging_path) and synced, so installing them is a rename.
+    A partial file is kept with the server's validator and continued with
+    Range requests after a dropped connection, a pause, a failure or a
+    restart. Servers that ignore ranges (or whose file changed) simply
+    send the whole file again.
+
+    Large files from servers that accept ranges are fetched over several
+    connections at once (up to download_segments), each writing its byte
+    range into place in a preallocated file. Connections are added one at
+    a time while each still raises the total throughput by ADD_GAIN.
+
+    Each video is SHA-256 hashed as it is written (job.sha256 once done),
+    and a body that doesn't start like a WebM file fails after its first
+    chunk instead of being downloaded in full.
+
+    on_event(event, job) is called from worker threads for "queued",
+    "started", "progress", "paused", "downloaded", "failed" and
+    "cancelled". A job stays known until complete() is called for it.
+    """
+
+    JOURNAL_FILE = "downloads.json"
+    CHUNK_SIZE = 256 * 1024
+    PROGRESS_STEP = 1024 * 1024  # Report at least this often when size is unknown
+    RETRY_DELAYS = (1, 4, 15)  # Seconds before resuming a dropped download
+    MIN_SEGMENT_SIZE = 4 * 1024 * 1024  # Smaller ranges aren't split further
+    PROBE_SECONDS = 0.5  # Throughput sampling interval of segmented downloads
+    ADD_GAIN = 1.2  # Keep adding connections while each adds 20% throughput
+
+    def __init__(self, api, on_event=None, max_concurrent=None):
+        self.api = api
+        self.on_event = on_event
+        self.max_concurrent = max_concurrent or Config.get("max_concurrent_downloads")
+        # Positioned writes are what lets segments share one file
+        self.max_segments = (
+            Config.get("download_segments") if hasattr(os, "pwrite") else 1
+        )
+        # Identity encoding: byte counts must match the file on disk
+        self.http = ConnectionPool(
+            headers={**api.HEADERS, "Accept-Encoding": "identity"},
+            max_per_host=self.max_concurrent * max(self.max_segments, 1),
+            timeout=60,
+        )
+
+        self.journal_path = api.CACHE_DIR / self.JOURNAL_FILE
+
+        self._lock = threading.Lock()
+        self._jobs = {}  # post id -> DownloadJob
+        self._queue = []  # heap of (priority, seq, job)
+        self._seq = itertools.count()
+        self._running = 0
+
+    # --- Public API ---
+
+    def enqueue(self, post_data, priority=0):
+        """
+        Queues a download of post_data's video. A paused or failed job
+        for the same post is resumed instead; an active one is left alone.
+        """
+        post_id = post_data["id"]
+        with self._lock:
+            job = self._jobs.get(post_id)
+            if job is None:
+                # Next to its destination, so installing is just a rename
+                path = str(FileManager.staging_path(post_id))
+                job = self._jobs[post_id] = DownloadJob(post_data, path, priority)
+            elif job.state in (DownloadJob.PAUSED, DownloadJob.FAILED):
+                job.priority = min(job.priority, priority)
+            else:
+                return job
+            self._push(job)
+            self._save_journal()
+        self._emit("queued", job)
+        self._pump()
+        return job
+
+    def pause(self, post_id):
+        with self._lock:
+            job = self._jobs.get(post_id)
+            if job is None:
+                return
+            if job.state == DownloadJob.QUEUED:
+                job.state = DownloadJob.PAUSED
+                self._save_journal()
+            elif job.state == DownloadJob.RUNNING:
+                # The worker notices between chunks and reports the pause
+                job.stop.set()
+                return
+            else:
+                return
+        self._emit("paused", job)
+
+    def resume(self, post_id):
+        with self._lock:
+            job = self._jobs.get(post_id)
+            if job is None or job.state not in (DownloadJob.PAUSED, DownloadJob.FAILED):
+                return
+            self._push(job)
+            self._save_journal()
+        self._emit("queued", job)
+        self._pump()
+
+    def cancel(self, post_id):
+        with self._lock:
+            job = self._jobs.get(post_id)
+            if job is None:
+                return
+            if job.state == DownloadJob.RUNNING:
+                job.state = DownloadJob.CANCELLED
+                job.stop.set()
+                return
+            self._forget(job)
+        self._emit("cancelled", job)
+
+    def complete(self, post_id):
+        """The downloaded file was installed (or given up on); forget the job."""
+        with self._lock:
+            job = self._jobs.get(post_id)
+            if job is not None and job.state != DownloadJob.RUNNING:
+                self._forget(job)
+
+    def job(self, post_id):
+        with self._lock:
+            return self._jobs.get(post_id)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def restore(self):
+        """Reloads the journal from a previous run and restarts its jobs."""
+        try:
+            with open(self.journal_path, "r") as f:
+                saved = json.load(f)
+        except Exception:
+            return
+
+        downloaded = []
+        with self._lock:
+            for data in saved:
+                try:
+                    job = DownloadJob.from_dict(data)
+                except (KeyError, TypeError):
+                    continue
+                if job.post_id in self._jobs:
+                    continue
+                self._jobs[job.post_id] = job
+                if job.state == DownloadJob.DOWNLOADED:
+                    if os.path.exists(job.path):
+                        downloaded.append(job)
+                    else:
+                        self._push(job)
+                elif job.state in (DownloadJob.QUEUED, DownloadJob.RUNNING):
+                    self._push(job)
+            self._save_journal()
+            queued = [j for j in self._jobs.values() if j.state == DownloadJob.QUEUED]
+
+        for job in queued:
+            self._emit("queued", job)
+        for job in downloaded:
+            self._emit("downloaded", job)
+        self._pump()
+
+    # --- Internals ---
+
+    def _push(self, job):
+        """Queues job; call with the lock held."""
+        job.state = DownloadJob.QUEUED
+        job.error = None
+        job.seq = next(self._seq)
+        heapq.heappush(self._queue, (job.priority, job.seq, job))
+
+    def _forget(self, job):
+        """Drops job and its file; call with the lock held."""
+        self._jobs.pop(job.post_id, None)
+        try:
+            os.remove(job.path)
+        except OSError:
+            pass
+        self._save_journal()
+
+    def _save_journal(self):
+        """Writes every unfinished job; call with the lock held."""
+        jobs = [
+            job.to_dict()
+            for job in self._jobs.values()
+            if job.state != DownloadJob.CANCELLED
+        ]
+        tmp_path = self.journal_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(jobs, f)
+            os.replace(tmp_path, self.journal_path)
+        except Exception as e:
+            print(f"Download journal save failed: {e}")
+
+    def _emit(self, event, job):
+        if self.on_event is not None:
+            try:
+                self.on_event(event, job)
+            except Exception as e:
+                print(f"Download event handler failed: {e}")
+
+    def _pump(self):
+        """Starts queued jobs while there are free slots."""
+        started = []
+        with self._lock:
+            while self._queue and self._running < self.max_concurrent:
+                _, seq, job = heapq.heappop(self._queue)
+                if job.state != DownloadJob.QUEUED or seq != job.seq:
+                    continue  # Paused, cancelled, or re-queued since
+                job.state = DownloadJob.RUNNING
+                job.stop.clear()
+                self._running += 1
+                started.append(job)
+            if started:
+                self._save_journal()
+
+        for job in started:
+            self._emit("started", job)
+            # Daemon: quitting mid-download is fine, the journal restarts it
+            threading.Thread(
+                target=self._run,
+                args=(job,),
+                name=f"download-{job.post_id}",
+                daemon=True,
+            ).start()
+
+    def _run(self, job):
+        try:
+            self._download(job)
+            # A cancel that came in after the last chunk still wins
+            event = "cancelled" if job.state == DownloadJob.CANCELLED else "downloaded"
+        except _Interrupted:
+            event = "cancelled" if job.state == DownloadJob.CANCELLED else "paused"
+        except Exception as e:
+            job.error = str(e) or e.__class__.__name__
+            event = "failed"
+
+        with self._lock:
+            self._running -= 1
+            if event == "cancelled":
+                self._forget(job)
+            else:
+                job.state = {
+                    "downloaded": DownloadJob.DOWNLOADED,
+                    "paused": DownloadJob.PAUSED,
+                    "failed": DownloadJob.FAILED,
+                }[event]
+                self._save_journal()
+        self._emit(event, job)
+        self._pump()
+
+    def _download(self, job):
+        cached_url = self.api.cached_download_url(job.post_id)
+        url = f"{self.api.BASE_URL}/post/download/{job.post_id}"
+        if cached_url:
+            try:
+                self._fetch_with_retries(job, cached_url)
+                return
+            except DownloadError:
+                # The cached CDN link went stale; go through the redirect
+                self.api.forget_download_url(job.post_id)
+        self._fetch_with_retries(job, url)
+
+    def _fetch_with_retries(self, job, url):
+        """Resumes after dropped connections, waiting RETRY_DELAYS between."""
+        for delay in self.RETRY_DELAYS + (None,):
+            try:
+                self._fetch(job, url)
+                return
+            except (OSError, http.client.HTTPException) as e:
+                if delay is None:
+                    raise
+                print(f"Download of {job.post_id} interrupted ({e}); resuming")
+                if job.stop.wait(delay):
+                    raise _Interrupted()
+
+    def _partial_size(self, job):
+        """Bytes of job's file that a Range request can continue from."""
+        if not job.validator:
+            return 0  # Can't tell whether the file on the server changed
+        try:
+            return os.path.getsize(job.path)
+        except OSError:
+            return 0
+
+    def _if_range(self, job):
+        if not job.validator:
+            return {}
+        # The server answers 200 with the whole new file if it changed
+        value = job.validator.get("etag") or job.validator.get("last_modified")
+        return {"If-Range": value} if value else {}
+
+    def _fetch(self, job, url):
+        if job.segments:
+            if job.validator and os.path.exists(job.path):
+                self._fetch_segments(job, url)
+                return
+            job.segments = None  # The partial file is gone; start over
+
+        offset = self._partial_size(job)
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers.update(self._if_range(job))
+
+        with self.http.stream("GET", url, headers) as response:
+            if response.status == 416:
+                if job.total and offset == job.total:
+                    job.received = offset
+                    # Already complete, e.g. stopped before the last state save
+                    self._finish_hash(job)
+                    return
+                # Our partial file doesn't fit the server's; start over
+                job.validator = None
+                raise ConnectionError("Requested range not satisfiable")
+            if response.status >= 300:
+                raise DownloadError(f"HTTP {response.status} {response.reason}")
+            # Remember where the redirect led, so the next install skips it
+            if response.url != url:
+                self.api.remember_download_url(job.post_id, response.url)
+
+            validator = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            if response.status == 206:
+                start, total = parse_content_range(
+                    response.headers.get("Content-Range")
+                )
+                etag = job.validator.get("etag")
+                if (
+                    start != offset
+                    or (etag and validator["etag"] != etag)
+                    or (job.total and total and total != job.total)
+                ):
+                    job.validator = None
+                    raise ConnectionError("Partial content doesn't match the file")
+            else:
+                # Full body: the server ignored the range or the file changed
+                offset = 0
+                total = int(response.headers.get("Content-Length") or 0)
+
+            job.total = total
+            job.received = offset
+            job.validator = validator
+            if not offset or job.hasher is None or job.hasher.pos > offset:
+                job.hasher = _StreamHash()
+            if not offset and self._can_segment(response, total):
+                # This response becomes the first segment
+                self._fetch_segments(job, response.url, response)
+                return
+            with self._lock:
+                self._save_journal()
+
+            reported = -1
+            with open(job.path, "ab" if offset else "wb") as f:
+                # The part from an earlier attempt is hashed once, up front
+                job.hasher.catch_up(job.path, offset, self.CHUNK_SIZE)
+                for chunk in response.iter_chunks(self.CHUNK_SIZE):
+                    if job.stop.is_set():
+                        raise _Interrupted()
+                    self._hash_chunk(job, chunk)
+                    f.write(chunk)
+                    job.received += len(chunk)
+                    # Report each whole percent (or MB when the size is unknown)
+                    step = job.total // 100 if job.total else self.PROGRESS_STEP
+                    if job.received // max(step, 1) != reported:
+                        reported = job.received // max(step, 1)
+                        self._emit("progress", job)
+                # On disk before it is renamed into place
+                f.flush()
+                os.fsync(f.fileno())
+
+        if job.total and job.received != job.total:
+            # Retried like any dropped connection, from where it stopped
+            raise ConnectionError(
+                f"Incomplete download ({job.received} of {job.total} bytes)"
+            )
+        self._finish_hash(job)
+
+    # --- Hashing ---
+
+    def _hash_chunk(self, job, chunk):
+        try:
+            job.hasher.update(chunk)
+        except DownloadError:
+            # Nothing worth resuming: the next attempt starts from scratch
+            job.validator = None
+            raise
+
+    def _finish_hash(self, job):
+        """Hashes whatever the stream didn't and records the digest."""
+        if job.hasher is None:
+            job.hasher = _StreamHash()
+        try:
+            job.hasher.catch_up(job.path, job.received, self.CHUNK_SIZE)
+        except DownloadError:
+            job.validator = None
+            raise
+        job.sha256 = job.hasher.hexdigest()
+        job.hasher = None
+
+    def _advance_hash(self, fetch, chunk, pos):
+        """
+        Moves job.hasher forward over the contiguous bytes written so far;
+        chunk (just written at pos) is used directly if the hash is there.
+        If another segment is already at it, that one carries on instead.
+        """
+        job = fetch.job
+        if not fetch.hash_lock.acquire(blocking=False):
+            return
+        try:
+            hasher = job.hasher
+            if pos == hasher.pos:
+                hasher.update(chunk)
+            while True:
+                # Everything outside the unfinished ranges is on disk
+                end = job.total
+                with fetch.lock:
+                    for s in fetch.segments:
+                        if s.pos < s.end and s.end > hasher.pos:
+                            end = min(end, max(s.pos, hasher.pos))
+                if end <= hasher.pos:
+                    return
+                hasher.catch_up(job.path, end, self.CHUNK_SIZE)
+        except DownloadError:
+            job.validator = None
+            raise
+        finally:
+            fetch.hash_lock.release()
+
+    # --- Segmented downloads ---
+
+    def _can_segment(self, response, total):
+        return (
+            self.max_segments > 1
+            and response.headers.get("Accept-Ranges", "").lower() == "bytes"
+            and total >= 2 * self.MIN_SEGMENT_SIZE
+        )
+
+    def _fetch_segments(self, job, url, first=None):
+        """
+        Downloads job's remaining ranges in parallel into a preallocated
+        file. first, if given, is an open full-body response to read the
+        first range from; otherwise job.segments are resumed.
+        """
+        fd = os.open(job.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if first is None and job.hasher is None:
+                job.hasher = _StreamHash()  # Catches up on the ranges on disk
+            if first is not None:
+                os.ftruncate(fd, job.total)
+                if hasattr(os, "posix_fallocate"):
+                    try:
+                        os.posix_fallocate(fd, 0, job.total)
+                    except OSError:
+                        pass  # Sparse is fine too (e.g. on filesystems without it)
+                job.segments = [[0, job.total]]
+            segments = [_Segment(pos, end) for pos, end in job.segments if pos < end]
+            fetch = _SegmentedFetch(job, url, fd, segments)
+            try:
+                self._run_segments(fetch, first)
+                os.fsync(fd)
+                self._finish_hash(job)
+            finally:
+                with fetch.lock:
+                    remaining = [[s.pos, s.end] for s in segments if s.pos < s.end]
+                job.segments = remaining or None
+                with self._lock:
+                    self._save_journal()
+        finally:
+            os.close(fd)
+
+    def _run_segments(self, fetch, first):
+        """Starts, splits and watches the segment threads until all are done."""
+        job = fetch.job
+        for i, segment in enumerate(fetch.segments):
+            self._start_segment(fetch, segment, first if i == 0 else None)
+        streams = len(fetch.threads)
+
+        baseline = None  # Throughput before the last connection was added
+        adding = streams < self.max_segments
+        reported = -1
+        last_done, last_time = self._segments_done(fetch), time.monotonic()
+        while any(thread.is_alive() for thread in fetch.threads):
+            if job.stop.wait(self.PROBE_SECONDS):
+                fetch.abort.set()
+            if fetch.abort.is_set():
+                break
+
+            done = self._segments_done(fetch)
+            job.received = done
+            if done * 100 // job.total != reported:
+                reported = done * 100 // job.total
+                self._emit("progress", job)
+
+            now = time.monotonic()
+            rate = (done - last_done) / (now - last_time)
+            last_done, last_time = done, now
+            if adding:
+                if baseline is None or rate >= baseline * self.ADD_GAIN:
+                    baseline = rate
+                    streams += 1
+                else:
+                    adding = False  # The link is saturated
+                adding = adding and streams < self.max_segments
+
+            # Keep `streams` connections busy, splitting the largest range
+            alive = sum(thread.is_alive() for thread in fetch.threads)
+            while alive < streams and self._split_segment(fetch):
+                alive += 1
+            with self._lock:
+                with fetch.lock:
+                    job.segments = [[s.pos, s.end] for s in fetch.segments]
+                self._save_journal()
+
+        for thread in fetch.threads:
+            thread.join()
+        if job.stop.is_set():
+            raise _Interrupted()
+        if fetch.error is not None:
+            raise fetch.error
+        job.received = self._segments_done(fetch)
+        if job.received != job.total:
+            raise ConnectionError(
+                f"Incomplete download ({job.received} of {job.total} bytes)"
+            )
+
+    def _segments_done(self, fetch):
+        with fetch.lock:
+            remaining = sum(max(s.remaining(), 0) for s in fetch.segments)
+        return fetch.job.total - remaining
+
+    def _split_segment(self, fetch):
+        """Gives the back half of the largest range to a new connection."""
+        with fetch.lock:
+            largest = max(fetch.segments, key=_Segment.remaining, default=None)
+            if largest is None or largest.remaining() < 2 * self.MIN_SEGMENT_SIZE:
+                return False
+            middle = largest.pos + largest.remaining() // 2
+            segment = _Segment(middle, largest.end)
+            largest.end = middle
+            fetch.segments.append(segment)
+        self._start_segment(fetch, segment)
+        return True
+
+    def _start_segment(self, fetch, segment, response=None):
+        thread = threading.Thread(
+            target=self._segment_worker,
+            args=(fetch, segment, response),
+            name=f"download-{fetch.job.post_id}-{segment.pos}",
+            daemon=True,
+        )
+        fetch.threads.append(thread)
+        thread.start()
+
+    def _segment_worker(self, fetch, segment, response):
+        try:
+            if response is not None:
+                self._read_segment(fetch, segment, response)
+                return
+            with fetch.lock:
+                start, end = segment.pos, segment.end
+            headers = {"Range": f"bytes={start}-{end - 1}", **self._if_range(fetch.job)}
+            with self.http.stream("GET", fetch.url, headers) as response:
+                if response.status != 206:
+                    # The file changed (or ranges stopped working): start over
+                    fetch.job.validator = None
+                    raise ConnectionError(f"Range request answered {response.status}")
+                if (
+                    parse_content_range(response.headers.get("Content-Range"))[0]
+                    != start
+                ):
+                    raise ConnectionError("Range request answered the wrong range")
+                self._read_segment(fetch, segment, response)
+        except Exception as e:
+            if fetch.error is None:
+                fetch.error = e
+            fetch.abort.set()
+
+    def _read_segment(self, fetch, segment, response):
+        for chunk in response.iter_chunks(self.CHUNK_SIZE):
+            if fetch.abort.is_set() or fetch.job.stop.is_set():
+                return
+            with fetch.lock:
+                pos, end = segment.pos, segment.end
+            chunk = chunk[: end - pos]
+            os.pwrite(fetch.fd, chunk, pos)
+            with fetch.lock:
+                segment.pos += len(chunk)
+                finished = segment.pos >= segment.end
+            self._advance_hash(fetch, chunk, pos)
+            if finished:
+                return  # Reached the end, which may have moved up meanwhile
+        with fetch.lock:
+            if segment.pos < segment.end:
+                raise ConnectionError("Connection closed mid-range")
+
+
+def parse_content_range(value):
+    """(start, total) from a "bytes start-end/total" header; total 0 if "*"."""
+    try:
+        unit, _, spec = (value or "").partition(" ")
+        span, _, total = spec.partition("/")
+        start = int(span.split("-")[0])
+        return start, 0 if total == "*" else int(total)
+    except ValueError:
+        raise DownloadError(f"Bad Content-Range: {value!r}")
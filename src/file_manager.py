@@ -1,11 +1,17 @@
 import os
 import shutil
 import json
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from src.config import Config
 
 
 class FileManager:
+    COPY_CHUNK = 1024 * 1024
+    SUSPEND_NAME = "deck-suspend-animation.webm"
+
     @staticmethod
     def ensure_directories():
         """Creates the install directory if it doesn't exist."""
@@ -23,6 +29,57 @@ class FileManager:
         (path / ".manager").mkdir(exist_ok=True)
         return path
 
+    @staticmethod
+    def staging_path(name):
+        """
+        Hidden file in the install directory to download name into, so
+        installing it is a rename rather than a copy.
+        """
+        return FileManager.ensure_directories() / f".{name}.webm.part"
+
+    @staticmethod
+    def _fsync_dir(path):
+        """Makes a rename in path durable; not possible (or needed) on Windows."""
+        if os.name == "nt":
+            return
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _place(source_path, dest_path, progress=None):
+        """
+        Atomically puts source_path's content at dest_path. A source on the
+        same filesystem (e.g. from staging_path) is renamed; otherwise it is
+        copied once into a hidden file next to dest_path, synced, and renamed.
+        progress(done, total) is called as bytes are copied.
+        """
+        total = os.path.getsize(source_path)
+        try:
+            os.replace(source_path, dest_path)
+        except OSError:
+            # Different filesystem
+            tmp_path = dest_path.with_name(f".{dest_path.name}.tmp")
+            done = 0
+            with open(source_path, "rb") as src, open(tmp_path, "wb") as dst:
+                while True:
+                    chunk = src.read(FileManager.COPY_CHUNK)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    done += len(chunk)
+                    if progress:
+                        progress(done, total)
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.replace(tmp_path, dest_path)
+            os.remove(source_path)
+        FileManager._fsync_dir(dest_path.parent)
+        if progress:
+            progress(total, total)
+
     @staticmethod
     def _save_metadata(slug, post_data, local_thumb_path=None):
         """Saves metadata and moves local thumbnail to .manager directory."""
@@ -44,16 +101,19 @@ class FileManager:
             print(f"Metadata save failed: {e}")
 
     @staticmethod
-    def install_boot_video(source_path, slug, post_data=None, thumb_path=None):
+    def install_boot_video(
+        source_path, slug, post_data=None, thumb_path=None, progress=None
+    ):
         """
         Installs a boot video to {install_path}/{slug}.webm.
+        source_path is moved there, not copied.
         """
         target_dir = FileManager.ensure_directories()
         dest_filename = f"{slug}.webm"
         dest_path = target_dir / dest_filename
 
         try:
-            shutil.copy2(source_path, dest_path)
+            FileManager._place(source_path, dest_path, progress)
             if post_data:
                 FileManager._save_metadata(slug, post_data, thumb_path)
 
@@ -63,25 +123,37 @@ class FileManager:
             return False, str(e)
 
     @staticmethod
-    def install_suspend_video(source_path, post_data=None, thumb_path=None):
+    def install_suspend_video(
+        source_path, post_data=None, thumb_path=None, progress=None
+    ):
         """
         Installs a suspend video to {install_path}/deck-suspend-animation.webm.
-        Backs up existing file if present.
+        Backs up existing file if present. source_path is moved, not copied.
         """
         target_dir = FileManager.ensure_directories()
-        target_name = "deck-suspend-animation.webm"
-        dest_path = target_dir / target_name
+        dest_path = target_dir / FileManager.SUSPEND_NAME
 
         if dest_path.exists():
             backup_path = dest_path.with_suffix(".webm.bak")
             try:
-                shutil.move(str(dest_path), str(backup_path))
+                # Hardlink the current video as the backup, so the slot is
+                # never empty: the new one replaces it in a single rename
+                link_path = backup_path.with_name(f".{backup_path.name}.tmp")
+                if link_path.exists():
+                    link_path.unlink()
+                os.link(dest_path, link_path)
+                os.replace(link_path, backup_path)
                 print(f"Backed up existing suspend video to {backup_path}")
-            except Exception as e:
-                print(f"Backup failed: {e}")
+            except OSError:
+                # No hardlinks on this filesystem: rename it instead
+                try:
+                    os.replace(dest_path, backup_path)
+                    print(f"Backed up existing suspend video to {backup_path}")
+                except Exception as e:
+                    print(f"Backup failed: {e}")
 
         try:
-            shutil.copy2(source_path, dest_path)
+            FileManager._place(source_path, dest_path, progress)
             if post_data:
                 # Use fixed slug 'suspend' for the active suspend video metadata
                 FileManager._save_metadata("suspend", post_data, thumb_path)
@@ -91,6 +163,37 @@ class FileManager:
         except Exception as e:
             return False, str(e)
 
+    @staticmethod
+    def target_name(post_data):
+        """Filename a post installs to."""
+        if post_data.get("type") == "boot_video":
+            return f"{post_data.get('slug', 'unknown')}.webm"
+        return FileManager.SUSPEND_NAME
+
+    @staticmethod
+    def install_video(source_path, post_data, thumb_path=None, progress=None):
+        """
+        Installs a downloaded post as a boot or suspend video by its type,
+        then removes whatever is left of the download and its thumbnail.
+        """
+        if post_data.get("type") == "boot_video":
+            success, msg = FileManager.install_boot_video(
+                source_path,
+                post_data.get("slug", "unknown"),
+                post_data,
+                thumb_path,
+                progress,
+            )
+        else:
+            success, msg = FileManager.install_suspend_video(
+                source_path, post_data, thumb_path, progress
+            )
+
+        for path in (source_path, thumb_path):
+            if path and os.path.exists(path):
+                os.remove(path)
+        return success, msg
+
     @staticmethod
     def get_installed_files():
         """
@@ -106,7 +209,7 @@ class FileManager:
         files = []
         try:
             for item in path.glob("*.webm"):
-                if item.name == "deck-suspend-animation.webm":
+                if item.name == FileManager.SUSPEND_NAME:
                     vtype = "suspend"
                     slug = "suspend"
                 else:
@@ -153,7 +256,7 @@ class FileManager:
                 file_path.unlink()
 
                 # Determine slug for metadata deletion
-                if filename == "deck-suspend-animation.webm":
+                if filename == FileManager.SUSPEND_NAME:
                     slug = "suspend"
                 else:
                     slug = Path(filename).stem
@@ -173,3 +276,96 @@ class FileManager:
                 return False, "File not found"
         except Exception as e:
             return False, str(e)
+
+
+class AsyncFileManager:
+    """
+    Runs FileManager's installs, deletes and listings on a worker pool so
+    the caller never waits on disk. Every call returns a Future.
+
+    Operations on the same installed file run one after another, in the
+    order they were submitted; a queued one does not occupy a worker.
+    """
+
+    MAX_WORKERS = 2
+
+    def __init__(self, max_workers=None):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or self.MAX_WORKERS,
+            thread_name_prefix="files",
+        )
+        self._lock = threading.Lock()
+        self._pending = {}  # filename -> deque of (future, fn, args) waiting
+
+    def install(self, source_path, post_data, thumb_path=None, progress=None):
+        """
+        Future of FileManager.install_video's (success, msg).
+        progress(done, total) is called from the worker as the video is placed.
+        """
+        return self._submit(
+            FileManager.target_name(post_data),
+            FileManager.install_video,
+            source_path,
+            post_data,
+            thumb_path,
+            progress,
+        )
+
+    def delete(self, filename):
+        """Future of FileManager.delete_file's (success, msg)."""
+        return self._submit(filename, FileManager.delete_file, filename)
+
+    def list_installed(self):
+        """Future of FileManager.get_installed_files' list."""
+        return self._submit(None, FileManager.get_installed_files)
+
+    def shutdown(self, wait=True):
+        """Stops the pool; operations still queued behind others are cancelled."""
+        with self._lock:
+            queued = [item[0] for queue in self._pending.values() for item in queue]
+            for queue in self._pending.values():
+                queue.clear()
+        for future in queued:
+            future.cancel()
+        self.executor.shutdown(wait=wait)
+
+    def _submit(self, key, fn, *args):
+        if key is None:
+            return self.executor.submit(fn, *args)
+
+        future = Future()
+        with self._lock:
+            queue = self._pending.get(key)
+            if queue is not None:
+                # Another operation on this file is running: wait behind it
+                queue.append((future, fn, args))
+                return future
+            self._pending[key] = deque()
+        self._start(key, future, fn, args)
+        return future
+
+    def _start(self, key, future, fn, args):
+        try:
+            self.executor.submit(self._run, key, future, fn, args)
+        except RuntimeError as e:
+            # The pool was shut down: fail this and whatever queued behind it
+            with self._lock:
+                queue = self._pending.pop(key, ())
+            for waiting in [future] + [item[0] for item in queue]:
+                if waiting.set_running_or_notify_cancel():
+                    waiting.set_exception(e)
+
+    def _run(self, key, future, fn, args):
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+        with self._lock:
+            queue = self._pending[key]
+            if not queue:
+                del self._pending[key]
+                return
+            future, fn, args = queue.popleft()
+        self._start(key, future, fn, args)
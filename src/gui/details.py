@@ -10,9 +10,10 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, QUrl, Signal
 from PySide6.QtGui import QPixmap, QDesktopServices
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PySide6.QtMultimediaWidgets import QVideoWidget
+from .network import NetworkScheduler
+from .thumbnails import ThumbnailLoader
 
 
 class DetailsView(QWidget):
@@ -139,10 +140,6 @@ class DetailsView(QWidget):
 
         root_layout.addWidget(right_container, stretch=35)
 
-        # Network for thumbnail
-        self.net_manager = QNetworkAccessManager(self)
-        self.net_manager.finished.connect(self.on_image_loaded)
-
     def load_post(self, post_data):
         self.post_data = post_data
 
@@ -174,18 +171,25 @@ class DetailsView(QWidget):
         # Load Thumbnail (as fallback/poster)
         self.thumb_label.setText("Loading Preview...")
         self.thumb_label.setPixmap(QPixmap())
-        if post_data.get("thumbnail"):
-            self.net_manager.get(QNetworkRequest(QUrl(post_data["thumbnail"])))
-
-    def on_image_loaded(self, reply):
-        if reply.error() == QNetworkReply.NetworkError.NoError:
-            data = reply.readAll()
-            pixmap = QPixmap()
-            pixmap.loadFromData(data)
-            self.thumb_label.setPixmap(pixmap)
-            # Center and scale thumb_label to fill video area
-            self.resize_thumbnail()
-        reply.deleteLater()
+        thumb_url = post_data.get("thumbnail")
+        if thumb_url:
+            # Usually a cache hit: the card that opened this view loaded it
+            # Full size: the label stretches it over the video area
+            ThumbnailLoader.instance().load_pixmap(
+                thumb_url,
+                None,
+                self,
+                lambda pixmap: self.on_image_loaded(thumb_url, pixmap),
+                priority=NetworkScheduler.DETAILS,
+                wanted=lambda: self.post_data.get("thumbnail") == thumb_url,
+            )
+
+    def on_image_loaded(self, url, pixmap):
+        if pixmap is None or url != self.post_data.get("thumbnail"):
+            return  # Failed, or another post was opened meanwhile
+        self.thumb_label.setPixmap(pixmap)
+        # Center and scale thumb_label to fill video area
+        self.resize_thumbnail()
 
     def resizeEvent(self, event):
         self.resize_thumbnail()
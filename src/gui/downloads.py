@@ -0,0 +1,55 @@
+from PySide6.QtCore import QObject, Signal
+from ..downloads import DownloadManager
+
+
+class DownloadController(QObject):
+    """
+    Qt face of the DownloadManager. Its worker-thread events arrive as
+    signals on the GUI thread, so any view can follow a download whether
+    or not a card for it exists.
+    """
+
+    queued = Signal(str)  # post id
+    started = Signal(str)
+    progress = Signal(str, object, object)  # post id, bytes received, total or 0
+    paused = Signal(str)
+    downloaded = Signal(str, str)  # post id, path of the finished file
+    failed = Signal(str, str)  # post id, error message
+    cancelled = Signal(str)
+
+    def __init__(self, api, parent=None):
+        super().__init__(parent)
+        self.manager = DownloadManager(api, on_event=self._on_event)
+
+    def _on_event(self, event, job):
+        # Emitted from worker threads; queued to the GUI thread's receivers
+        post_id = job.post_id
+        if event == "progress":
+            self.progress.emit(post_id, job.received, job.total)
+        elif event == "downloaded":
+            self.downloaded.emit(post_id, job.path)
+        elif event == "failed":
+            self.failed.emit(post_id, job.error or "Download failed")
+        else:
+            getattr(self, event).emit(post_id)
+
+    def enqueue(self, post_data, priority=0):
+        self.manager.enqueue(post_data, priority)
+
+    def pause(self, post_id):
+        self.manager.pause(post_id)
+
+    def resume(self, post_id):
+        self.manager.resume(post_id)
+
+    def cancel(self, post_id):
+        self.manager.cancel(post_id)
+
+    def complete(self, post_id):
+        self.manager.complete(post_id)
+
+    def job(self, post_id):
+        return self.manager.job(post_id)
+
+    def restore(self):
+        self.manager.restore()
@@ -0,0 +1,63 @@
+from PySide6.QtCore import QObject, Signal
+from ..file_manager import AsyncFileManager
+
+
+class FileController(QObject):
+    """
+    Qt face of the AsyncFileManager. Installs, deletes and library scans
+    run on its workers; their results arrive as signals on the GUI thread.
+    """
+
+    installed = Signal(str, bool, str)  # post id, success, message
+    install_progress = Signal(str, object, object)  # post id, bytes placed, total
+    deleted = Signal(str, bool, str)  # filename, success, message
+    listed = Signal(object)  # FileManager.get_installed_files() list
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.manager = AsyncFileManager()
+        self._list_seq = 0
+
+    def install(self, post_data, source_path, thumb_path=None):
+        post_id = post_data.get("id")
+
+        def progress(done, total):
+            self.install_progress.emit(post_id, done, total)
+
+        future = self.manager.install(source_path, post_data, thumb_path, progress)
+        future.add_done_callback(
+            lambda f: self.installed.emit(post_id, *self._outcome(f))
+        )
+
+    def delete(self, filename):
+        future = self.manager.delete(filename)
+        future.add_done_callback(
+            lambda f: self.deleted.emit(filename, *self._outcome(f))
+        )
+
+    def list_installed(self):
+        # Scans may finish out of order; only the latest one is reported
+        self._list_seq += 1
+        seq = self._list_seq
+        future = self.manager.list_installed()
+        future.add_done_callback(lambda f: self._on_listed(seq, f))
+
+    def _on_listed(self, seq, future):
+        if seq != self._list_seq:
+            return
+        try:
+            files = future.result()
+        except Exception as e:
+            print(f"Error listing files: {e}")
+            files = []
+        self.listed.emit(files)
+
+    @staticmethod
+    def _outcome(future):
+        try:
+            return future.result()
+        except Exception as e:
+            return False, str(e)
+
+    def shutdown(self):
+        self.manager.shutdown(wait=False)
@@ -0,0 +1,187 @@
+import heapq
+import itertools
+from PySide6.QtCore import QObject, QUrl
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest
+
+
+class _Job:
+    __slots__ = (
+        "url",
+        "host",
+        "priority",
+        "on_finished",
+        "on_started",
+        "owners",
+        "done",
+    )
+
+    def __init__(self, url, priority, on_finished, on_started):
+        self.url = url
+        self.host = QUrl(url).host()
+        self.priority = priority
+        self.on_finished = on_finished
+        self.on_started = on_started
+        self.owners = set()  # ids of the QObjects that still want the result
+        self.done = False
+
+
+class NetworkScheduler(QObject):
+    """
+    The one QNetworkAccessManager of the app. GET requests wait in a
+    priority queue and at most MAX_PER_HOST run per host at once, so
+    visible thumbnails are never stuck behind prefetches. HTTP/2 is used
+    where the server offers it.
+
+    A request tied to owner widgets is cancelled as soon as the last of
+    them is destroyed (or cancel_owner() is called for it), whether it is
+    still queued or already running.
+    """
+
+    # Priority classes, most urgent first
+    VISIBLE = 0  # Cards on screen, and installs the user started
+    DETAILS = 1  # Details view preview
+    PREFETCH = 2  # Neighbouring pages
+    BACKGROUND = 3  # Anything nobody is waiting for
+
+    MAX_PER_HOST = 6
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.manager = QNetworkAccessManager(self)
+
+        self._queue = []  # heap of (priority, seq, job)
+        self._seq = itertools.count()
+        self._running = {}  # job -> reply
+        self._per_host = {}  # host -> running request count
+        self._owners = {}  # id(owner) -> set of jobs
+
+        self.stats = {"started": 0, "cancelled": 0}
+
+    def get(self, url, priority, owner=None, on_finished=None, on_started=None):
+        """
+        Schedules a GET of url and returns a job handle.
+        on_started(reply) runs when the request is actually sent;
+        on_finished(reply) runs exactly once when it ends, with reply None
+        if it was cancelled before being sent. Replies are deleted by the
+        scheduler afterwards.
+        """
+        job = _Job(url, priority, on_finished, on_started)
+        if owner is not None:
+            self.add_owner(job, owner)
+        heapq.heappush(self._queue, (priority, next(self._seq), job))
+        self._pump()
+        return job
+
+    def add_owner(self, job, owner):
+        """Ties job to one more QObject; it is cancelled once all are gone."""
+        key = id(owner)
+        job.owners.add(key)
+        jobs = self._owners.get(key)
+        if jobs is None:
+            jobs = self._owners[key] = set()
+            owner.destroyed.connect(lambda *_, k=key: self._owner_gone(k))
+        jobs.add(job)
+
+    def reprioritize(self, job, priority):
+        """Raises a queued job's priority (e.g. a prefetch became visible)."""
+        if priority >= job.priority or job in self._running:
+            return
+        job.priority = priority
+        # The stale heap entry is skipped because its priority no longer matches
+        heapq.heappush(self._queue, (priority, next(self._seq), job))
+        self._pump()
+
+    def pending(self, max_priority):
+        """Number of unfinished requests at max_priority or more urgent."""
+        running = sum(1 for job in self._running if job.priority <= max_priority)
+        queued = sum(
+            1
+            for priority, _, job in self._queue
+            if priority <= max_priority and priority == job.priority and not job.done
+        )
+        return running + queued
+
+    def cancel_owner(self, owner):
+        """Call right before deleting owner; its requests stop immediately."""
+        self._release_owner(id(owner))
+
+    def cancel(self, job):
+        if job.done:
+            return
+        self.stats["cancelled"] += 1
+        reply = self._running.get(job)
+        if reply is not None:
+            # Emits finished synchronously; _on_finished reports it
+            reply.abort()
+            return
+        job.done = True
+        if job.on_finished is not None:
+            job.on_finished(None)
+
+    def _release_owner(self, key):
+        """Drops key's claim on its jobs, cancelling those nobody else wants."""
+        jobs = self._owners.get(key)
+        if not jobs:
+            return
+        for job in list(jobs):
+            job.owners.discard(key)
+            if not job.owners:
+                self.cancel(job)
+        jobs.clear()
+
+    def _owner_gone(self, key):
+        self._release_owner(key)
+        # The id may be reused by a new object, which must connect afresh
+        self._owners.pop(key, None)
+
+    def _pump(self):
+        """Starts the most urgent queued jobs whose host has a free slot."""
+        blocked = []
+        while self._queue:
+            priority, seq, job = heapq.heappop(self._queue)
+            if job.done or priority != job.priority:
+                continue  # Cancelled, or a reprioritized duplicate
+            if self._per_host.get(job.host, 0) >= self.MAX_PER_HOST:
+                blocked.append((priority, seq, job))
+                continue
+            self._start(job)
+        for entry in blocked:
+            heapq.heappush(self._queue, entry)
+
+    def _start(self, job):
+        request = QNetworkRequest(QUrl(job.url))
+        request.setAttribute(QNetworkRequest.Attribute.Http2AllowedAttribute, True)
+        request.setPriority(
+            QNetworkRequest.Priority.HighPriority
+            if job.priority <= self.DETAILS
+            else QNetworkRequest.Priority.LowPriority
+        )
+        reply = self.manager.get(request)
+        self._running[job] = reply
+        self._per_host[job.host] = self._per_host.get(job.host, 0) + 1
+        self.stats["started"] += 1
+        reply.finished.connect(lambda: self._on_finished(job))
+        if job.on_started is not None:
+            job.on_started(reply)
+
+    def _on_finished(self, job):
+        reply = self._running.pop(job)
+        self._per_host[job.host] -= 1
+        for key in job.owners:
+            jobs = self._owners.get(key)
+            if jobs is not None:
+                jobs.discard(job)
+
+        job.done = True
+        if job.on_finished is not None:
+            job.on_finished(reply)
+        reply.deleteLater()
+        self._pump()
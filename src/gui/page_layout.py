@@ -0,0 +1,55 @@
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+class PageLayoutManager(QObject):
+    """
+    Works out the browse grid's columns and rows from the window size.
+
+    A window drag sends dozens of resize events; they are coalesced into
+    one changed(cols, rows) emitted SETTLE_MS after the last of them, and
+    only if the grid shape actually changed.
+    """
+
+    SETTLE_MS = 120
+
+    # Optimized for Steam Deck (1280x800). Header (~60) + Tabs (~50) +
+    # Pagination (~40) + Margins (~20) = ~170px, rounded up
+    RESERVED_HEIGHT = 180
+    RESERVED_WIDTH = 40
+    CELL_WIDTH = 290 + 20  # Card plus spacing
+    CELL_HEIGHT = 270 + 10
+
+    changed = Signal(int, int)  # cols, rows
+
+    def __init__(self, cols=4, rows=3, parent=None):
+        super().__init__(parent)
+        self.cols = cols
+        self.rows = rows
+        self._size = None
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.SETTLE_MS)
+        self.timer.timeout.connect(self._on_settled)
+
+    @property
+    def page_size(self):
+        return self.cols * self.rows
+
+    def resized(self, size):
+        """Call from resizeEvent; restarts the settle timer."""
+        self._size = size
+        self.timer.start()
+
+    def grid_for(self, size):
+        """(cols, rows) that fit in a window of the given QSize."""
+        cols = max(1, (size.width() - self.RESERVED_WIDTH) // self.CELL_WIDTH)
+        rows = max(1, (size.height() - self.RESERVED_HEIGHT) // self.CELL_HEIGHT)
+        return cols, rows
+
+    def _on_settled(self):
+        cols, rows = self.grid_for(self._size)
+        if (cols, rows) == (self.cols, self.rows):
+            return
+        self.cols, self.rows = cols, rows
+        self.changed.emit(cols, rows)
@@ -0,0 +1,327 @@
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QEvent,
+    QModelIndex,
+    QObject,
+    QRect,
+    QSize,
+    Qt,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QColor, QFont, QPainter, QPainterPath, QPen
+from PySide6.QtWidgets import QListView, QStyle, QStyledItemDelegate
+from .network import NetworkScheduler
+from .registry import DownloadStateStore
+from .theme import Theme
+from .thumbnails import ThumbnailLoader
+from .widgets import VideoCard
+
+PostRole = Qt.ItemDataRole.UserRole + 1
+ThumbnailRole = Qt.ItemDataRole.UserRole + 2
+ProgressRole = Qt.ItemDataRole.UserRole + 3  # None, 0-100, or "installed"
+# ThumbnailRole is a QPixmap, None while loading, or False if there is none
+
+
+class PostListModel(QAbstractListModel):
+    """
+    List model over a search result (list, CatalogView or QueryResult).
+    Rows are exposed FETCH_BATCH at a time as the view scrolls (fetchMore),
+    posts are read BLOCK_SIZE at a time on first paint, and thumbnails are
+    requested only for rows that are actually painted.
+    """
+
+    FETCH_BATCH = 120
+    BLOCK_SIZE = 60
+
+    def __init__(self, download_states=None, parent=None):
+        super().__init__(parent)
+        self.posts = []
+        self._count = 0  # len(posts) when set; the list may grow in place
+        self._loaded = 0  # Rows exposed to the view so far
+        self._blocks = {}  # block number -> list of posts
+        self._rows_by_id = {}
+        self._requested = set()  # Thumbnail URLs asked for since the last rotate
+        self._failed = set()  # Thumbnail URLs that could not be loaded
+        self.download_states = download_states or DownloadStateStore(self)
+        self.download_states.changed.connect(self._on_state_changed)
+
+        self.loader = ThumbnailLoader.instance()
+        # Owner of the thumbnail requests; rotated when the view scrolls away
+        self._owner = QObject(self)
+
+    def set_posts(self, posts):
+        self.beginResetModel()
+        self.posts = posts
+        self._count = len(posts)
+        self._loaded = min(self._count, self.FETCH_BATCH)
+        self._blocks = {}
+        self._rows_by_id = {}
+        self._failed = set()
+        self.rotate_requests()
+        self.endResetModel()
+
+    def shows(self, posts):
+        """True if posts is already displayed as it is now."""
+        return posts is self.posts and len(posts) == self._count
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < self._count
+
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(self.FETCH_BATCH, self._count - self._loaded)
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def post(self, row):
+        block, offset = divmod(row, self.BLOCK_SIZE)
+        posts = self._blocks.get(block)
+        if posts is None:
+            # One slice (a single LIMIT query for a QueryResult) per block
+            start = block * self.BLOCK_SIZE
+            posts = self._blocks[block] = list(
+                self.posts[start : start + self.BLOCK_SIZE]
+            )
+            for i, post in enumerate(posts):
+                self._rows_by_id[post.get("id")] = start + i
+        return posts[offset]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        post = self.post(index.row())
+        if role == PostRole:
+            return post
+        if role == Qt.ItemDataRole.DisplayRole:
+            return post.get("title", "Untitled")
+        if role == ThumbnailRole:
+            return self._thumbnail(index.row(), post)
+        if role == ProgressRole:
+            return self.download_states.get(post.get("id"))
+        return None
+
+    def _thumbnail(self, row, post):
+        url = post.get("thumbnail")
+        if not url or url in self._failed:
+            return False
+        pixmap = self.loader.cached_pixmap(url, VideoCard.THUMB_SIZE)
+        if pixmap is None and url not in self._requested:
+            self._requested.add(url)
+            posts = self.posts
+            self.loader.load_pixmap(
+                url,
+                VideoCard.THUMB_SIZE,
+                self._owner,
+                lambda pixmap: self._on_thumbnail(posts, row, url, pixmap),
+            )
+        return pixmap
+
+    def _on_thumbnail(self, posts, row, url, pixmap):
+        if posts is not self.posts or row >= self._loaded:
+            return  # Results changed meanwhile
+        if pixmap is None:
+            self._failed.add(url)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [ThumbnailRole])
+
+    def rotate_requests(self, repaint=None):
+        """
+        Cancels thumbnail downloads for rows that are no longer painted.
+        repaint() is called in between, so rows still on screen ask again
+        first and keep their downloads alive.
+        """
+        old = self._owner
+        self._owner = QObject(self)
+        self._requested = set()
+        if repaint is not None:
+            repaint()
+        NetworkScheduler.instance().cancel_owner(old)
+        old.deleteLater()
+
+    def set_progress(self, post_id, value):
+        """value: percent, "installed", or None to clear."""
+        self.download_states.set(post_id, value)
+
+    def _on_state_changed(self, post_id, state):
+        row = self._rows_by_id.get(post_id)
+        if row is not None and row < self._loaded:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [ProgressRole])
+
+
+class PostCardDelegate(QStyledItemDelegate):
+    """Paints a post like a VideoCard; Info and Install are hit areas."""
+
+    install_clicked = Signal(object)
+    details_clicked = Signal(object)
+
+    CARD_SIZE = QSize(290, 290)
+    MARGIN = 6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.title_font = QFont()
+        self.title_font.setPixelSize(14)
+        self.title_font.setBold(True)
+        self.meta_font = QFont()
+        self.meta_font.setPixelSize(11)
+        self.button_font = QFont()
+        self.button_font.setPixelSize(12)
+        self.button_font.setBold(True)
+
+    def sizeHint(self, option, index):
+        return self.CARD_SIZE
+
+    def _layout(self, rect):
+        """Sub-rectangles of a card at rect: thumb, title, meta, info, install."""
+        m = self.MARGIN
+        inner = rect.adjusted(m, m, -m, -m)
+        thumb = QRect(inner.topLeft(), VideoCard.THUMB_SIZE)
+        title = QRect(inner.left(), thumb.bottom() + 3, inner.width(), 40)
+        meta = QRect(inner.left(), title.bottom() + 3, inner.width(), 16)
+        buttons_top = inner.bottom() - 30 - 10
+        info = QRect(inner.left(), buttons_top, 60, 30)
+        install = QRect(
+            info.right() + 5, buttons_top, inner.right() - info.right() - 4, 30
+        )
+        return thumb, title, meta, info, install
+
+    def paint(self, painter, option, index):
+        post = index.data(PostRole)
+        if post is None:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        rect = option.rect.adjusted(3, 3, -3, -3)
+        hover = option.state & QStyle.StateFlag.State_MouseOver
+        painter.setPen(QPen(QColor(Theme.BLUE_500 if hover else Theme.SLATE_600), 2))
+        painter.setBrush(QColor(Theme.SLATE_700 if hover else Theme.SLATE_800))
+        painter.drawRoundedRect(rect, 12, 12)
+
+        thumb, title, meta, info, install = self._layout(rect)
+
+        # Thumbnail
+        path = QPainterPath()
+        path.addRoundedRect(thumb, 6, 6)
+        painter.fillPath(path, QColor(Theme.SLATE_950))
+        pixmap = index.data(ThumbnailRole)
+        painter.setPen(QColor("#94a3b8"))
+        if pixmap is None or pixmap is False:
+            painter.setFont(self.meta_font)
+            text = "Loading..." if pixmap is None else "No Image"
+            painter.drawText(thumb, Qt.AlignmentFlag.AlignCenter, text)
+        else:
+            painter.save()
+            painter.setClipPath(path)
+            painter.drawPixmap(thumb, pixmap)
+            painter.restore()
+
+        # Title and meta row
+        painter.setFont(self.title_font)
+        painter.setPen(QColor(Theme.SLATE_100))
+        painter.drawText(
+            title,
+            Qt.AlignmentFlag.AlignTop
+            | Qt.AlignmentFlag.AlignLeft
+            | Qt.TextFlag.TextWordWrap,
+            post.get("title", "Untitled"),
+        )
+        painter.setFont(self.meta_font)
+        painter.setPen(QColor("#94a3b8"))
+        author = (post.get("user") or {}).get("steam_name", "Unknown")
+        painter.drawText(meta, Qt.AlignmentFlag.AlignLeft, f"By {author}")
+        painter.drawText(
+            meta, Qt.AlignmentFlag.AlignRight, f"{post.get('downloads', 0)} DLs"
+        )
+
+        # Buttons, or the download progress bar
+        painter.setFont(self.button_font)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(Theme.SLATE_700))
+        painter.drawRoundedRect(info, 6, 6)
+        painter.setPen(QColor("white"))
+        painter.drawText(info, Qt.AlignmentFlag.AlignCenter, "Info")
+
+        progress = index.data(ProgressRole)
+        if isinstance(progress, int):
+            bar = QRect(install.left(), install.center().y() - 4, install.width(), 8)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(Theme.SLATE_700))
+            painter.drawRoundedRect(bar, 4, 4)
+            bar.setWidth(bar.width() * progress // 100)
+            painter.setBrush(QColor(Theme.BLUE_500))
+            painter.drawRoundedRect(bar, 4, 4)
+        else:
+            installed = progress == "installed"
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(Theme.GREEN_500 if installed else Theme.BLUE_500))
+            painter.drawRoundedRect(install, 6, 6)
+            painter.setPen(QColor("white"))
+            painter.drawText(
+                install,
+                Qt.AlignmentFlag.AlignCenter,
+                "Installed!" if installed else "Install",
+            )
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (
+            event.type() == QEvent.Type.MouseButtonRelease
+            and event.button() == Qt.MouseButton.LeftButton
+        ):
+            post = index.data(PostRole)
+            if post is None:
+                return False
+            install = self._layout(option.rect.adjusted(3, 3, -3, -3))[4]
+            if install.contains(event.position().toPoint()):
+                if not isinstance(index.data(ProgressRole), int):
+                    model.set_progress(post.get("id"), 0)
+                    self.install_clicked.emit(post)
+            else:
+                self.details_clicked.emit(post)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class PostListView(QListView):
+    """
+    Virtualized, infinitely scrolling card grid: only rows in the viewport
+    are painted, so the whole catalog scrolls smoothly.
+    """
+
+    SCROLL_SETTLE_MS = 150
+
+    def __init__(self, download_states=None, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(40)
+        self.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.setMouseTracking(True)  # Hover highlight
+        self.setSpacing(3)
+        self.setStyleSheet(f"background-color: {Theme.SLATE_900}; border: none;")
+
+        self.post_model = PostListModel(download_states, self)
+        self.setModel(self.post_model)
+        self.card_delegate = PostCardDelegate(self)
+        self.setItemDelegate(self.card_delegate)
+
+        # After a fling, drop thumbnail requests for rows that scrolled away
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(self.SCROLL_SETTLE_MS)
+        self.settle_timer.timeout.connect(self._on_scroll_settled)
+        self.verticalScrollBar().valueChanged.connect(self.settle_timer.start)
+
+    def _on_scroll_settled(self):
+        self.post_model.rotate_requests(self.viewport().repaint)
@@ -0,0 +1,130 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from .network import NetworkScheduler
+from .thumbnails import ThumbnailLoader
+from .widgets import VideoCard
+
+
+class _ResolveTask(QRunnable):
+    def __init__(self, prefetcher, post_id):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.post_id = post_id
+
+    def run(self):
+        try:
+            self.prefetcher.api.resolve_download_urls([self.post_id])
+        except Exception as e:
+            print(f"Download URL prefetch failed: {e}")
+        # Queued back to the GUI thread
+        self.prefetcher._resolved.emit(self.post_id)
+
+
+class Prefetcher(QObject):
+    """
+    Speculative loading that stays out of the way of visible work.
+
+    Once a page has been idle for IDLE_MS (no visible or details requests
+    left), thumbnails of the next and previous page are decoded into the
+    pixmap cache at PREFETCH priority, at most MAX_IN_FLIGHT at a time.
+    Hovering a card for HOVER_MS resolves its download redirect, one at a
+    time, so Install can go straight to the CDN.
+    """
+
+    IDLE_MS = 400
+    HOVER_MS = 250
+    MAX_IN_FLIGHT = 2
+
+    _resolved = Signal(str)
+
+    def __init__(self, api, parent=None):
+        super().__init__(parent)
+        self.api = api
+        self.loader = ThumbnailLoader.instance()
+        self.scheduler = NetworkScheduler.instance()
+
+        self._posts = []
+        self._page = 0
+        self._page_size = 0
+        self._urls = []
+        self._in_flight = 0
+        # Owner of this page's prefetches; replaced (cancelling them) per page
+        self._round = QObject(self)
+
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.setInterval(self.IDLE_MS)
+        self.idle_timer.timeout.connect(self._on_idle)
+
+        self._hovered = None
+        self._resolving = set()
+        self.resolve_pool = QThreadPool(self)
+        self.resolve_pool.setMaxThreadCount(1)
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.setInterval(self.HOVER_MS)
+        self.hover_timer.timeout.connect(self._on_hover_timeout)
+        self._resolved.connect(self._on_resolved)
+
+    def schedule(self, posts, page, page_size):
+        """Call after rendering a page; prefetching starts once it is idle."""
+        self.scheduler.cancel_owner(self._round)
+        self._round.deleteLater()
+        self._round = QObject(self)
+        self._urls = []
+        self._in_flight = 0
+
+        self._posts = posts
+        self._page = page
+        self._page_size = page_size
+        self.idle_timer.start()
+
+    def _on_idle(self):
+        if self.scheduler.pending(NetworkScheduler.DETAILS):
+            # Visible thumbnails still loading; check again later
+            self.idle_timer.start()
+            return
+
+        size = self._page_size
+        start = self._page * size
+        neighbours = list(self._posts[start + size : start + 2 * size])
+        if self._page > 0:
+            neighbours += list(self._posts[start - size : start])
+        self._urls = [p["thumbnail"] for p in neighbours if p.get("thumbnail")]
+        self._pump()
+
+    def _pump(self):
+        while self._urls and self._in_flight < self.MAX_IN_FLIGHT:
+            url = self._urls.pop(0)
+            self._in_flight += 1
+            round_ = self._round
+            self.loader.load_pixmap(
+                url,
+                VideoCard.THUMB_SIZE,
+                round_,
+                lambda _, r=round_: self._on_prefetched(r),
+                priority=NetworkScheduler.PREFETCH,
+            )
+
+    def _on_prefetched(self, round_):
+        if round_ is not self._round:
+            return  # Left over from a previous page
+        self._in_flight -= 1
+        self._pump()
+
+    def hovered(self, post_data):
+        """A card got the pointer or focus: maybe resolve its download."""
+        post_id = post_data.get("id")
+        if not post_id or self.api.cached_download_url(post_id):
+            return
+        self._hovered = post_id
+        self.hover_timer.start()
+
+    def _on_resolved(self, post_id):
+        self._resolving.discard(post_id)
+
+    def _on_hover_timeout(self):
+        post_id = self._hovered
+        if self._resolving or post_id is None:
+            return  # One speculative resolve at a time
+        self._resolving.add(post_id)
+        self.resolve_pool.start(_ResolveTask(self, post_id))
@@ -0,0 +1,75 @@
+from PySide6.QtCore import QObject, Signal
+
+
+class CardRegistry:
+    """
+    Maps post ids to the cards currently showing them. A card is dropped
+    when it is rebound to another post, unregistered, or destroyed, so
+    lookups never return a deleted widget and nothing outlives its card.
+    """
+
+    def __init__(self):
+        self._cards = {}  # post id -> card
+        self._posts = {}  # id(card) -> post id
+        self._watched = set()  # ids of the cards whose destroyed() is connected
+
+    def register(self, post_id, card):
+        self.unregister(card)
+        previous = self._cards.get(post_id)
+        if previous is not None:
+            self.unregister(previous)
+
+        key = id(card)
+        self._cards[post_id] = card
+        self._posts[key] = post_id
+        if key not in self._watched:
+            self._watched.add(key)
+            card.destroyed.connect(lambda *_, k=key: self._card_gone(k))
+
+    def unregister(self, card):
+        post_id = self._posts.pop(id(card), None)
+        if post_id is not None:
+            del self._cards[post_id]
+
+    def get(self, post_id):
+        return self._cards.get(post_id)
+
+    def _card_gone(self, key):
+        post_id = self._posts.pop(key, None)
+        if post_id is not None:
+            del self._cards[post_id]
+        # The id may be reused by a new card, which must connect afresh
+        self._watched.discard(key)
+
+    def __len__(self):
+        return len(self._cards)
+
+
+class DownloadStateStore(QObject):
+    """
+    Install state per post id: a percentage while downloading, or
+    "installed". Outlives the cards, which read it when (re)bound.
+    """
+
+    changed = Signal(str, object)  # post id, state or None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._states = {}
+
+    def get(self, post_id):
+        return self._states.get(post_id)
+
+    def set(self, post_id, state):
+        """Sets a post's state; None clears it (back to Install)."""
+        if state is None:
+            if self._states.pop(post_id, None) is None:
+                return
+        elif self._states.get(post_id) == state:
+            return
+        else:
+            self._states[post_id] = state
+        self.changed.emit(post_id, state)
+
+    def __len__(self):
+        return len(self._states)
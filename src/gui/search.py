@@ -0,0 +1,135 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from ..catalog_cache import Catalog
+from ..config import Config
+from ..search_index import SearchCancelled
+
+
+def run_search(catalog, text, cancelled=None, sort_key="default"):
+    """
+    Filters the catalog for text, splits it by type and orders it by
+    sort_key. Returns (boot, suspend) sequences that render_page can slice.
+    Only the catalog's own index and orders are used, so results always
+    line up with it, even while a newer catalog is being indexed.
+    """
+    text = text.lower()
+
+    if not isinstance(catalog, Catalog):
+        # Nothing loaded yet
+        return [], []
+
+    if catalog.search_db is not None:
+        # Search, type split and paging run as FTS5/LIMIT queries
+        boot = catalog.search_db.query(text, True, catalog.ranking, sort_key)
+        suspend = catalog.search_db.query(text, False, catalog.ranking, sort_key)
+        # Run the COUNTs here so len() is free later
+        boot.load_count(cancelled)
+        suspend.load_count(cancelled)
+        return boot, suspend
+
+    # Trigram index over the catalog; posts are only decoded when rendered
+    boot, suspend = [], []
+    for i in catalog.search_index.search(text, cancelled):
+        (boot if catalog.is_boot(i) else suspend).append(i)
+    if catalog.ranking is not None:
+        boot = catalog.ranking.sort(boot, sort_key)
+        suspend = catalog.ranking.sort(suspend, sort_key)
+    return catalog.view(boot), catalog.view(suspend)
+
+
+class _CancelToken:
+    cancelled = False
+
+
+class _SearchTask(QRunnable):
+    def __init__(self, controller, seq, token, catalog, text, sort_key):
+        super().__init__()
+        self.controller = controller
+        self.seq = seq
+        self.token = token
+        self.catalog = catalog
+        self.text = text
+        self.sort_key = sort_key
+
+    def run(self):
+        try:
+            boot, suspend = run_search(
+                self.catalog,
+                self.text,
+                lambda: self.token.cancelled,
+                self.sort_key,
+            )
+        except SearchCancelled:
+            return
+        except Exception as e:
+            print(f"Search failed: {e}")
+            return
+        if not self.token.cancelled:
+            # Queued back to the GUI thread
+            self.controller._task_finished.emit(self.seq, self.text, boot, suspend)
+
+
+class SearchController(QObject):
+    """
+    Debounces search-bar input and runs the query on a worker thread.
+    Each keystroke cancels the query in flight; only the newest query's
+    result is emitted through results_ready(text, boot, suspend).
+    """
+
+    results_ready = Signal(str, object, object)
+    _task_finished = Signal(int, str, object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.catalog = None
+        self.sort_key = "default"
+
+        self._seq = 0
+        self._token = _CancelToken()
+
+        # One worker: queries run in order, so SearchIndex narrowing stays valid
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(Config.get("search_debounce_ms"))
+        self.debounce.timeout.connect(self._dispatch)
+        self._pending_text = ""
+
+        self._task_finished.connect(self._on_task_finished)
+
+    def set_catalog(self, catalog):
+        # Results computed against the old catalog would index the wrong posts
+        self.cancel()
+        self.catalog = catalog
+
+    def search(self, text):
+        """Schedules a search for text after the debounce interval."""
+        self._token.cancelled = True
+        self._pending_text = text
+        self.debounce.start()
+
+    def cancel(self):
+        self.debounce.stop()
+        self._token.cancelled = True
+        self._seq += 1
+
+    def _dispatch(self):
+        self._seq += 1
+        self._token = _CancelToken()
+        self.pool.start(
+            _SearchTask(
+                self,
+                self._seq,
+                self._token,
+                self.catalog,
+                self._pending_text,
+                self.sort_key,
+            )
+        )
+
+    def _on_task_finished(self, seq, text, boot, suspend):
+        if seq != self._seq or self.debounce.isActive():
+            # A newer keystroke arrived meanwhile
+            return
+        self.results_ready.emit(text, boot, suspend)
@@ -78,6 +78,23 @@ class Theme:
             background-color: {Theme.SLATE_800};
         }}
         
+        /* Dropdowns */
+        QComboBox {{
+            background-color: {Theme.SLATE_900};
+            border: 2px solid {Theme.SLATE_800};
+            border-radius: 8px;
+            padding: 8px 12px;
+            color: {Theme.SLATE_100};
+            font-size: 16px;
+        }}
+        QComboBox:focus, QComboBox:hover {{
+            border: 2px solid {Theme.BLUE_500};
+        }}
+        QComboBox QAbstractItemView {{
+            background-color: {Theme.SLATE_800};
+            selection-background-color: {Theme.BLUE_500};
+        }}
+
         /* Scrollbars */
         QScrollBar:vertical {{
             border: none;
@@ -0,0 +1,305 @@
+import os
+from collections import OrderedDict
+from PySide6.QtCore import (
+    QBuffer,
+    QByteArray,
+    QIODevice,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    Qt,
+    Signal,
+)
+from PySide6.QtGui import QImageReader, QPixmap
+from PySide6.QtNetwork import QNetworkReply
+from shiboken6 import isValid
+from .network import NetworkScheduler
+from ..api import RepoAPI
+from ..config import Config
+from ..thumbnail_cache import ThumbnailCache
+
+
+class PixmapCache:
+    """
+    Decoded thumbnails, already scaled for the widget showing them, keyed
+    by (url, width, height, aspect mode). Least recently used pixmaps are
+    dropped once their total size passes max_bytes.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._pixmaps = OrderedDict()  # key -> QPixmap, oldest first
+        self._total = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def cost(pixmap):
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def get(self, key):
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            self.stats["misses"] += 1
+            return None
+        self._pixmaps.move_to_end(key)
+        self.stats["hits"] += 1
+        return pixmap
+
+    def put(self, key, pixmap):
+        cost = self.cost(pixmap)
+        if cost > self.max_bytes:
+            return
+        old = self._pixmaps.pop(key, None)
+        if old is not None:
+            self._total -= self.cost(old)
+        self._pixmaps[key] = pixmap
+        self._total += cost
+        while self._total > self.max_bytes:
+            _, evicted = self._pixmaps.popitem(last=False)
+            self._total -= self.cost(evicted)
+            self.stats["evictions"] += 1
+
+    def size(self):
+        return self._total
+
+    def __len__(self):
+        return len(self._pixmaps)
+
+
+def decode_image(data, size, aspect=Qt.AspectRatioMode.IgnoreAspectRatio):
+    """
+    Decodes image bytes into a QImage scaled to size (None for full size).
+    Safe to call off the GUI thread. JPEGs are downscaled while decoding,
+    so a card-sized image never exists at full resolution.
+    """
+    buffer = QBuffer()
+    buffer.setData(QByteArray(data))
+    buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+    reader = QImageReader(buffer)
+    if size is not None:
+        source = reader.size()
+        reader.setScaledSize(source.scaled(size, aspect) if source.isValid() else size)
+    image = reader.read()
+    return None if image.isNull() else image
+
+
+class _DecodeTask(QRunnable):
+    """Reads a thumbnail from the disk cache (unless given data) and decodes it."""
+
+    def __init__(self, loader, key, url, size, aspect, priority, data=None):
+        super().__init__()
+        self.loader = loader
+        self.key = key
+        self.url = url
+        self.size = size
+        self.aspect = aspect
+        self.priority = priority
+        self.data = data
+        self.missing = False
+
+    def run(self):
+        data = self.data
+        if data is None:
+            data = self.loader.cache.get(self.url)
+        if data is None:
+            self.missing = True
+            image = None
+        else:
+            image = decode_image(data, self.size, self.aspect)
+        # Queued back to the GUI thread
+        self.loader._decoded.emit(self, image)
+
+
+class ThumbnailLoader(QObject):
+    """
+    Shared thumbnail source for every widget: answers from the disk cache
+    when it can, otherwise downloads once per URL (concurrent requests for
+    the same URL share one scheduled request) and stores the result.
+    A download is cancelled once every widget waiting for it is gone.
+
+    load_pixmap() reads and decodes on a worker pool; the GUI thread only
+    turns the finished QImage into a QPixmap.
+    """
+
+    DECODE_THREADS = 2
+
+    _decoded = Signal(object, object)  # _DecodeTask, QImage or None
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cache = ThumbnailCache(
+            RepoAPI.THUMBNAIL_DIR, Config.get("thumbnail_cache_mb") * 1024 * 1024
+        )
+        self.pixmaps = PixmapCache(Config.get("pixmap_cache_mb") * 1024 * 1024)
+        self.scheduler = NetworkScheduler.instance()
+        self.pending = {}  # url -> (job, [callback, ...])
+        self.decoding = {}  # pixmap key -> [(owner, callback), ...]
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(self.DECODE_THREADS)
+        self._decoded.connect(self._on_decoded)
+
+    def load(self, url, owner, callback, priority=NetworkScheduler.VISIBLE):
+        """
+        Calls callback(bytes) with the image data, or callback(None) on
+        failure. Nothing is called once owner (a QObject) has been deleted.
+        """
+        data = self.cache.get(url)
+        if data is not None:
+            callback(data)
+            return
+
+        def deliver(data):
+            if isValid(owner):
+                callback(data)
+
+        self._download(url, owner, deliver, priority)
+
+    def _download(self, url, owner, callback, priority):
+        """Fetches url once for all callers; every callback runs once."""
+        pending = self.pending.get(url)
+        if pending is not None:
+            pending[1].append(callback)
+            self._add_owner(url, owner, priority)
+            return
+
+        callbacks = [callback]
+        self.pending[url] = (None, callbacks)
+        job = self.scheduler.get(
+            url, priority, owner, lambda reply: self._on_finished(url, reply)
+        )
+        if url in self.pending:  # Not already finished synchronously
+            self.pending[url] = (job, callbacks)
+
+    def _add_owner(self, url, owner, priority):
+        """Keeps a running download of url alive (and urgent) for owner."""
+        job = self.pending.get(url, (None,))[0]
+        if job is not None:
+            self.scheduler.add_owner(job, owner)
+            self.scheduler.reprioritize(job, priority)
+
+    def load_pixmap(
+        self,
+        url,
+        size,
+        owner,
+        callback,
+        aspect=Qt.AspectRatioMode.IgnoreAspectRatio,
+        priority=NetworkScheduler.VISIBLE,
+        wanted=None,
+    ):
+        """
+        Like load(), but calls callback(QPixmap or None) with the image
+        scaled to size (a QSize, or None for full size). Pixmaps already
+        decoded at that size are returned without touching the disk.
+
+        wanted() tells whether owner still shows url; a pooled widget that
+        was rebound to another post meanwhile neither downloads nor gets it.
+        """
+        key = self._pixmap_key(url, size, aspect)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            callback(pixmap)
+            return
+
+        waiters = self.decoding.get(key)
+        if waiters is not None:
+            waiters.append((owner, callback, wanted))
+            self._add_owner(url, owner, priority)
+            return
+
+        self.decoding[key] = [(owner, callback, wanted)]
+        self.pool.start(_DecodeTask(self, key, url, size, aspect, priority))
+
+    @staticmethod
+    def _waiting(waiter):
+        owner, _, wanted = waiter
+        return isValid(owner) and (wanted is None or wanted())
+
+    @staticmethod
+    def _pixmap_key(url, size, aspect):
+        return (url, None if size is None else (size.width(), size.height()), aspect)
+
+    def cached_pixmap(self, url, size, aspect=Qt.AspectRatioMode.IgnoreAspectRatio):
+        """The pixmap load_pixmap() would return, if already decoded, else None."""
+        return self.pixmaps.get(self._pixmap_key(url, size, aspect))
+
+    def _on_decoded(self, task, image):
+        waiters = self.decoding.get(task.key)
+        if waiters is None:
+            return
+
+        if task.missing:
+            # Not on disk yet: download for every waiter still showing the
+            # url, then decode
+            waiters[:] = [waiter for waiter in waiters if self._waiting(waiter)]
+            if not waiters:
+                del self.decoding[task.key]
+                return
+            self._download(
+                task.url,
+                waiters[0][0],
+                lambda data: self._on_downloaded(task, data),
+                task.priority,
+            )
+            for owner, _, _ in waiters[1:]:
+                self._add_owner(task.url, owner, task.priority)
+            return
+
+        del self.decoding[task.key]
+        pixmap = None
+        if image is not None:
+            pixmap = QPixmap.fromImage(image)
+            self.pixmaps.put(task.key, pixmap)
+        for waiter in waiters:
+            if self._waiting(waiter):
+                waiter[1](pixmap)
+
+    def _on_downloaded(self, task, data):
+        if data is None:
+            task.missing = False  # Download failed: report it to the waiters
+            self._on_decoded(task, None)
+            return
+        self.pool.start(
+            _DecodeTask(
+                self, task.key, task.url, task.size, task.aspect, task.priority, data
+            )
+        )
+
+    def local_pixmap(self, path, size, aspect=Qt.AspectRatioMode.KeepAspectRatio):
+        """Scaled pixmap of an image file, or None if it can't be read."""
+        try:
+            # The mtime keeps a replaced file (e.g. a new suspend video) fresh
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        key = (path, mtime, (size.width(), size.height()), aspect)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is None:
+            pixmap = QPixmap(path)
+            if pixmap.isNull():
+                return None
+            pixmap = pixmap.scaled(
+                size, aspect, Qt.TransformationMode.SmoothTransformation
+            )
+            self.pixmaps.put(key, pixmap)
+        return pixmap
+
+    def _on_finished(self, url, reply):
+        data = None
+        if reply is not None and reply.error() == QNetworkReply.NetworkError.NoError:
+            data = reply.readAll().data() or None
+        if data is not None:
+            self.cache.put(url, data)
+
+        _, callbacks = self.pending.pop(url, (None, []))
+        for callback in callbacks:
+            callback(data)
@@ -7,18 +7,51 @@ from PySide6.QtWidgets import (
     QFrame,
     QProgressBar,
 )
-from PySide6.QtCore import Qt, Signal, QUrl
+from PySide6.QtCore import Qt, Signal, QUrl, QSize
 from PySide6.QtGui import QPixmap, QDesktopServices
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from .network import NetworkScheduler
+from .thumbnails import ThumbnailLoader
 
 
 class VideoCard(QFrame):
     install_clicked = Signal(object)
     details_clicked = Signal(object)
-
-    def __init__(self, post_data, parent=None):
+    hovered = Signal(object)  # Pointer or focus entered; a hint to prefetch
+
+    THUMB_SIZE = QSize(278, 140)  # Card width minus margins
+
+    INSTALL_STYLE = """
+        QPushButton {
+            background-color: #3b82f6;
+            color: white;
+            border: none;
+            border-radius: 6px;
+            font-weight: bold;
+            padding: 4px;
+        }
+        QPushButton:hover { background-color: #2563eb; }
+    """
+    INSTALLED_STYLE = """
+        QPushButton {
+            background-color: #22c55e;
+            color: white;
+            border: none;
+            border-radius: 6px;
+            font-weight: bold;
+            padding: 4px;
+        }
+        QPushButton:hover { background-color: #16a34a; }
+    """
+
+    def __init__(self, post_data=None, download_states=None, parent=None):
+        """
+        Builds the widgets once; bind() fills them in, so one card can be
+        reused for many posts. download_states (a DownloadStateStore) is
+        consulted on bind so a rebound card shows its post's install state.
+        """
         super().__init__(parent)
-        self.post_data = post_data
+        self.post_data = {}
+        self.download_states = download_states
 
         self.setObjectName("VideoCard")
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
@@ -46,18 +79,16 @@ class VideoCard(QFrame):
 
         # Thumbnail
         self.thumb_label = QLabel()
-        self.thumb_label.setFixedHeight(140)
+        self.thumb_label.setFixedSize(self.THUMB_SIZE)
         self.thumb_label.setStyleSheet(
             "background-color: #020617; border-radius: 6px; border: none;"
         )
         self.thumb_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.thumb_label.setText("Loading...")
         self.thumb_label.setScaledContents(True)
         layout.addWidget(self.thumb_label)
 
         # Title
-        title_text = post_data.get("title", "Untitled")
-        self.title_label = QLabel(title_text)
+        self.title_label = QLabel()
         self.title_label.setWordWrap(True)
         self.title_label.setStyleSheet(
             "font-weight: bold; font-size: 14px; color: #f1f5f9; background: transparent; border: none;"
@@ -73,9 +104,7 @@ class VideoCard(QFrame):
         meta_layout.setContentsMargins(0, 0, 0, 0)
 
         # Author (Truncated)
-        user_data = post_data.get("user", {})
-        author_text = user_data.get("steam_name", "Unknown")
-        self.author_label = QLabel(f"By {author_text}")
+        self.author_label = QLabel()
         self.author_label.setStyleSheet(
             "color: #94a3b8; font-size: 11px; background: transparent; border: none;"
         )
@@ -84,8 +113,7 @@ class VideoCard(QFrame):
         meta_layout.addStretch()
 
         # Stats (Downloads) - Assuming 'downloads' key exists
-        downloads = post_data.get("downloads", 0)
-        self.stats_label = QLabel(f"{downloads} DLs")
+        self.stats_label = QLabel()
         self.stats_label.setStyleSheet(
             "color: #94a3b8; font-size: 11px; background: transparent; border: none;"
         )
@@ -125,17 +153,7 @@ class VideoCard(QFrame):
         self.install_btn = QPushButton("Install")
         self.install_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.install_btn.setFixedHeight(30)
-        self.install_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3b82f6;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                font-weight: bold;
-                padding: 4px;
-            }
-            QPushButton:hover { background-color: #2563eb; }
-        """)
+        self.install_btn.setStyleSheet(self.INSTALL_STYLE)
         self.install_btn.clicked.connect(self.on_install)
         btn_layout.addWidget(self.install_btn)
 
@@ -152,22 +170,50 @@ class VideoCard(QFrame):
         """)
         layout.addWidget(self.progress)
 
-        # Load Image
-        self.net_manager = QNetworkAccessManager(self)
-        self.net_manager.finished.connect(self.on_image_loaded)
-        if post_data.get("thumbnail"):
-            self.net_manager.get(QNetworkRequest(QUrl(post_data["thumbnail"])))
-
-    def on_image_loaded(self, reply):
-        if reply.error() == QNetworkReply.NetworkError.NoError:
-            data = reply.readAll()
-            pixmap = QPixmap()
-            pixmap.loadFromData(data)
+        self._installed = False
+        if post_data is not None:
+            self.bind(post_data)
+
+    def bind(self, post_data):
+        """Shows post_data on this card, replacing whatever it showed before."""
+        if self.post_data.get("thumbnail") != post_data.get("thumbnail"):
+            # The previous post's thumbnail is no longer wanted here
+            NetworkScheduler.instance().cancel_owner(self)
+        self.post_data = post_data
+
+        self.title_label.setText(post_data.get("title", "Untitled"))
+        user_data = post_data.get("user", {})
+        self.author_label.setText(f"By {user_data.get('steam_name', 'Unknown')}")
+        self.stats_label.setText(f"{post_data.get('downloads', 0)} DLs")
+
+        state = None
+        if self.download_states is not None:
+            state = self.download_states.get(post_data.get("id"))
+        self.show_state(state)
+
+        # Load Image, decoded at label size (cached, so paging back is free)
+        self.thumb_label.setPixmap(QPixmap())
+        self.thumb_label.setText("Loading...")
+        thumb_url = post_data.get("thumbnail")
+        if thumb_url:
+            ThumbnailLoader.instance().load_pixmap(
+                thumb_url,
+                self.THUMB_SIZE,
+                self,
+                lambda pixmap: self.on_image_loaded(thumb_url, pixmap),
+                wanted=lambda: self.post_data.get("thumbnail") == thumb_url,
+            )
+        else:
+            self.thumb_label.setText("No Image")
+
+    def on_image_loaded(self, url, pixmap):
+        if url != self.post_data.get("thumbnail"):
+            return  # The card was rebound meanwhile
+        if pixmap is not None:
             self.thumb_label.setText("")
             self.thumb_label.setPixmap(pixmap)
         else:
             self.thumb_label.setText("No Image")
-        reply.deleteLater()
 
     def on_install(self):
         self.install_clicked.emit(self.post_data)
@@ -178,6 +224,14 @@ class VideoCard(QFrame):
     def on_details(self):
         self.details_clicked.emit(self.post_data)
 
+    def enterEvent(self, event):
+        self.hovered.emit(self.post_data)
+        super().enterEvent(event)
+
+    def focusInEvent(self, event):
+        self.hovered.emit(self.post_data)
+        super().focusInEvent(event)
+
     def mousePressEvent(self, event):
         # Trigger details view on click, but respect child widget events
         if event.button() == Qt.MouseButton.LeftButton:
@@ -187,26 +241,34 @@ class VideoCard(QFrame):
     def set_progress(self, value):
         self.progress.setValue(value)
 
+    def show_state(self, state):
+        """state: None (Install), a download percentage, or "installed"."""
+        if state == "installed":
+            self.reset_state()
+            return
+        downloading = isinstance(state, int)
+        self.install_btn.setVisible(not downloading)
+        self.progress.setVisible(downloading)
+        if downloading:
+            self.progress.setValue(state)
+        elif self._installed:
+            self._installed = False
+            self.install_btn.setText("Install")
+            self.install_btn.setStyleSheet(self.INSTALL_STYLE)
+
     def reset_state(self):
         self.install_btn.setVisible(True)
         self.progress.setVisible(False)
         self.install_btn.setText("Installed!")
-        self.install_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #22c55e;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                font-weight: bold;
-                padding: 4px;
-            }
-            QPushButton:hover { background-color: #16a34a; }
-        """)
+        self.install_btn.setStyleSheet(self.INSTALLED_STYLE)
+        self._installed = True
 
 
 class LibraryItem(QFrame):
     delete_clicked = Signal(str)  # Emits filename
 
+    THUMB_SIZE = QSize(100, 60)
+
     def __init__(self, file_data, parent=None):
         super().__init__(parent)
         self.file_data = file_data
@@ -231,30 +293,33 @@ class LibraryItem(QFrame):
         layout.setSpacing(15)
 
         # Thumbnail
-        thumb_label = QLabel()
-        thumb_label.setFixedSize(100, 60)
-        thumb_label.setStyleSheet(
+        self.thumb_label = QLabel()
+        self.thumb_label.setFixedSize(self.THUMB_SIZE)
+        self.thumb_label.setStyleSheet(
             "background-color: #020617; border-radius: 4px; border: none;"
         )
-        thumb_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        if meta.get("local_thumbnail"):
-            pixmap = QPixmap(meta["local_thumbnail"])
-            thumb_label.setPixmap(
-                pixmap.scaled(
-                    100,
-                    60,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
+        self.thumb_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        loader = ThumbnailLoader.instance()
+        local_thumb = meta.get("local_thumbnail")
+        pixmap = None
+        if local_thumb:
+            pixmap = loader.local_pixmap(local_thumb, self.THUMB_SIZE)
+        if pixmap is not None:
+            self.thumb_label.setPixmap(pixmap)
+        elif meta.get("thumbnail"):
+            # Saved copy missing; the shared cache likely still has it
+            loader.load_pixmap(
+                meta["thumbnail"],
+                self.THUMB_SIZE,
+                self,
+                self.on_image_loaded,
+                Qt.AspectRatioMode.KeepAspectRatio,
             )
         else:
-            thumb_label.setText("No Image")
-            thumb_label.setStyleSheet(
-                "color: #475569; font-size: 10px; background-color: #0f172a; border-radius: 4px;"
-            )
+            self.show_no_image()
 
-        layout.addWidget(thumb_label)
+        layout.addWidget(self.thumb_label)
 
         # Info Column
         info_container = QWidget()
@@ -372,6 +437,18 @@ class LibraryItem(QFrame):
 
         layout.addWidget(self.btn_container)
 
+    def show_no_image(self):
+        self.thumb_label.setText("No Image")
+        self.thumb_label.setStyleSheet(
+            "color: #475569; font-size: 10px; background-color: #0f172a; border-radius: 4px;"
+        )
+
+    def on_image_loaded(self, pixmap):
+        if pixmap is not None:
+            self.thumb_label.setPixmap(pixmap)
+        else:
+            self.show_no_image()
+
     def show_confirm(self):
         self.del_btn.setVisible(False)
         self.confirm_btn.setVisible(True)
@@ -13,21 +13,35 @@ from PySide6.QtWidgets import (
     QPushButton,
     QStackedWidget,
     QDialog,
+    QComboBox,
 )
 from PySide6.QtCore import Qt, QThread, Signal, QUrl, QObject
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
 from .theme import Theme
 from .widgets import VideoCard, LibraryItem
+from .post_list import PostListView, PostRole
 from .details import DetailsView
 from .toast import NotificationToast
+from .search import SearchController, run_search
+from .network import NetworkScheduler
+from .prefetch import Prefetcher
+from .page_layout import PageLayoutManager
+from .registry import CardRegistry, DownloadStateStore
+from .thumbnails import ThumbnailLoader
+from .downloads import DownloadController
+from .files import FileController
 from ..api import RepoAPI
-from ..file_manager import FileManager
+from ..config import Config
+from ..ranking import SORT_KEYS
 import tempfile
 import os
 
 
 class DataLoaderWorker(QThread):
-    finished = Signal(list)
+    # Not "finished": QThread's own finished() marks the end of run(),
+    # which comes after the background revalidation
+    loaded = Signal(object)  # Catalog of posts
+    posts_streamed = Signal(list)  # Batch of posts parsed during a download
+    updated = Signal(dict)  # Sync result, emitted if revalidation found changes
     error = Signal(str)
 
     def __init__(self, api, force_refresh=False):
@@ -37,10 +51,25 @@ class DataLoaderWorker(QThread):
 
     def run(self):
         try:
-            posts = self.api.get_all_posts(force_refresh=self.force_refresh)
-            self.finished.emit(posts)
+            posts = self.api.get_all_posts(
+                force_refresh=self.force_refresh, on_posts=self.posts_streamed.emit
+            )
+            self.loaded.emit(posts)
         except Exception as e:
             self.error.emit(str(e))
+            return
+
+        # Stale-while-revalidate: cached data is already on screen,
+        # refresh it in the background if it is past its TTL
+        if self.force_refresh or self.api.is_cache_fresh():
+            return
+        try:
+            result = self.api.revalidate()
+            if result is not None:
+                self.updated.emit(result)
+        except Exception as e:
+            # Keep showing the cached catalog
+            print(f"Background revalidation failed: {e}")
 
 
 class MainWindow(QMainWindow):
@@ -55,57 +84,88 @@ class MainWindow(QMainWindow):
 
         self.api = RepoAPI()
 
-        # Native Network Manager for fast downloads
-        self.net_manager = QNetworkAccessManager(self)
-        self.active_downloads = {}  # post_id -> reply
+        # Shared network scheduler, also used by thumbnails
+        self.network = NetworkScheduler.instance()
 
         # State
-        self.all_posts = []
+        self.all_posts = []  # Catalog (lazily decoded) once loaded
         self.filtered_posts_boot = []
         self.filtered_posts_suspend = []
 
         self.page_boot = 0
         self.page_suspend = 0
 
-        self.card_map = {}
+        self.cards = CardRegistry()  # post id -> card on screen
+        self.download_states = DownloadStateStore(self)
+        self.download_states.changed.connect(self.on_download_state_changed)
+        self.card_pools = {"boot": [], "suspend": []}  # Reused VideoCards per tab
+        self.dirty_tabs = set()  # Browse tabs whose results changed while hidden
+        self.browse_view = Config.get("browse_view")  # "pages" or "scroll"
+
+        self.loader = None  # DataLoaderWorker; replaced only once it has ended
+        self.refresh_pending = False
+
+        self.search_controller = SearchController(self)
+        self.prefetcher = Prefetcher(self.api, self)
+        # Grid shape; PAGE_SIZE above is its initial 4x3
+        self.page_layout = PageLayoutManager(4, self.PAGE_SIZE // 4, self)
+        self.page_layout.changed.connect(self.on_grid_changed)
+        self.search_controller.results_ready.connect(self.on_search_results)
 
         self.init_ui()
 
         # Toast system
         self.toast = NotificationToast(self)
 
+        # Installs, deletes and library scans run off the GUI thread
+        self.files = FileController(self)
+        self.files.installed.connect(self.on_installed)
+        self.files.install_progress.connect(self.on_install_progress)
+        self.files.deleted.connect(self.on_file_deleted)
+        self.files.listed.connect(self.show_library)
+
+        # Downloads: queued, capped, and journaled across restarts. Restored
+        # ones may finish (and install) right away, so files must exist first
+        self.downloads = DownloadController(self.api, self)
+        self.downloads.queued.connect(self.on_download_queued)
+        self.downloads.progress.connect(self.on_download_progress)
+        self.downloads.paused.connect(self.on_download_paused)
+        self.downloads.cancelled.connect(self.on_download_cancelled)
+        self.downloads.failed.connect(self.on_download_failed)
+        self.downloads.downloaded.connect(self.on_video_downloaded)
+        self.downloads.restore()
+
         # Start background loading
         self.start_loading()
 
     def resizeEvent(self, event):
-        if self.centralWidget():
-            width = self.width()
-            height = self.height()
-
-            # Optimized calculation for Steam Deck (1280x800)
-            # Reserve space for Header, Tabs, Pagination Controls, and Footer area
-            # Header (~60) + Tabs (~50) + Pagination (~40) + Margins (~20) = ~170px
-            reserved_height = 180
-
-            available_h = height - reserved_height
-            available_w = width - 40
-
-            # Card is now 290x270
-            card_w = 290 + 20
-            card_h = 270 + 10
+        # Re-layout once the drag settles, not on every intermediate size
+        self.page_layout.resized(event.size())
+        super().resizeEvent(event)
 
-            cols = max(1, available_w // card_w)
-            rows = max(1, available_h // card_h)
+    def on_grid_changed(self, cols, rows):
+        page_size = cols * rows
+        if page_size != self.PAGE_SIZE:
+            # Keep the first card of the current page on screen
+            self.page_boot = self.page_boot * self.PAGE_SIZE // page_size
+            self.page_suspend = self.page_suspend * self.PAGE_SIZE // page_size
+            self.PAGE_SIZE = page_size
+            reflow = self.render_page
+        else:
+            # Same cards, new shape: just move them
+            reflow = self.reflow_page
 
-            new_page_size = cols * rows
+        # The hidden tab catches up when it is selected
+        self.dirty_tabs = {"boot", "suspend"}
+        visible = self.tabs.currentIndex()
+        if visible in (0, 1):
+            reflow("boot" if visible == 0 else "suspend")
 
-            if new_page_size != self.PAGE_SIZE and new_page_size > 0:
-                self.PAGE_SIZE = new_page_size
-                # Refresh view
-                self.render_page("boot")
-                self.render_page("suspend")
-
-        super().resizeEvent(event)
+    def closeEvent(self, event):
+        # The thumbnail index is written lazily; persist the latest LRU order
+        ThumbnailLoader.instance().cache.flush()
+        self.files.shutdown()
+        super().closeEvent(event)
 
     def init_ui(self):
         # Create StackedWidget as Central
@@ -152,10 +212,25 @@ class MainWindow(QMainWindow):
 
         header_layout.addStretch()
 
+        self.sort_box = QComboBox()
+        self.sort_box.setCursor(Qt.CursorShape.PointingHandCursor)
+        for key, label in SORT_KEYS.items():
+            self.sort_box.addItem(label, key)
+        self.sort_box.currentIndexChanged.connect(self.on_sort_changed)
+        header_layout.addWidget(self.sort_box)
+
+        self.view_box = QComboBox()
+        self.view_box.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.view_box.addItem("Pages", "pages")
+        self.view_box.addItem("Scroll", "scroll")
+        self.view_box.setCurrentIndex(self.view_box.findData(self.browse_view))
+        self.view_box.currentIndexChanged.connect(self.on_view_mode_changed)
+        header_layout.addWidget(self.view_box)
+
         self.search_bar = QLineEdit()
         self.search_bar.setPlaceholderText("Search videos...")
         self.search_bar.setFixedWidth(300)
-        self.search_bar.textChanged.connect(self.filter_posts)
+        self.search_bar.textChanged.connect(self.search_controller.search)
         header_layout.addWidget(self.search_bar)
 
         main_layout.addLayout(header_layout)
@@ -174,18 +249,45 @@ class MainWindow(QMainWindow):
 
         main_layout.addWidget(self.tabs)
 
-        # Setup Layouts
-        self.boot_layout, self.boot_container = self.create_grid_area(self.tab_boot)
+        # Setup Layouts: each browse tab holds the paged grid and the scroll view
+        self.browse_stacks = {}
+        self.list_views = {}
+        paged_boot = self.create_browse_area(self.tab_boot, "boot")
+        paged_suspend = self.create_browse_area(self.tab_suspend, "suspend")
+        self.boot_layout, self.boot_container = self.create_grid_area(paged_boot)
         self.suspend_layout, self.suspend_container = self.create_grid_area(
-            self.tab_suspend
+            paged_suspend
         )
         self.library_layout, self.library_container = self.create_list_area(
             self.tab_library
         )
 
         # Add pagination controls
-        self.add_pagination_controls(self.tab_boot, "boot")
-        self.add_pagination_controls(self.tab_suspend, "suspend")
+        self.add_pagination_controls(paged_boot, "boot")
+        self.add_pagination_controls(paged_suspend, "suspend")
+
+    def create_browse_area(self, parent_widget, type_key):
+        """Stacks the paged grid (returned, still empty) over a PostListView."""
+        stack = QStackedWidget()
+        paged = QWidget()
+        stack.addWidget(paged)
+
+        view = PostListView(self.download_states)
+        view.card_delegate.install_clicked.connect(self.start_install)
+        view.card_delegate.details_clicked.connect(self.show_details)
+        view.entered.connect(
+            lambda index: self.prefetcher.hovered(index.data(PostRole))
+        )
+        stack.addWidget(view)
+        stack.setCurrentIndex(1 if self.browse_view == "scroll" else 0)
+
+        parent_layout = QVBoxLayout(parent_widget)
+        parent_layout.setContentsMargins(0, 0, 0, 0)
+        parent_layout.addWidget(stack)
+
+        self.browse_stacks[type_key] = stack
+        self.list_views[type_key] = view
+        return paged
 
     def create_list_area(self, parent_widget):
         scroll = QScrollArea()
@@ -210,6 +312,11 @@ class MainWindow(QMainWindow):
         # Index 2 is Library
         if index == 2:
             self.render_library()
+        else:
+            # Search results may have changed while this tab was hidden
+            type_key = "boot" if index == 0 else "suspend"
+            if type_key in self.dirty_tabs:
+                self.render_page(type_key)
 
     def create_grid_area(self, parent_widget):
         scroll = QScrollArea()
@@ -277,42 +384,124 @@ class MainWindow(QMainWindow):
         else:
             self.toast.show_message("Refreshing data...")
 
+        if self.loader is not None and self.loader.isRunning():
+            # One loader at a time: it writes the cache files and search DB.
+            # The refresh starts once the running one (maybe revalidating) ends
+            self.refresh_pending = True
+            return
+        self.run_loader(force)
+
+    def run_loader(self, force):
         self.loader = DataLoaderWorker(self.api, force_refresh=force)
-        self.loader.finished.connect(self.on_data_loaded)
+        self.loader.loaded.connect(self.on_data_loaded)
+        if not force:
+            # Cold start: show cards while the catalog is still downloading
+            self.loader.posts_streamed.connect(self.on_posts_streamed)
+        self.loader.updated.connect(self.on_data_updated)
         self.loader.error.connect(self.on_load_error)
+        self.loader.finished.connect(self.on_loader_finished)
         self.loader.start()
 
+    def on_loader_finished(self):
+        self.set_search_enabled(True)  # Also after a failed stream
+        if self.refresh_pending:
+            self.refresh_pending = False
+            self.run_loader(force=True)
+
     def on_data_loaded(self, posts):
         self.all_posts = posts
+        self.search_controller.set_catalog(posts)
+        self.set_search_enabled(True)
         self.filter_posts(self.search_bar.text())  # Apply current filter
         self.stack.setCurrentIndex(1)  # Show content
         self.toast.show_message(f"Loaded {len(posts)} videos", duration=2000)
 
+    def on_posts_streamed(self, batch):
+        """Fills the first page of each tab from a catalog still in flight."""
+        if self.all_posts:
+            return  # A catalog is already on screen
+        # Batches are shown unfiltered, and a search now would replace the
+        # lists they are added to; searching waits for the whole catalog
+        self.set_search_enabled(False)
+        self.stack.setCurrentIndex(1)
+        visible = self.tabs.currentIndex()
+        for type_key, posts in (
+            ("boot", self.filtered_posts_boot),
+            ("suspend", self.filtered_posts_suspend),
+        ):
+            page_was_full = len(posts) >= self.PAGE_SIZE
+            is_boot = type_key == "boot"
+            posts.extend(p for p in batch if (p.get("type") == "boot_video") == is_boot)
+            if page_was_full:
+                continue
+            # Only re-render while the first page is still filling up
+            self.dirty_tabs.add(type_key)
+            if visible == (0 if is_boot else 1):
+                self.render_page(type_key)
+
+    def set_search_enabled(self, enabled):
+        self.search_bar.setEnabled(enabled)
+        self.sort_box.setEnabled(enabled)
+
+    def on_data_updated(self, result):
+        # Newer catalog arrived after revalidation; swap it in quietly. Its
+        # search backend and sort orders come with it, so searches switch here
+        self.all_posts = result["posts"]
+        self.search_controller.set_catalog(self.all_posts)
+        self.filter_posts(self.search_bar.text())
+        self.toast.show_message(
+            f"Catalog updated: {len(result['added'])} new, "
+            f"{len(result['changed'])} changed, {len(result['removed'])} removed",
+            duration=2000,
+        )
+
     def on_load_error(self, error_msg):
         self.stack.setCurrentIndex(1)  # Go back to content even on error
         self.toast.show_message(f"Error: {error_msg}", duration=5000, is_error=True)
 
     def filter_posts(self, text):
-        text = text.lower()
-
-        # Filter raw data
-        self.filtered_posts_boot = [
-            p
-            for p in self.all_posts
-            if p.get("type") == "boot_video" and text in p.get("title", "").lower()
-        ]
-        self.filtered_posts_suspend = [
-            p
-            for p in self.all_posts
-            if p.get("type") != "boot_video" and text in p.get("title", "").lower()
-        ]
+        """Synchronous search, used when a new catalog arrives."""
+        boot, suspend = run_search(
+            self.all_posts, text, sort_key=self.search_controller.sort_key
+        )
+        self.on_search_results(text, boot, suspend)
+
+    def on_sort_changed(self, index):
+        # Orders are built once per catalog; this only reorders the matches
+        self.search_controller.sort_key = self.sort_box.itemData(index)
+        self.search_controller.search(self.search_bar.text())
+
+    def on_search_results(self, text, boot, suspend):
+        self.filtered_posts_boot = boot
+        self.filtered_posts_suspend = suspend
 
         # Reset pages
         self.page_boot = 0
         self.page_suspend = 0
 
-        self.render_page("boot")
-        self.render_page("suspend")
+        # Only the visible tab is rebuilt now; the other one on selection
+        self.dirty_tabs = {"boot", "suspend"}
+        visible = self.tabs.currentIndex()
+        if visible in (0, 1):
+            self.render_page("boot" if visible == 0 else "suspend")
+
+    def on_view_mode_changed(self, index):
+        self.browse_view = self.view_box.itemData(index)
+        config = Config.load()
+        config["browse_view"] = self.browse_view
+        Config.save(config)
+
+        scroll = self.browse_view == "scroll"
+        for type_key, stack in self.browse_stacks.items():
+            stack.setCurrentIndex(1 if scroll else 0)
+            if not scroll:
+                # Release the scroll view's rows and pending thumbnails
+                self.list_views[type_key].post_model.set_posts([])
+
+        self.dirty_tabs = {"boot", "suspend"}
+        visible = self.tabs.currentIndex()
+        if visible in (0, 1):
+            self.render_page("boot" if visible == 0 else "suspend")
 
     def change_page(self, type_key, delta):
         if type_key == "boot":
@@ -332,9 +521,13 @@ class MainWindow(QMainWindow):
         while layout.count():
             child = layout.takeAt(0)
             if child.widget():
+                # Stop its thumbnail download now, not when Qt deletes it
+                self.network.cancel_owner(child.widget())
                 child.widget().deleteLater()
 
     def render_page(self, type_key):
+        self.dirty_tabs.discard(type_key)
+
         if type_key == "boot":
             posts = self.filtered_posts_boot
             page = self.page_boot
@@ -344,26 +537,65 @@ class MainWindow(QMainWindow):
             page = self.page_suspend
             layout = self.suspend_layout
 
-        self.clear_layout(layout)
+        if self.browse_view == "scroll":
+            # The whole result set; rows are realized as they scroll in
+            model = self.list_views[type_key].post_model
+            if not model.shows(posts):
+                model.set_posts(posts)
+            return
 
         start = page * self.PAGE_SIZE
         end = start + self.PAGE_SIZE
         page_items = posts[start:end]
 
-        row, col = 0, 0
-        cols_per_row = 4
-
-        for post in page_items:
-            card = VideoCard(post)
+        # Cards are built once per slot and rebound, never rebuilt
+        pool = self.card_pools[type_key]
+        while len(pool) < len(page_items):
+            card = VideoCard(download_states=self.download_states)
             card.install_clicked.connect(self.start_install)
             card.details_clicked.connect(self.show_details)
-            self.card_map[post["id"]] = card  # Update map for current view
+            card.hovered.connect(self.prefetcher.hovered)
+            pool.append(card)
+        # Page size shrank (resize): drop the surplus
+        while len(pool) > self.PAGE_SIZE:
+            card = pool.pop()
+            self.network.cancel_owner(card)
+            card.deleteLater()
+
+        # Detach without deleting; the grid is refilled below
+        while layout.count():
+            layout.takeAt(0)
+
+        cards = pool[: len(page_items)]
+        for card, post in zip(cards, page_items):
+            card.bind(post)
+            self.cards.register(post["id"], card)
+        self.place_cards(layout, cards)
+        for card in cards:
+            card.show()
+        for card in pool[len(page_items) :]:
+            self.cards.unregister(card)
+            card.hide()
+
+        # Warm the neighbouring pages once this one has loaded
+        self.prefetcher.schedule(posts, page, self.PAGE_SIZE)
+
+    def reflow_page(self, type_key):
+        """Re-grids the cards on screen for a new column count, unbound."""
+        self.dirty_tabs.discard(type_key)
+        if self.browse_view == "scroll":
+            return  # The list view reflows itself
+        layout = self.boot_layout if type_key == "boot" else self.suspend_layout
+        cards = []
+        while layout.count():
+            cards.append(layout.takeAt(0).widget())
+        self.place_cards(layout, cards)
 
+    def place_cards(self, layout, cards):
+        cols = self.page_layout.cols
+        for i, card in enumerate(cards):
+            row, col = divmod(i, cols)
             layout.addWidget(card, row, col)
-            col += 1
-            if col >= cols_per_row:
-                col = 0
-                row += 1
 
     def show_main_view(self):
         self.stack.setCurrentIndex(1)
@@ -372,227 +604,89 @@ class MainWindow(QMainWindow):
         self.details_view.load_post(post_data)
         self.stack.setCurrentIndex(2)  # Switch to details view
 
-    # --- Native Networking Install Implementation ---
+    # --- Install Pipeline (downloads run in the DownloadController) ---
 
     def start_install(self, post_data):
-        post_id = post_data["id"]
-
-        # Prevent multiple downloads for the same video
-        if post_id in self.active_downloads:
-            return
-
-        download_url = f"{self.api.BASE_URL}/post/download/{post_id}"
-
-        # Create temp file immediately
-        fd, temp_path = tempfile.mkstemp(suffix=".webm")
-        os.close(
-            fd
-        )  # Close file handle so QNetworkReply can write to it via standard IO or buffer
+        # Queued (or resumed) unless already downloading
+        self.downloads.enqueue(post_data)
 
-        request = QNetworkRequest(QUrl(download_url))
-
-        reply = self.net_manager.get(request)
-
-        # Store state for this download
-        self.active_downloads[post_id] = {
-            "reply": reply,
-            "file": open(temp_path, "wb"),  # Keep file open for writing
-            "temp_path": temp_path,
-            "post_data": post_data,
-            "thumb_path": None,  # Will fill later
-        }
-
-        reply.downloadProgress.connect(
-            lambda r, t, pid=post_id: self.on_download_progress(pid, r, t)
-        )
-        reply.finished.connect(lambda pid=post_id: self.on_download_finished(pid))
-        reply.errorOccurred.connect(
-            lambda err, pid=post_id: self.on_download_error(pid, err)
-        )
+    def on_download_queued(self, post_id):
+        self.download_states.set(post_id, 0)
 
     def on_download_progress(self, post_id, received, total):
-        if post_id not in self.active_downloads:
-            return
-
-        data = self.active_downloads[post_id]
-
-        # Write chunks to file
-        reply = data["reply"]
-        if reply.bytesAvailable():
-            chunk = reply.readAll()
-            data["file"].write(chunk)
-
-        # Update UI
         if total > 0:
-            percent = int((received / total) * 100)
-            self.update_progress(post_id, percent)
+            self.update_progress(post_id, int(received * 100 / total))
 
-    def on_download_finished(self, post_id):
-        if post_id not in self.active_downloads:
-            return
+    def on_download_paused(self, post_id):
+        self.toast.show_message("Download paused")
 
-        data = self.active_downloads[post_id]
-        reply = data["reply"]
+    def on_download_cancelled(self, post_id):
+        self.download_states.set(post_id, None)
 
-        # Check for redirects manually (robust method)
-        redirect_url = reply.attribute(
-            QNetworkRequest.Attribute.RedirectionTargetAttribute
+    def on_download_failed(self, post_id, message):
+        self.toast.show_message(
+            f"Download Error: {message}", is_error=True, duration=5000
         )
-        if redirect_url:
-            print(f"Handling Redirect to {redirect_url}")
-            new_url = reply.url().resolved(redirect_url)
-
-            # Restart request with new URL
-            reply.deleteLater()
+        # Reset UI
+        self.download_states.set(post_id, None)
 
-            new_request = QNetworkRequest(new_url)
-            new_reply = self.net_manager.get(new_request)
-
-            # Update state with new reply
-            data["reply"] = new_reply
-
-            # Reconnect signals
-            new_reply.downloadProgress.connect(
-                lambda r, t, pid=post_id: self.on_download_progress(pid, r, t)
-            )
-            new_reply.finished.connect(
-                lambda pid=post_id: self.on_download_finished(pid)
-            )
-            new_reply.errorOccurred.connect(
-                lambda err, pid=post_id: self.on_download_error(pid, err)
-            )
+    def on_video_downloaded(self, post_id, video_path):
+        job = self.downloads.job(post_id)
+        if job is None:
             return
-
-        # Not a redirect, proceed
-        # Flush remaining bytes
-        if reply.bytesAvailable():
-            chunk = reply.readAll()
-            data["file"].write(chunk)
-
-        data["file"].close()
-        reply.deleteLater()
-
-        if reply.error() != QNetworkReply.NetworkError.NoError:
-            # Error handled by signal (or not? errorOccurred is usually enough)
-            # We cleanup if error wasn't handled already
-            return
-
-        # Success - Now download thumbnail (if needed)
-        post_data = data["post_data"]
-        thumb_url = post_data.get("thumbnail")
-
+        thumb_url = job.post_data.get("thumbnail")
         if thumb_url:
-            self.download_thumbnail(post_id, thumb_url, data["temp_path"])
+            self.download_thumbnail(post_id, thumb_url, video_path)
         else:
-            self.finalize_install(post_id, data["temp_path"], None)
+            self.finalize_install(post_id, video_path, None)
 
-    def download_thumbnail(self, post_id, url, video_temp_path):
-        request = QNetworkRequest(QUrl(url))
-        reply = self.net_manager.get(request)
-
-        # Create temp file for thumb
-        fd, thumb_path = tempfile.mkstemp(suffix=".jpg")
-        os.close(fd)
-
-        # Attach to active_downloads to track it
-        self.active_downloads[post_id]["thumb_reply"] = reply
-        self.active_downloads[post_id]["thumb_path"] = thumb_path
-
-        reply.finished.connect(lambda: self.on_thumb_finished(post_id))
-
-    def on_thumb_finished(self, post_id):
-        if post_id not in self.active_downloads:
-            return
-
-        data = self.active_downloads[post_id]
-        reply = data["thumb_reply"]
-        thumb_path = data["thumb_path"]
-
-        if reply.error() == QNetworkReply.NetworkError.NoError:
-            with open(thumb_path, "wb") as f:
-                f.write(reply.readAll())
-        else:
-            # Failed to download thumb, ignore
-            if os.path.exists(thumb_path):
-                os.remove(thumb_path)
-            thumb_path = None
+    def download_thumbnail(self, post_id, url, video_path):
+        # The card already put this thumbnail in the shared cache, usually
+        ThumbnailLoader.instance().load(
+            url, self, lambda data: self.on_thumb_finished(post_id, video_path, data)
+        )
 
-        reply.deleteLater()
+    def on_thumb_finished(self, post_id, video_path, data):
+        thumb_path = None
+        if data is not None:
+            # FileManager moves this file into .manager
+            fd, thumb_path = tempfile.mkstemp(suffix=".jpg")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+        # Failed to download thumb: ignore
 
         # Finish everything
-        self.finalize_install(post_id, data["temp_path"], thumb_path)
-
-    def on_download_error(self, post_id, error_code):
-        if post_id in self.active_downloads:
-            data = self.active_downloads[post_id]
-            data["file"].close()
-            if os.path.exists(data["temp_path"]):
-                os.remove(data["temp_path"])
-
-            error_str = data["reply"].errorString()
-            self.toast.show_message(
-                f"Download Error: {error_str}", is_error=True, duration=5000
-            )
-
-            # Reset UI
-            if post_id in self.card_map:
-                try:
-                    self.card_map[post_id].reset_state()
-                except:
-                    pass
+        self.finalize_install(post_id, video_path, thumb_path)
 
-            del self.active_downloads[post_id]
-
-    def finalize_install(self, post_id, temp_path, thumb_path):
-        if post_id not in self.active_downloads:
+    def finalize_install(self, post_id, video_path, thumb_path):
+        job = self.downloads.job(post_id)
+        if job is None:
             return
-
-        post_data = self.active_downloads[post_id]["post_data"]
-        del self.active_downloads[post_id]
-
-        # Call original finish logic
-        self.finish_install_logic(post_data, temp_path, thumb_path)
+        post_data = job.post_data
+        if job.sha256:
+            # Saved with the rest of the metadata in .manager
+            post_data = {**post_data, "sha256": job.sha256}
+        self.files.install(post_data, video_path, thumb_path)
 
     def update_progress(self, post_id, value):
-        if post_id in self.card_map:
-            # Only update if widget is currently visible/exist in map
-            try:
-                self.card_map[post_id].set_progress(value)
-            except RuntimeError:
-                pass
-
-    def finish_install_logic(self, post_data, temp_path, thumb_path):
-        slug = post_data.get("slug", "unknown")
-        ptype = post_data.get("type")
-        post_id = post_data.get("id")
-
-        success = False
-        msg = ""
-
-        # Pass thumb_path if it exists and is not empty string
-        t_path = thumb_path if thumb_path else None
-
-        if ptype == "boot_video":
-            success, msg = FileManager.install_boot_video(
-                temp_path, slug, post_data, t_path
-            )
-        else:
-            success, msg = FileManager.install_suspend_video(
-                temp_path, post_data, t_path
-            )
+        self.download_states.set(post_id, value)
 
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+    def on_download_state_changed(self, post_id, state):
+        # Only a card currently showing the post needs repainting; list
+        # views listen to the store themselves
+        card = self.cards.get(post_id)
+        if card is not None:
+            card.show_state(state)
 
-        # Cleanup temp thumb if it exists
-        if t_path and os.path.exists(t_path):
-            os.remove(t_path)
+    def on_install_progress(self, post_id, done, total):
+        # Only a copy across filesystems takes long enough to show
+        if total > 0:
+            self.update_progress(post_id, int(done * 100 / total))
 
-        if post_id in self.card_map:
-            try:
-                self.card_map[post_id].reset_state()
-            except RuntimeError:
-                pass
+    def on_installed(self, post_id, success, msg):
+        # Installed (or failed to install): the journal can drop it
+        self.downloads.complete(post_id)
+        self.download_states.set(post_id, "installed" if success else None)
 
         if success:
             self.toast.show_message(msg)
@@ -600,9 +694,11 @@ class MainWindow(QMainWindow):
             self.toast.show_message(msg, is_error=True)
 
     def render_library(self):
-        self.clear_layout(self.library_layout)
+        # The list is filled in by show_library once the scan finishes
+        self.files.list_installed()
 
-        files = FileManager.get_installed_files()
+    def show_library(self, files):
+        self.clear_layout(self.library_layout)
 
         if not files:
             lbl = QLabel("No videos installed yet.")
@@ -617,7 +713,9 @@ class MainWindow(QMainWindow):
             self.library_layout.addWidget(item)
 
     def on_delete_file(self, filename):
-        success, msg = FileManager.delete_file(filename)
+        self.files.delete(filename)
+
+    def on_file_deleted(self, filename, success, msg):
         if success:
             self.toast.show_message(msg)
             self.render_library()  # Refresh list
@@ -0,0 +1,222 @@
+import http.client
+import ssl
+import threading
+import time
+import zlib
+from collections import deque
+from urllib.parse import urljoin, urlsplit
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 10
+
+# Errors that mean a pooled keep-alive connection was closed by the server
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class Response:
+    """A fully read response."""
+
+    def __init__(self, status, reason, headers, body, url):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.url = url  # Final URL after redirects
+
+
+class PooledResponse:
+    """
+    A streaming response on a pooled connection. Bodies sent with
+    gzip/deflate Content-Encoding are decoded transparently. close() hands
+    the connection back to the pool if the body was read to the end.
+    """
+
+    def __init__(self, pool, key, conn, response, url):
+        self.pool = pool
+        self.key = key
+        self.conn = conn
+        self.response = response
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+        self.url = url
+
+        encoding = (self.headers.get("Content-Encoding") or "").lower()
+        self._decoder = None
+        if encoding in ("gzip", "x-gzip", "deflate"):
+            # 32 + MAX_WBITS accepts both gzip and zlib framing
+            self._decoder = zlib.decompressobj(32 + zlib.MAX_WBITS)
+
+    def read(self, amt=None):
+        """Reads up to amt decoded bytes (all if None); b"" at the end."""
+        while True:
+            # read1: return what has arrived instead of waiting for amt bytes
+            raw = self.response.read() if amt is None else self.response.read1(amt)
+            self.pool.stats["bytes_received"] += len(raw)
+            if self._decoder is None:
+                return raw
+            if not raw:
+                return self._decoder.flush()
+            data = self._decoder.decompress(raw)
+            if data or amt is None:
+                return data
+
+    def iter_chunks(self, chunk_size=64 * 1024):
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        if self.conn is None:
+            return
+        reusable = self.response.isclosed() and not self.response.will_close
+        self.pool._release(self.key, self.conn if reusable else None)
+        if not reusable:
+            self.conn.close()
+        self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections shared across requests, so repeated
+    API calls skip the TCP and TLS handshakes. At most max_per_host
+    connections are open per host at once; idle ones are dropped after
+    idle_timeout seconds. Thread-safe.
+    """
+
+    def __init__(self, headers=None, max_per_host=4, idle_timeout=60, timeout=30):
+        self.headers = {"Accept-Encoding": "gzip, deflate", **(headers or {})}
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._idle = {}  # (scheme, host, port) -> deque of (conn, last_used)
+        self._slots = {}  # (scheme, host, port) -> BoundedSemaphore
+        self._ssl_context = ssl.create_default_context()
+
+        self.stats = {"connections_opened": 0, "requests": 0, "bytes_received": 0}
+
+    def _key(self, url):
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        return (parts.scheme, parts.hostname, port)
+
+    def _acquire(self, key):
+        """Waits for a free slot; returns (conn, reused)."""
+        with self._lock:
+            slots = self._slots.setdefault(
+                key, threading.BoundedSemaphore(self.max_per_host)
+            )
+        slots.acquire()
+
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                conn, last_used = idle.pop()
+                if time.monotonic() - last_used < self.idle_timeout:
+                    return conn, True
+                conn.close()
+        return self._connect(key), False
+
+    def _connect(self, key):
+        scheme, host, port = key
+        self.stats["connections_opened"] += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host, port, timeout=self.timeout, context=self._ssl_context
+            )
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _release(self, key, conn):
+        """Returns a slot, and conn to the idle list unless it is None."""
+        if conn is not None:
+            with self._lock:
+                self._idle.setdefault(key, deque()).append((conn, time.monotonic()))
+        self._slots[key].release()
+
+    def open(self, method, url, headers=None, body=None):
+        """
+        Sends one request (no redirect handling) and returns a
+        PooledResponse, which must be closed (use it as a context manager).
+        """
+        key = self._key(url)
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        all_headers = {**self.headers, **(headers or {})}
+
+        conn, reused = self._acquire(key)
+        try:
+            try:
+                conn.request(method, path, body=body, headers=all_headers)
+                response = conn.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                # Server dropped the idle connection; retry once on a new one
+                conn.close()
+                conn = self._connect(key)
+                conn.request(method, path, body=body, headers=all_headers)
+                response = conn.getresponse()
+        except Exception:
+            conn.close()
+            self._release(key, None)
+            raise
+
+        self.stats["requests"] += 1
+        return PooledResponse(self, key, conn, response, url)
+
+    def stream(self, method, url, headers=None):
+        """
+        Sends a request, following redirects, and returns the final
+        PooledResponse unread, so the caller can consume the body as it
+        arrives. The response must be closed (use it as a context manager).
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self.open(method, url, headers)
+            location = response.headers.get("Location")
+            if response.status not in REDIRECT_CODES or not location:
+                return response
+            with response:
+                response.read()  # Drain so the connection is reusable
+            if response.status == 303:
+                method = "GET"
+            url = urljoin(url, location)
+
+        raise http.client.HTTPException(f"Too many redirects for {url}")
+
+    def request(self, method, url, headers=None, read_body=True):
+        """
+        Sends a request, following redirects. Returns a Response; with
+        read_body=False the body is skipped (useful to resolve a URL).
+        """
+        with self.stream(method, url, headers) as response:
+            # HEAD "bodies" are empty, reading them just frees the connection
+            body = response.read() if read_body or method == "HEAD" else b""
+            return Response(
+                response.status, response.reason, response.headers, body, response.url
+            )
+
+    def clear(self):
+        """Closes all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn, _ in connections:
+                conn.close()
@@ -0,0 +1,115 @@
+import codecs
+import json
+import re
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class PostStream:
+    """
+    Incremental parser for a {"posts": [...], ...} document.
+
+    feed() takes raw bytes as they arrive from the network and returns the
+    array items that became complete, so callers can show the first posts
+    long before the body has finished downloading. Only the unparsed tail
+    of the input is buffered. finish() returns the whole document.
+    """
+
+    def __init__(self, key="posts"):
+        self.key = key
+        self.document = {}
+        self.items = []
+
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state = "start"
+        self._current_key = None
+
+    def feed(self, data, final=False):
+        """Consumes bytes; returns the list of newly completed items."""
+        self._buffer += self._utf8.decode(data, final)
+        start = len(self.items)
+        pos = self._parse(final)
+        # Drop what has been parsed; a partial value stays for the next call
+        self._buffer = self._buffer[pos:]
+        return self.items[start:]
+
+    def finish(self):
+        """Returns the parsed document. Raises ValueError if it is incomplete."""
+        self.feed(b"", final=True)
+        if self._state != "done":
+            raise ValueError("Truncated or malformed JSON document")
+        return self.document
+
+    def _decode(self, pos, final):
+        """Decodes one value at pos; returns (value, end) or None if incomplete."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError("Malformed JSON document")
+            return None
+        if end == len(self._buffer) and not final:
+            # A number at the very end may still be missing digits
+            return None
+        return value, end
+
+    def _parse(self, final):
+        buf = self._buffer
+        pos = 0
+        while True:
+            pos = WHITESPACE.match(buf, pos).end()
+            if pos == len(buf) or self._state == "done":
+                return pos
+            char = buf[pos]
+
+            if self._state == "start":
+                if char != "{":
+                    raise ValueError("Expected a JSON object")
+                self._state = "key"
+                pos += 1
+
+            elif self._state == "key":
+                if char == "}":
+                    self._state = "done"
+                    pos += 1
+                elif char == ",":
+                    pos += 1
+                else:
+                    decoded = self._decode(pos, final)
+                    if decoded is None:
+                        return pos
+                    self._current_key, pos = decoded
+                    self._state = "colon"
+
+            elif self._state == "colon":
+                if char != ":":
+                    raise ValueError("Expected ':' in JSON object")
+                self._state = "value"
+                pos += 1
+
+            elif self._state == "value":
+                if self._current_key == self.key and char == "[":
+                    self.document[self.key] = self.items
+                    self._state = "array"
+                    pos += 1
+                    continue
+                decoded = self._decode(pos, final)
+                if decoded is None:
+                    return pos
+                self.document[self._current_key], pos = decoded
+                self._state = "key"
+
+            elif self._state == "array":
+                if char == "]":
+                    self._state = "key"
+                    pos += 1
+                elif char == ",":
+                    pos += 1
+                else:
+                    decoded = self._decode(pos, final)
+                    if decoded is None:
+                        return pos
+                    item, pos = decoded
+                    self.items.append(item)
@@ -0,0 +1,90 @@
+import threading
+import time
+from array import array
+
+# Sort key -> label shown in the UI. "default" is the API listing order.
+SORT_KEYS = {
+    "default": "Default",
+    "downloads": "Most Downloaded",
+    "likes": "Most Liked",
+    "newest": "Newest",
+    "trending": "Trending",
+}
+
+
+def trending_score(downloads, likes, created, now):
+    """
+    Popularity decayed by age (Hacker News style gravity), so recent posts
+    with a burst of downloads outrank old all-time favourites.
+    Posts without a timestamp are treated as a year old.
+    """
+    age_hours = (now - created) / 3600 if created else 24 * 365
+    return (downloads + 3 * likes) / (max(age_hours, 0) + 2) ** 1.5
+
+
+class Ranking:
+    """
+    Sort orders for one catalog. For each key it keeps the permutation of
+    catalog indices and each index's rank, so ordering a search result
+    never re-sorts the catalog and flipping pages never sorts at all.
+
+    An order is computed the first time its key is used, so loading a
+    catalog costs nothing until the sort box leaves "default".
+    """
+
+    def __init__(self, catalog, now=None):
+        now = time.time() if now is None else now
+        downloads, likes, created = catalog.downloads, catalog.likes, catalog.created
+
+        self.size = len(catalog)
+        self.keys = {
+            "downloads": downloads.__getitem__,
+            "likes": likes.__getitem__,
+            "newest": created.__getitem__,
+            "trending": lambda i: trending_score(
+                downloads[i], likes[i], created[i], now
+            ),
+        }
+        self._orders = {}
+        self._ranks = {}
+        self._lock = threading.Lock()  # Search workers and the GUI share it
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def order(self, key):
+        """Catalog indices in the order for key."""
+        self._build(key)
+        return self._orders[key]
+
+    def rank(self, key):
+        """Each catalog index's position in the order for key."""
+        self._build(key)
+        return self._ranks[key]
+
+    def _build(self, key):
+        with self._lock:
+            if key in self._orders:
+                return
+            score = self.keys[key]
+            # Descending, and stable so ties keep listing order
+            order = array("I", sorted(range(self.size), key=lambda i: -score(i)))
+            rank = array("I", bytes(4 * self.size))
+            for position, index in enumerate(order):
+                rank[index] = position
+            self._orders[key] = order
+            self._ranks[key] = rank
+
+    def sort(self, indices, key):
+        """Returns indices (catalog positions) in the order for key."""
+        if key not in self.keys:
+            return indices
+
+        if len(indices) * 8 > self.size:
+            # Large result: walking the precomputed permutation is O(n)
+            selected = bytearray(self.size)
+            for i in indices:
+                selected[i] = 1
+            return [i for i in self.order(key) if selected[i]]
+
+        return sorted(indices, key=self.rank(key).__getitem__)
@@ -0,0 +1,83 @@
+from array import array
+
+
+class SearchCancelled(Exception):
+    """Raised inside a search when a newer query made it obsolete."""
+
+
+def trigrams(text):
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """
+    In-process substring search over post titles and authors.
+
+    Keys are lowercased once at build time. Queries of three or more
+    characters only verify the posts listed under their rarest trigram,
+    and a query that extends the previous one ("zel" -> "zeld") only
+    rescans the previous result set, whichever is smaller.
+    Results are catalog indices in listing order.
+    """
+
+    CANCEL_CHECK_INTERVAL = 4096  # Candidates verified between cancel checks
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        # Title and author in one key; "\n" keeps matches from spanning both
+        self.keys = [
+            f"{catalog.title(i)}\n{catalog.author(i)}".lower()
+            for i in range(len(catalog))
+        ]
+
+        postings = {}
+        for i, key in enumerate(self.keys):
+            for tri in trigrams(key):
+                postings.setdefault(tri, []).append(i)
+        self.postings = {tri: array("I", ids) for tri, ids in postings.items()}
+
+        # (query, result) of the last completed search, swapped as one tuple
+        self._last = (None, None)
+
+    def search(self, text, cancelled=None):
+        """
+        Returns matching catalog indices. If cancelled() turns true while
+        scanning, raises SearchCancelled and leaves the narrowing state alone.
+        """
+        text = text.lower()
+        if not text:
+            result = range(len(self.keys))
+        else:
+            candidates = self._candidates(text)
+            keys = self.keys
+            if cancelled is None:
+                result = [i for i in candidates if text in keys[i]]
+            else:
+                result = []
+                step = self.CANCEL_CHECK_INTERVAL
+                for start in range(0, len(candidates), step):
+                    if cancelled():
+                        raise SearchCancelled()
+                    result.extend(
+                        i for i in candidates[start : start + step] if text in keys[i]
+                    )
+
+        self._last = (text, result)
+        return result
+
+    def _candidates(self, text):
+        """Smallest known superset of the matches for text."""
+        best = None
+        last_query, last_result = self._last
+        if last_query is not None and last_query in text:
+            best = last_result
+
+        if len(text) >= 3:
+            for tri in trigrams(text):
+                ids = self.postings.get(tri)
+                if ids is None:
+                    return ()
+                if best is None or len(ids) < len(best):
+                    best = ids
+
+        return range(len(self.keys)) if best is None else best
@@ -1,10 +1,22 @@
 import sys
 import os
 from src.api import RepoAPI
-from src.file_manager import FileManager
+from src.search_index import SearchIndex
+from src.catalog_cache import Catalog, encode_catalog
+from src.catalog_db import CatalogDB
+from src.json_stream import PostStream
+from src.thumbnail_cache import ThumbnailCache
+from src.downloads import DownloadManager, DownloadJob
+from src.file_manager import AsyncFileManager, FileManager
+import hashlib
 from src.config import Config
 from pathlib import Path
+import json
 import shutil
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 
 
 def test_core():
@@ -51,7 +63,7 @@ def test_core():
     dummy_src.write_text("fake video content")
 
     try:
-        # Test Boot Video Install
+        # Test Boot Video Install (installs move the file, so rewrite it each time)
         success, msg = FileManager.install_boot_video(dummy_src, "test-boot-slug")
         print(f"Boot Install: {'SUCCESS' if success else 'FAIL'} - {msg}")
 
@@ -62,6 +74,7 @@ def test_core():
             print("Error: Boot video file missing.")
 
         # Test Suspend Video Install
+        dummy_src.write_text("fake video content")
         success, msg = FileManager.install_suspend_video(dummy_src)
         print(f"Suspend Install 1: {'SUCCESS' if success else 'FAIL'} - {msg}")
 
@@ -70,6 +83,7 @@ def test_core():
             print("Verified: Suspend video file exists.")
 
         # Test Backup Logic (Install again)
+        dummy_src.write_text("fake video content")
         success, msg = FileManager.install_suspend_video(dummy_src)
         print(f"Suspend Install 2 (Backup): {'SUCCESS' if success else 'FAIL'} - {msg}")
 
@@ -93,5 +107,720 @@ def test_core():
         Config.get_install_path = original_get_path
 
 
+class FakeRepoHandler(BaseHTTPRequestHandler):
+    """
+    Serves a tiny /api/posts/all with an ETag, counting full responses,
+    plus a newest-first /api/posts?page=N listing, and videos behind
+    /post/download/<id> redirects.
+    """
+
+    posts = [{"id": "a1", "title": "Zelda Boot", "type": "boot_video"}]
+    full_responses = 0
+    pages_served = 0
+    redirects_served = 0
+    PAGE_SIZE = 2
+    VIDEO = b"\x1a\x45\xdf\xa3" + bytes(range(256)) * 400  # EBML magic + filler
+    VIDEO_ETAG = '"v1"'
+    ranges = True  # Honour Range requests for videos
+    drop_after = None  # Cut the next video response after this many bytes
+    rate = None  # Bytes/s per connection for videos; None for unlimited
+    video_requests = []  # Range header of each video request
+    bodies = {}  # Post id -> body served instead of VIDEO
+
+    def do_HEAD(self):
+        # /post/download/<id> redirects to a fake CDN file
+        if self.path.startswith("/post/download/"):
+            FakeRepoHandler.redirects_served += 1
+            post_id = self.path.rsplit("/", 1)[1]
+            self.send_response(302)
+            self.send_header("Location", f"/cdn/{post_id}.webm")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path.startswith("/post/download/"):
+            FakeRepoHandler.redirects_served += 1
+            post_id = self.path.rsplit("/", 1)[1]
+            self.send_response(302)
+            self.send_header("Location", f"/cdn/{post_id}.webm")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/cdn/"):
+            self.send_video()
+            return
+        if "?page=" in self.path:
+            FakeRepoHandler.pages_served += 1
+            page = int(self.path.rsplit("=", 1)[1])
+            start = (page - 1) * self.PAGE_SIZE
+            body = json.dumps(
+                {"posts": {"data": self.posts[start : start + self.PAGE_SIZE]}}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        body = json.dumps({"posts": self.posts}).encode()
+        etag = f'"{hash(body)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        FakeRepoHandler.full_responses += 1
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_video(self):
+        post_id = self.path.rsplit("/", 1)[1].split(".")[0]
+        data = self.bodies.get(post_id, self.VIDEO)
+        requested = self.headers.get("Range")
+        FakeRepoHandler.video_requests.append(requested)
+        if_range = self.headers.get("If-Range")
+        if requested and self.ranges and if_range in (None, self.VIDEO_ETAG):
+            first, _, last = requested.split("=")[1].partition("-")
+            start = int(first)
+            end = int(last) if last else len(data) - 1
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(data)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+            data = data[start : end + 1]
+        else:
+            self.send_response(200)
+        self.send_header("ETag", self.VIDEO_ETAG)
+        self.send_header("Accept-Ranges", "bytes" if self.ranges else "none")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+
+        if self.drop_after is not None:
+            data = data[: self.drop_after]
+            FakeRepoHandler.drop_after = None
+            self.close_connection = True
+        rate = self.rate
+        try:
+            if rate is None:
+                self.wfile.write(data)
+                return
+            for start in range(0, len(data), 4096):
+                self.wfile.write(data[start : start + 4096])
+                time.sleep(4096 / rate)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client stopped reading (its range shrank, or it gave up)
+
+    def log_message(self, *args):
+        pass
+
+
+def with_fake_repo(test_fn):
+    """Runs test_fn(api) against a local server with an isolated cache dir."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeRepoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cache_dir = Path(tempfile.mkdtemp())
+
+    original = {
+        k: getattr(RepoAPI, k)
+        for k in (
+            "BASE_URL",
+            "API_URL",
+            "CACHE_DIR",
+            "CACHE_FILE",
+            "CACHE_META_FILE",
+            "CATALOG_FILE",
+            "CATALOG_DB_FILE",
+            "DOWNLOAD_URL_CACHE_FILE",
+        )
+    }
+    RepoAPI.BASE_URL = f"http://127.0.0.1:{server.server_port}"
+    RepoAPI.API_URL = f"{RepoAPI.BASE_URL}/api"
+    RepoAPI.CACHE_DIR = cache_dir
+    RepoAPI.CACHE_FILE = cache_dir / "posts.json"
+    RepoAPI.CACHE_META_FILE = cache_dir / "posts.meta.json"
+    RepoAPI.CATALOG_FILE = cache_dir / "posts.cat"
+    RepoAPI.CATALOG_DB_FILE = cache_dir / "catalog.db"
+    RepoAPI.DOWNLOAD_URL_CACHE_FILE = cache_dir / "download_urls.json"
+    original_get_path = Config.get_install_path
+    Config.get_install_path = lambda: cache_dir / "movies"
+    try:
+        test_fn(RepoAPI())
+    finally:
+        for k, v in original.items():
+            setattr(RepoAPI, k, v)
+        Config.get_install_path = original_get_path
+        server.shutdown()
+        shutil.rmtree(cache_dir)
+
+
+def test_cache_revalidation():
+    print("\n--- Testing Conditional Revalidation ---")
+
+    def run(api):
+        FakeRepoHandler.posts = [
+            {"id": "a1", "title": "Zelda Boot", "type": "boot_video"}
+        ]
+        FakeRepoHandler.full_responses = 0
+        posts = api.get_all_posts()
+        assert len(posts) == 1 and FakeRepoHandler.full_responses == 1
+        assert api.is_cache_fresh()
+
+        # Forced full sync with unchanged data is a 304
+        assert api.sync_posts(full=True)["added"] == []
+        assert FakeRepoHandler.full_responses == 1
+
+        # New data invalidates the ETag
+        FakeRepoHandler.posts = FakeRepoHandler.posts + [
+            {"id": "b2", "title": "Portal Suspend", "type": "suspend_video"}
+        ]
+        assert api.sync_posts(full=True)["added"] == ["b2"]
+        assert FakeRepoHandler.full_responses == 2
+        assert not api.is_cache_fresh(ttl=0)
+
+        # A cache that can't be loaded must not be revalidated into an empty one
+        api.CATALOG_FILE.unlink()
+        api.CACHE_FILE.write_text('{"posts": [')
+        assert len(api.sync_posts(full=True)["posts"]) == 2
+        assert FakeRepoHandler.full_responses == 3
+        assert len(api.sync_posts(full=True)["posts"]) == 2
+        print("SUCCESS: 304 served from cache, changes picked up.")
+
+    with_fake_repo(run)
+
+
+def test_delta_sync():
+    print("\n--- Testing Incremental Sync ---")
+
+    def run(api):
+        FakeRepoHandler.posts = [
+            {"id": f"p{i}", "title": f"Video {i}", "type": "boot_video"}
+            for i in range(10, 0, -1)
+        ]
+        first = api.sync_posts()
+        assert len(first["posts"]) == 10 and len(first["added"]) == 10
+
+        # Two new posts on top, one old post edited, nothing else touched
+        FakeRepoHandler.posts = [
+            {"id": "p12", "title": "Video 12", "type": "boot_video"},
+            {"id": "p11", "title": "Video 11", "type": "boot_video"},
+        ] + FakeRepoHandler.posts
+        FakeRepoHandler.posts[2] = {
+            "id": "p10",
+            "title": "Edited",
+            "type": "boot_video",
+        }
+        FakeRepoHandler.full_responses = 0
+        FakeRepoHandler.pages_served = 0
+        json_mtime = api.CACHE_FILE.stat().st_mtime_ns
+
+        result = api.sync_posts()
+        assert result["added"] == ["p12", "p11"]
+        assert result["changed"] == ["p10"]
+        assert result["removed"] == []
+        assert result["generation"] == first["generation"] + 1
+        # Merged into the binary catalog; posts.json isn't read or rewritten
+        assert list(result["posts"]) == FakeRepoHandler.posts
+        assert (
+            result["posts"].title(2) == "Edited"
+            and result["posts"].index_of("p1") == 11
+        )
+        assert api.CACHE_FILE.stat().st_mtime_ns == json_mtime
+        assert FakeRepoHandler.full_responses == 0
+        assert FakeRepoHandler.pages_served == 2
+
+        # The search DB took the delta in place, and the catalog still on
+        # screen keeps searching just its own posts
+        old, new = first["posts"], result["posts"]
+        if new.search_db is not None:
+            assert new.search_db.table == old.search_db.table
+            assert len(new.search_db.query("", True)) == 12
+            assert new.search_db.match_ids("edited", True) == [2]
+            assert [p["id"] for p in new.search_db.fetch_ids([0, 11])] == ["p12", "p1"]
+            assert len(old.search_db.query("", True)) == 10
+            assert old.search_db.match_ids("video 1", True) == [9]
+            assert old.search_db.query("", True, old.ranking, "likes")[9]["id"] == "p1"
+        assert len(result["posts"].ranking.sort(list(range(12)), "likes")) == 12
+
+        # Nothing new: one page, no generation bump
+        assert api.revalidate() is None
+        print("SUCCESS: Only new pages fetched and merged by id.")
+
+    with_fake_repo(run)
+
+
+def test_catalog_migration():
+    print("\n--- Testing Binary Catalog ---")
+
+    def run(api):
+        posts = [
+            {"id": "x1", "title": "Ünïcode Boot", "type": "boot_video", "downloads": 7},
+            {"id": "x2", "title": "Suspend", "type": "suspend_video", "likes": 3},
+        ]
+        # An existing posts.json from an older version, no catalog yet
+        with open(api.CACHE_FILE, "w") as f:
+            json.dump({"posts": posts}, f)
+
+        catalog = api.get_all_posts()
+        assert api.CATALOG_FILE.exists()
+        assert list(catalog) == posts
+        assert catalog.title(0) == "Ünïcode Boot" and catalog.is_boot(0)
+        assert catalog.downloads[0] == 7 and catalog.likes[1] == 3
+        assert catalog.view([1])[0]["id"] == "x2"
+        print("SUCCESS: posts.json migrated to the binary catalog.")
+
+        index = SearchIndex(catalog)
+        assert list(index.search("")) == [0, 1]
+        assert index.search("ÜNÏ") == [0]
+        assert index.search("ünïcode b") == [0]  # narrowed from the last result
+        assert index.search("pend") == [1]
+        assert index.search("xyz") == []
+        print("SUCCESS: In-memory search index matches substrings.")
+
+        if catalog.search_db is not None:
+            db = catalog.search_db
+            assert api.catalog_db.generation() == 0
+            assert [p["id"] for p in db.query("", is_boot=True)] == ["x1"]
+            assert len(db.query("nïc", is_boot=True)) == 1
+            assert len(db.query("ÜNÏCODE", is_boot=True)) == 1
+            assert len(db.query("zz", is_boot=True)) == 0
+            assert db.query("suspend", is_boot=False)[0:12][0]["id"] == "x2"
+            print("SUCCESS: Search database populated and queryable.")
+
+    with_fake_repo(run)
+
+
+def test_search_backends():
+    print("\n--- Testing Search Backends ---")
+
+    posts = [
+        {"id": "s1", "title": "Zelda Boot", "user": {"steam_name": "Link"}},
+        {"id": "s2", "title": "Portal", "content": "zelda fan remix"},
+        {"id": "s3", "title": "Boots of Zeal", "type": "boot_video"},
+        {"id": "s4", "title": "Ink", "user": {"steam_name": "Zelda_Fan"}},
+    ]
+    for post in posts:
+        post.setdefault("type", "suspend_video")
+    catalog = Catalog(encode_catalog(posts))
+    index = SearchIndex(catalog)
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        db = CatalogDB(tmp / "catalog.db")
+        db.populate(posts, 0)
+        snapshot = db.snapshot()
+        # Every prefix, so short LIKE scans and FTS queries are compared alike
+        for word in ("zelda_f", "boot", "remix", "link", "po"):
+            for end in range(1, len(word) + 1):
+                text = word[:end]
+                expected = index.search(text)
+                for is_boot in (True, False):
+                    found = snapshot.match_ids(text, is_boot)
+                    want = [i for i in expected if catalog.is_boot(i) == is_boot]
+                    assert found == want, (text, is_boot, found, want)
+        print("SUCCESS: Search database and in-memory index agree.")
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_ranking():
+    print("\n--- Testing Sort Orders ---")
+
+    def run(api):
+        posts = [
+            {"id": "old", "type": "boot_video", "downloads": 900, "likes": 1,
+             "created_at": "2020-01-01T00:00:00Z"},
+            {"id": "new", "type": "boot_video", "downloads": 50, "likes": 40,
+             "created_at": "2030-01-01T00:00:00Z"},
+            {"id": "mid", "type": "boot_video", "downloads": 300, "likes": 5,
+             "created_at": "2025-01-01T00:00:00Z"},
+        ]  # fmt: skip
+        with open(api.CACHE_FILE, "w") as f:
+            json.dump({"posts": posts}, f)
+        catalog = api.get_all_posts()
+
+        # Nothing is sorted until a sort key is first used
+        assert not catalog.ranking._orders
+
+        ids = lambda seq: [p["id"] for p in seq[0:12]]
+        expected = {
+            "default": ["old", "new", "mid"],
+            "downloads": ["old", "mid", "new"],
+            "likes": ["new", "mid", "old"],
+            "newest": ["new", "mid", "old"],
+        }
+        for key, order in expected.items():
+            if catalog.search_db is not None:
+                result = catalog.search_db.query("", True, catalog.ranking, key)
+                assert ids(result) == order
+            assert ids(catalog.view(catalog.ranking.sort([0, 1, 2], key))) == order
+        print("SUCCESS: Sort orders built on first use and applied to results.")
+
+    with_fake_repo(run)
+
+
+def test_download_url_cache():
+    print("\n--- Testing Download URL Resolution ---")
+
+    def run(api):
+        FakeRepoHandler.redirects_served = 0
+        urls = api.resolve_download_urls(["a1", "b2", "c3"])
+        assert urls["b2"].endswith("/cdn/b2.webm"), urls
+        assert FakeRepoHandler.redirects_served == 3
+
+        # A fresh instance reads the persisted cache, no network needed
+        fresh = RepoAPI()
+        assert fresh.get_download_url("c3") == urls["c3"]
+        assert FakeRepoHandler.redirects_served == 3
+
+        fresh.forget_download_url("c3")
+        assert fresh.cached_download_url("c3") is None
+        print("SUCCESS: Redirects resolved concurrently and cached on disk.")
+
+    with_fake_repo(run)
+
+
+def test_streaming_fetch():
+    print("\n--- Testing Streaming Catalog Parse ---")
+
+    # Split everywhere: inside numbers, strings and multi-byte characters
+    doc = {"total": 12345, "posts": [{"id": i, "title": "Zelda ✨"} for i in range(5)]}
+    raw = json.dumps(doc, ensure_ascii=False).encode()
+    parser = PostStream()
+    streamed = []
+    for i in range(len(raw)):
+        streamed.extend(parser.feed(raw[i : i + 1]))
+    assert parser.finish() == doc and streamed == doc["posts"]
+
+    def run(api):
+        FakeRepoHandler.posts = [
+            {"id": f"s{i}", "title": f"Stream {i}", "type": "boot_video"}
+            for i in range(50)
+        ]
+        batches = []
+        catalog = api.get_all_posts(on_posts=batches.append)
+        assert [p for batch in batches for p in batch] == FakeRepoHandler.posts
+        assert len(catalog) == 50
+        with open(api.CACHE_FILE, "rb") as f:
+            assert json.load(f)["posts"] == FakeRepoHandler.posts
+        print("SUCCESS: Posts parsed incrementally and cached from the stream.")
+
+    with_fake_repo(run)
+
+
+def test_thumbnail_cache():
+    print("\n--- Testing Thumbnail Cache ---")
+    cache_dir = Path(tempfile.mkdtemp())
+    try:
+        cache = ThumbnailCache(cache_dir, max_bytes=250)
+        for name in ("a", "b", "c"):
+            cache.put(f"http://x/{name}.jpg", name.encode() * 100)
+        # Over budget: "a" (least recently used) was evicted
+        assert cache.get("http://x/a.jpg") is None
+        assert cache.get("http://x/b.jpg") == b"b" * 100
+        cache.put("http://x/d.jpg", b"d" * 100)  # Evicts "c", not the fresh "b"
+        assert cache.stats == {"hits": 1, "misses": 1, "evictions": 2}
+        cache.flush()
+
+        reopened = ThumbnailCache(cache_dir, max_bytes=250)
+        assert reopened.get("http://x/c.jpg") is None
+        assert reopened.get("http://x/b.jpg") == b"b" * 100
+        assert reopened.size() == 200
+        print("SUCCESS: Thumbnails cached with LRU eviction across restarts.")
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_download_queue():
+    print("\n--- Testing Download Queue ---")
+
+    def run(api):
+        events = []
+        done = threading.Event()
+
+        def on_event(event, job):
+            events.append((event, job.post_id))
+            if event in ("downloaded", "failed"):
+                done.set()
+
+        manager = DownloadManager(api, on_event, max_concurrent=1)
+        for post_id in ("a1", "b2", "c3"):
+            manager.enqueue({"id": post_id, "title": post_id})
+        # Only a1 runs; the others wait their turn and can be changed meanwhile
+        manager.cancel("b2")
+        manager.pause("c3")
+        assert done.wait(10) and ("downloaded", "a1") in events, events
+        assert manager.job("b2") is None
+        assert manager.job("c3").state == DownloadJob.PAUSED
+
+        a1 = manager.job("a1")
+        with open(a1.path, "rb") as f:
+            assert f.read() == FakeRepoHandler.VIDEO
+        assert api.cached_download_url("a1").endswith("/cdn/a1.webm")
+
+        # A new run picks up the journal: a1 still waits to be installed
+        events.clear()
+        restarted = DownloadManager(api, on_event, max_concurrent=1)
+        restarted.restore()
+        assert ("downloaded", "a1") in events, events
+        restarted.complete("a1")
+        assert not os.path.exists(a1.path)
+
+        done.clear()
+        restarted.resume("c3")
+        assert done.wait(10) and ("downloaded", "c3") in events, events
+        events.clear()
+        DownloadManager(api, on_event).restore()
+        assert events == [("downloaded", "c3")], events
+        print("SUCCESS: Downloads queued, paused, cancelled and journaled.")
+
+    with_fake_repo(run)
+
+
+def test_download_resume():
+    print("\n--- Testing Download Resume ---")
+
+    def run(api):
+        done = threading.Event()
+        events = []
+
+        def on_event(event, job):
+            events.append(event)
+            if event in ("downloaded", "failed"):
+                done.set()
+
+        manager = DownloadManager(api, on_event)
+        manager.RETRY_DELAYS = (0,)
+
+        # The connection drops mid-body; the retry asks only for the rest
+        FakeRepoHandler.video_requests = []
+        FakeRepoHandler.drop_after = 30000
+        manager.enqueue({"id": "r1"})
+        assert done.wait(10) and events[-1] == "downloaded", events
+        assert FakeRepoHandler.video_requests == [None, "bytes=30000-"]
+        with open(manager.job("r1").path, "rb") as f:
+            assert f.read() == FakeRepoHandler.VIDEO
+
+        # A server that ignores Range sends everything again, which is kept
+        FakeRepoHandler.ranges = False
+        FakeRepoHandler.video_requests = []
+        FakeRepoHandler.drop_after = 30000
+        done.clear()
+        manager.enqueue({"id": "r2"})
+        try:
+            assert done.wait(10) and events[-1] == "downloaded", events
+        finally:
+            FakeRepoHandler.ranges = True
+        assert FakeRepoHandler.video_requests == [None, "bytes=30000-"]
+        with open(manager.job("r2").path, "rb") as f:
+            assert f.read() == FakeRepoHandler.VIDEO
+
+        # A partial file left by a previous run resumes after restore()
+        job = manager.job("r1")
+        with open(job.path, "r+b") as f:
+            f.truncate(50000)
+        with open(manager.journal_path) as f:
+            journal = json.load(f)
+        for entry in journal:
+            entry["state"] = DownloadJob.RUNNING
+        with open(manager.journal_path, "w") as f:
+            json.dump(journal, f)
+        FakeRepoHandler.video_requests = []
+        done.clear()
+        events.clear()
+        restarted = DownloadManager(api, on_event)
+        restarted.restore()
+        while restarted.job("r1").state != DownloadJob.DOWNLOADED:
+            assert done.wait(10)
+            done.clear()
+        assert "bytes=50000-" in FakeRepoHandler.video_requests
+        with open(job.path, "rb") as f:
+            assert f.read() == FakeRepoHandler.VIDEO
+        # The resumed file's digest covers the part from the previous run
+        assert (
+            restarted.job("r1").sha256
+            == hashlib.sha256(FakeRepoHandler.VIDEO).hexdigest()
+        )
+        print("SUCCESS: Partial downloads resumed with Range requests.")
+
+    with_fake_repo(run)
+
+
+def test_segmented_download():
+    print("\n--- Testing Segmented Download ---")
+
+    def run(api):
+        done = threading.Event()
+        manager = DownloadManager(
+            api, lambda event, job: event == "downloaded" and done.set()
+        )
+        manager.max_segments = 4
+        manager.MIN_SEGMENT_SIZE = 8 * 1024
+        manager.PROBE_SECONDS = 0.05
+
+        FakeRepoHandler.rate = 200 * 1024
+        FakeRepoHandler.video_requests = []
+        try:
+            manager.enqueue({"id": "s1"})
+            assert done.wait(10)
+        finally:
+            FakeRepoHandler.rate = None
+        ranged = [r for r in FakeRepoHandler.video_requests if r]
+        job = manager.job("s1")
+        assert ranged and job.segments is None, FakeRepoHandler.video_requests
+        with open(job.path, "rb") as f:
+            assert f.read() == FakeRepoHandler.VIDEO
+        assert job.sha256 == hashlib.sha256(FakeRepoHandler.VIDEO).hexdigest()
+        print(f"SUCCESS: Video fetched over {len(ranged) + 1} connections.")
+
+    with_fake_repo(run)
+
+
+def test_atomic_install():
+    print("\n--- Testing Atomic Install ---")
+
+    install_dir = Path(tempfile.mkdtemp())
+    original_get_path = Config.get_install_path
+    Config.get_install_path = lambda: install_dir
+    try:
+        # Downloads land next to their destination; installing renames them
+        staged = FileManager.staging_path("v1")
+        staged.write_bytes(b"first")
+        inode = os.stat(staged).st_ino
+        success, msg = FileManager.install_suspend_video(staged)
+        dest = install_dir / "deck-suspend-animation.webm"
+        assert success and not staged.exists(), msg
+        assert os.stat(dest).st_ino == inode
+
+        staged = FileManager.staging_path("v2")
+        staged.write_bytes(b"second")
+        success, msg = FileManager.install_suspend_video(staged)
+        backup = install_dir / "deck-suspend-animation.webm.bak"
+        assert success and dest.read_bytes() == b"second", msg
+        # The previous video became the backup without being copied
+        assert backup.read_bytes() == b"first" and os.stat(backup).st_ino == inode
+
+        # A source elsewhere (maybe another filesystem) still ends up in place
+        fd, outside = tempfile.mkstemp(suffix=".webm")
+        os.write(fd, b"boot")
+        os.close(fd)
+        success, msg = FileManager.install_boot_video(outside, "b")
+        assert success and (install_dir / "b.webm").read_bytes() == b"boot", msg
+        assert not os.path.exists(outside)
+        leftovers = [p.name for p in install_dir.iterdir() if p.name.startswith(".")]
+        assert leftovers == [".manager"], leftovers
+        print("SUCCESS: Videos installed by rename; backup kept without a copy.")
+    finally:
+        Config.get_install_path = original_get_path
+        shutil.rmtree(install_dir)
+
+
+def test_async_file_manager():
+    print("\n--- Testing Async File Manager ---")
+
+    install_dir = Path(tempfile.mkdtemp())
+    original_get_path = Config.get_install_path
+    Config.get_install_path = lambda: install_dir
+    files = AsyncFileManager()
+    try:
+        post = {"id": "7", "slug": "b", "type": "boot_video"}
+        staged = FileManager.staging_path("7")
+        staged.write_bytes(b"boot" * 1000)
+        reports = []
+
+        def slow_progress(done, total):
+            reports.append((done, total))
+            time.sleep(0.2)
+
+        # The delete is submitted while the install is still running, and
+        # must wait for it rather than find nothing to delete
+        installed = files.install(staged, post, progress=slow_progress)
+        deleted = files.delete("b.webm")
+        assert installed.result(timeout=5)[0]
+        assert deleted.result(timeout=5) == (True, "Deleted b.webm")
+        assert reports[-1] == (4000, 4000), reports
+
+        staged = FileManager.staging_path("8")
+        staged.write_bytes(b"suspend")
+        post = {"id": "8", "slug": "s", "type": "suspend_video"}
+        assert files.install(staged, post).result(timeout=5)[0]
+        names = [f["filename"] for f in files.list_installed().result(timeout=5)]
+        assert names == ["deck-suspend-animation.webm"], names
+        assert not files._pending
+
+        # Shutting down cancels queued operations and fails later ones
+        closing = AsyncFileManager()
+        release = threading.Event()
+        running = closing._submit("x", release.wait, 5)
+        queued = closing._submit("x", time.sleep, 0)
+        closing.shutdown(wait=False)
+        release.set()
+        assert running.result(timeout=5) and queued.cancelled()
+        late = closing._submit("x", time.sleep, 0)
+        assert isinstance(late.exception(timeout=5), RuntimeError)
+        assert not closing._pending
+        print("SUCCESS: File operations run on workers, in order per file.")
+    finally:
+        files.shutdown()
+        Config.get_install_path = original_get_path
+        shutil.rmtree(install_dir)
+
+
+def test_download_validation():
+    print("\n--- Testing Download Validation ---")
+
+    def run(api):
+        done = threading.Event()
+        manager = DownloadManager(
+            api, lambda event, job: event in ("downloaded", "failed") and done.set()
+        )
+        manager.enqueue({"id": "v1"})
+        assert done.wait(10)
+        job = manager.job("v1")
+        assert job.state == DownloadJob.DOWNLOADED
+        assert job.sha256 == hashlib.sha256(FakeRepoHandler.VIDEO).hexdigest()
+        # The digest survives a restart along with the rest of the job
+        restarted = DownloadManager(api)
+        restarted.restore()
+        assert restarted.job("v1").sha256 == job.sha256
+
+        # An error page is given up on after its first chunk
+        page = b"<html>Service unavailable</html>" * 200000
+        FakeRepoHandler.bodies["v2"] = page
+        done.clear()
+        try:
+            manager.enqueue({"id": "v2"})
+            assert done.wait(10)
+        finally:
+            FakeRepoHandler.bodies.clear()
+        job = manager.job("v2")
+        assert job.state == DownloadJob.FAILED and "WebM" in job.error, job.error
+        assert job.received < len(page) // 10, job.received
+        assert job.validator is None and job.sha256 is None
+        print("SUCCESS: Downloads hashed as written; non-WebM bodies rejected early.")
+
+    with_fake_repo(run)
+
+
 if __name__ == "__main__":
     test_core()
+    test_cache_revalidation()
+    test_delta_sync()
+    test_catalog_migration()
+    test_search_backends()
+    test_ranking()
+    test_download_url_cache()
+    test_streaming_fetch()
+    test_thumbnail_cache()
+    test_download_queue()
+    test_download_resume()
+    test_segmented_download()
+    test_atomic_install()
+    test_async_file_manager()
+    test_download_validation()
@@ -0,0 +1,79 @@
+import os
+import gc
+import tracemalloc
+
+# Set platform to offscreen to avoid display errors
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QEvent
+from PySide6.QtWidgets import QApplication
+from src.gui.registry import CardRegistry, DownloadStateStore
+from src.gui.widgets import VideoCard
+
+PAGE_SIZE = 12
+
+
+def fake_page(page):
+    return [
+        {
+            "id": f"p{page}-{i}",
+            "title": f"Video {page}-{i}",
+            "type": "boot_video",
+            "downloads": i,
+            "user": {"steam_name": "tester"},
+        }
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def test_card_registry():
+    print("--- Testing Card Registry ---")
+    app = QApplication.instance() or QApplication([])
+
+    registry = CardRegistry()
+    states = DownloadStateStore()
+    pool = [VideoCard(download_states=states) for _ in range(PAGE_SIZE)]
+
+    def render(page):
+        # What MainWindow.render_page does with its card pool
+        for card, post in zip(pool, fake_page(page)):
+            card.bind(post)
+            registry.register(post["id"], card)
+        app.processEvents()
+
+    # A download in progress survives its card being rebound elsewhere
+    render(0)
+    states.set("p0-3", 40)
+    render(1)
+    assert registry.get("p0-3") is None
+    assert pool[3].progress.isHidden() and pool[3].install_btn.text() == "Install"
+    render(0)
+    assert registry.get("p0-3") is pool[3]
+    assert not pool[3].progress.isHidden() and pool[3].progress.value() == 40
+
+    # A destroyed card is forgotten without anyone unregistering it
+    doomed = pool.pop()
+    doomed.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    assert registry.get("p0-11") is None and len(registry) == PAGE_SIZE - 1
+
+    tracemalloc.start()
+    for page in range(10):
+        render(page)
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    for page in range(10, 110):
+        render(page)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(f"Registry: {len(registry)} cards, memory growth over 100 pages: {growth} B")
+    assert len(registry) == len(pool)
+    assert growth < 64 * 1024, growth
+    print("SUCCESS: Card registry tracks only live cards; memory stays flat.")
+
+
+if __name__ == "__main__":
+    test_card_registry()
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+class ThumbnailCache:
+    """
+    Content-addressed disk cache for thumbnail images.
+
+    Files are named by the SHA-256 of their URL. An index of
+    key -> [size, last_used] in least-recently-used order is kept in
+    index.json; once the total size passes max_bytes, the least recently
+    used files are deleted. Thread-safe.
+    """
+
+    INDEX_FILE = "index.json"
+    SAVE_INTERVAL = 5  # Seconds between index writes; flush() forces one
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> [size, last_used], oldest first
+        self._total = 0
+        self._dirty = False
+        self._saved_at = 0
+
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._load_index()
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def path(self, url):
+        return self.directory / self.key(url)
+
+    def _load_index(self):
+        try:
+            with open(self.directory / self.INDEX_FILE, "r") as f:
+                index = json.load(f)
+        except Exception:
+            index = {}
+
+        # Reconcile with the directory: the index may predate a crash
+        found = {}
+        for entry in os.scandir(self.directory):
+            if entry.name == self.INDEX_FILE or entry.name.endswith(".tmp"):
+                continue
+            stat = entry.stat()
+            size, last_used = index.get(entry.name, (stat.st_size, stat.st_mtime))
+            found[entry.name] = [stat.st_size, last_used]
+
+        for key, value in sorted(found.items(), key=lambda item: item[1][1]):
+            self._entries[key] = value
+            self._total += value[0]
+        self._evict()
+
+    def _save_index(self, force=False):
+        """Writes the index if it changed; call with the lock held."""
+        if not self._dirty:
+            return
+        if not force and time.monotonic() - self._saved_at < self.SAVE_INTERVAL:
+            return
+        index_path = self.directory / self.INDEX_FILE
+        tmp_path = index_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, index_path)
+        except Exception as e:
+            print(f"Thumbnail index save failed: {e}")
+            return
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def _evict(self):
+        """Drops least recently used files until under budget; lock held."""
+        while self._total > self.max_bytes and self._entries:
+            key, (size, _) = self._entries.popitem(last=False)
+            self._total -= size
+            self.stats["evictions"] += 1
+            self._dirty = True
+            try:
+                os.remove(self.directory / key)
+            except FileNotFoundError:
+                pass
+
+    def get(self, url):
+        """Returns the cached bytes for url, or None on a miss."""
+        key = self.key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            try:
+                with open(self.directory / key, "rb") as f:
+                    data = f.read()
+            except OSError:
+                # Deleted behind our back
+                self._total -= entry[0]
+                del self._entries[key]
+                self._dirty = True
+                self.stats["misses"] += 1
+                return None
+            entry[1] = time.time()
+            self._entries.move_to_end(key)
+            self._dirty = True
+            self.stats["hits"] += 1
+            self._save_index()
+            return data
+
+    def put(self, url, data):
+        """Stores data for url, evicting old entries if over budget."""
+        key = self.key(url)
+        data = bytes(data)
+        if len(data) > self.max_bytes:
+            return
+        tmp_path = self.directory / (key + ".tmp")
+        with self._lock:
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self.directory / key)
+            except OSError as e:
+                print(f"Thumbnail cache write failed: {e}")
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total -= old[0]
+            self._entries[key] = [len(data), time.time()]
+            self._total += len(data)
+            self._dirty = True
+            self._evict()
+            self._save_index()
+
+    def flush(self):
+        """Writes the index now (e.g. on exit)."""
+        with self._lock:
+            self._save_index(force=True)
+
+    def size(self):
+        with self._lock:
+            return self._total
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)